@@ -0,0 +1,92 @@
+"""Measures the CPU time spent by one expansion of 50 widgets on a Screen which
+is not the current one, with each mode of cull_hidden_animations.
+
+The Clock is ticked as the event loop ticks it, as fast as a 60Hz display
+would, for the whole duration of the animation. CPU time excludes the time
+the loop sleeps between frames.
+
+Run from the repository root:
+
+    python benchmarks/bench_culling.py
+"""
+import os
+import sys
+import time
+
+os.environ.setdefault("KIVY_NO_ARGS", "1")
+os.environ.setdefault("KIVY_LOG_MODE", "PYTHON")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from kivy.clock import Clock  # noqa: E402
+from kivy.core.window import Window  # noqa: E402
+from kivy.uix.boxlayout import BoxLayout  # noqa: E402
+from kivy.uix.label import Label  # noqa: E402
+from kivy.uix.screenmanager import NoTransition  # noqa: E402
+from kivy.uix.screenmanager import Screen  # noqa: E402
+from kivy.uix.screenmanager import ScreenManager  # noqa: E402
+
+from expandable import ExpandableMixin  # noqa: E402
+
+WIDGETS = 50
+DURATION = .5
+FRAME = 1 / 60.
+RUNS = 3
+
+
+class ExpandableLabel(Label, ExpandableMixin):
+    pass
+
+
+def tick():
+    Clock.tick()
+    Clock.tick_draw()
+    time.sleep(FRAME)
+
+
+def expand(mode):
+    """Returns the CPU time taken by one expansion of widgets on the screen
+    which isn't shown."""
+    manager = ScreenManager(transition=NoTransition())
+    hidden, shown = Screen(name="hidden"), Screen(name="shown")
+    manager.add_widget(hidden)
+    manager.add_widget(shown)
+    root = BoxLayout(orientation="vertical")
+    widgets = [
+        ExpandableLabel(
+            text=str(number),
+            min_y=10,
+            max_y=40,
+            duration_resize=DURATION,
+            cull_hidden_animations=mode
+        )
+        for number in range(WIDGETS)
+    ]
+    for widget in widgets:
+        root.add_widget(widget)
+    hidden.add_widget(root)
+    Window.add_widget(manager)
+    tick()
+
+    for widget in widgets:
+        widget.expand_y()
+    manager.current = "shown"
+
+    start = time.process_time()
+    end = time.time() + DURATION
+    while time.time() < end:
+        tick()
+    cpu_time = time.process_time() - start
+
+    Window.remove_widget(manager)
+    return cpu_time
+
+
+def main():
+    for mode in ("none", "complete", "pause"):
+        cpu_time = min(expand(mode) for _run in range(RUNS))
+        print(f"{mode}: {cpu_time * 1000:.0f} ms of CPU time per expansion "
+              f"of {WIDGETS} hidden widgets (best of {RUNS})")
+
+
+if __name__ == "__main__":
+    main()
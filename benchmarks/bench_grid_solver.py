@@ -0,0 +1,71 @@
+"""Measures the GridLayout column solver used by the special-case size hint
+animation on a 200x50 grid, with the NumPy backend (if installed) and with
+the pure-Python fallback.
+
+Run from the repository root:
+
+    python benchmarks/bench_grid_solver.py
+"""
+import os
+import sys
+import time
+
+os.environ.setdefault("KIVY_NO_ARGS", "1")
+os.environ.setdefault("KIVY_LOG_MODE", "PYTHON")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from kivy.uix.gridlayout import GridLayout  # noqa: E402
+from kivy.uix.widget import Widget  # noqa: E402
+
+import expandable  # noqa: E402
+
+COLUMNS = 200
+ROWS = 50
+REPEATS = 20
+
+
+def solve(grid):
+    rows, cols, cells = expandable._get_grid_cells(grid)  # noqa
+    children = grid.children
+    return expandable._solve_grid_tracks(  # noqa
+        cols,
+        [col for _row, col in cells],
+        [child.width for child in children],
+        [
+            -1. if child.size_hint_x is None else child.size_hint_x
+            for child in children
+        ],
+        grid.col_default_width,
+        grid.cols_minimum,
+        grid.width,
+        0,
+        1.
+    )
+
+
+def measure(grid):
+    start = time.perf_counter()
+    for _repeat in range(REPEATS):
+        solve(grid)
+    return (time.perf_counter() - start) / REPEATS * 1000
+
+
+def main():
+    grid = GridLayout(cols=COLUMNS, size=(20000, 5000), size_hint=(None, None))
+    for number in range(COLUMNS * ROWS):
+        widget = Widget()
+        if number % 7 == 0:
+            widget.size_hint_x = None
+            widget.width = 40
+        grid.add_widget(widget)
+
+    numpy = expandable.np
+    if numpy is not None:
+        print(f"numpy:  {measure(grid):.2f} ms")
+    expandable.np = None
+    print(f"python: {measure(grid):.2f} ms")
+    expandable.np = numpy
+
+
+if __name__ == "__main__":
+    main()
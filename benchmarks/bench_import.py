@@ -0,0 +1,60 @@
+"""Measures the cold import time of expandable, each in a fresh interpreter,
+and reports whether the import created the window.
+
+"with display" imports expandable as an app would. "without display" sets
+KIVY_WINDOW to an empty string, the way worker processes and headless tooling
+run without a window provider. In both cases, the window provider is only
+loaded if something imports kivy.core.window.
+
+Run from the repository root:
+
+    python benchmarks/bench_import.py
+"""
+import os
+import subprocess
+import sys
+
+RUNS = 5
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SCRIPT = """
+import sys
+import time
+sys.path.insert(0, {root!r})
+import kivy  # noqa: F401 (kivy itself is not part of the measurement)
+start = time.perf_counter()
+import expandable  # noqa: F401
+elapsed = time.perf_counter() - start
+print(elapsed, "kivy.core.window" in sys.modules)
+"""
+
+
+def measure(env):
+    times = []
+    created_window = False
+    for _run in range(RUNS):
+        output = subprocess.run(
+            [sys.executable, "-c", SCRIPT.format(root=ROOT)],
+            env=env,
+            capture_output=True,
+            text=True,
+            check=True
+        ).stdout.split()
+        times.append(float(output[-2]))
+        created_window = created_window or output[-1] == "True"
+    return min(times), created_window
+
+
+def main():
+    base_env = dict(os.environ, KIVY_NO_ARGS="1", KIVY_NO_CONSOLELOG="1")
+    headless_env = dict(base_env, KIVY_WINDOW="")
+    for name, env in (("with display", base_env),
+                      ("without display", headless_env)):
+        elapsed, created_window = measure(env)
+        print(f"{name}: {elapsed * 1000:.0f} ms (best of {RUNS}), "
+              f"window created: {created_window}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+"""Measures the CPU time spent toggling a panel of wrapped Labels and a
+GridLayout back and forth, without and with layout_cache (with exact sizes,
+and with sizes quantized by layout_cache_quantize), and counts the layouts
+run and the textures rendered.
+
+The Clock is ticked as the event loop ticks it, as fast as a 60Hz display
+would. Frame times vary slightly between runs, so the number of frames
+landing in a cached size or bucket (and the gain) varies as well: 24px is
+about the distance the panel moves in a frame. CPU time excludes the time
+the loop sleeps between frames.
+
+Run from the repository root:
+
+    python benchmarks/bench_layout_cache.py
+"""
+import os
+import sys
+import time
+
+os.environ.setdefault("KIVY_NO_ARGS", "1")
+os.environ.setdefault("KIVY_LOG_MODE", "PYTHON")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from kivy.clock import Clock  # noqa: E402
+from kivy.uix.boxlayout import BoxLayout  # noqa: E402
+from kivy.uix.floatlayout import FloatLayout  # noqa: E402
+from kivy.uix.gridlayout import GridLayout  # noqa: E402
+from kivy.uix.label import Label  # noqa: E402
+
+from expandable import ExpandableMixin  # noqa: E402
+
+LABELS = 8
+CELLS = 24
+TOGGLES = 10
+DURATION = .4
+FRAME = 1 / 60.
+TEXT = "The quick brown fox jumps over the lazy dog. " * 4
+COUNTS = {"layouts": 0, "renders": 0}
+
+
+class ExpandableBoxLayout(BoxLayout, ExpandableMixin):
+    pass
+
+
+class CountingLabel(Label):
+    def texture_update(self, *args):
+        COUNTS["renders"] += 1
+        return super().texture_update(*args)
+
+
+class CountingGridLayout(GridLayout):
+    def do_layout(self, *args):
+        COUNTS["layouts"] += 1
+        return super().do_layout(*args)
+
+
+def tick(frames=1):
+    for _frame in range(frames):
+        Clock.tick()
+        Clock.tick_draw()
+        time.sleep(FRAME)
+
+
+def build(layout_cache, bucket, quantize):
+    root = FloatLayout(size=(800, 600))
+    panel = ExpandableBoxLayout(
+        orientation="vertical",
+        size_hint=(None, None),
+        height=600,
+        min_x=150,
+        max_x=750,
+        duration_resize=DURATION,
+        layout_cache=layout_cache,
+        layout_cache_bucket=bucket,
+        layout_cache_quantize=quantize
+    )
+    for number in range(LABELS):
+        label = CountingLabel(text=f"{number}. {TEXT}")
+        label.bind(width=lambda label, width: setattr(
+            label, "text_size", (width, None)
+        ))
+        panel.add_widget(label)
+    grid = CountingGridLayout(cols=6)
+    for number in range(CELLS):
+        grid.add_widget(Label(text=str(number)))
+    panel.add_widget(grid)
+    root.add_widget(panel)
+    tick(3)
+    return panel
+
+
+def toggle(layout_cache, bucket, quantize):
+    """Returns the CPU time taken by the toggles, and the counts."""
+    panel = build(layout_cache, bucket, quantize)
+    COUNTS.update(layouts=0, renders=0)
+    cpu_time = 0
+    for _toggle in range(TOGGLES):
+        panel.toggle_x()
+        start = time.process_time()
+        while panel.resizing:
+            tick()
+        tick(2)
+        cpu_time += time.process_time() - start
+    return cpu_time, dict(COUNTS)
+
+
+def main():
+    runs = (
+        (False, 8, False),
+        (True, 8, False),
+        (True, 8, True),
+        (True, 24, True)
+    )
+    for layout_cache, bucket, quantize in runs:
+        cpu_time, counts = toggle(layout_cache, bucket, quantize)
+        if not layout_cache:
+            name = "no cache"
+        elif quantize:
+            name = f"cache, quantized to {bucket}px"
+        else:
+            name = f"cache, {bucket}px text buckets"
+        print(f"{name}: {cpu_time * 1000:.0f} ms of CPU time for {TOGGLES} "
+              f"toggles, {counts['layouts']} grid layouts, "
+              f"{counts['renders']} label renders")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""Measures the CPU time spent running one expansion of a widget among 10, 100
+and 500 siblings in a BoxLayout, resizing in place and drawn over its
+neighbours (see overlay_expansion).
+
+The Clock is ticked as the event loop ticks it, as fast as a 60Hz display
+would. CPU time excludes the time the loop sleeps between frames.
+
+Run from the repository root:
+
+    python benchmarks/bench_overlay.py
+"""
+import os
+import sys
+import time
+
+os.environ.setdefault("KIVY_NO_ARGS", "1")
+os.environ.setdefault("KIVY_LOG_MODE", "PYTHON")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from kivy.clock import Clock  # noqa: E402
+from kivy.core.window import Window  # noqa: E402
+from kivy.uix.boxlayout import BoxLayout  # noqa: E402
+from kivy.uix.label import Label  # noqa: E402
+
+from expandable import ExpandableMixin  # noqa: E402
+
+DURATION = .5
+FRAME = 1 / 60.
+RUNS = 3
+
+
+class ExpandableLabel(Label, ExpandableMixin):
+    pass
+
+
+def tick():
+    Clock.tick()
+    Clock.tick_draw()
+    time.sleep(FRAME)
+
+
+def expand(siblings, overlay):
+    """Returns the CPU time taken by one expansion."""
+    root = BoxLayout(orientation="vertical")
+    for number in range(siblings):
+        root.add_widget(Label(text=str(number)))
+    widget = ExpandableLabel(
+        text="preview",
+        min_y=1,
+        max_y=300,
+        duration_resize=DURATION,
+        overlay_expansion=overlay
+    )
+    root.add_widget(widget, index=siblings // 2)
+    Window.add_widget(root)
+    tick()
+
+    widget.expand_y()
+    start = time.process_time()
+    while widget.resizing:
+        tick()
+    cpu_time = time.process_time() - start
+
+    widget.instant_retract_y()
+    Window.remove_widget(root)
+    return cpu_time
+
+
+def main():
+    for siblings in (10, 100, 500):
+        for overlay in (False, True):
+            cpu_time = min(expand(siblings, overlay) for _run in range(RUNS))
+            name = "overlay" if overlay else "in place"
+            print(f"{siblings} siblings, {name}: {cpu_time * 1000:.0f} ms of "
+                  f"CPU time per expansion (best of {RUNS})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""Measures snapshot_expand_states and restore_expand_states on a tree of
+10,000 expandable widgets, and counts the layouts run by the restore.
+
+Run from the repository root:
+
+    python benchmarks/bench_snapshot.py
+"""
+import json
+import os
+import sys
+import time
+
+os.environ.setdefault("KIVY_NO_ARGS", "1")
+os.environ.setdefault("KIVY_LOG_MODE", "PYTHON")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from kivy.clock import Clock  # noqa: E402
+from kivy.uix.boxlayout import BoxLayout  # noqa: E402
+
+from expandable import ExpandableMixin  # noqa: E402
+from expandable_state import restore_expand_states  # noqa: E402
+from expandable_state import snapshot_expand_states  # noqa: E402
+
+COLUMNS = 100
+ROWS = 100
+
+
+class Panel(ExpandableMixin):
+    pass
+
+
+def build():
+    root = BoxLayout(size=(1000, 10000), size_hint=(None, None))
+    for _column in range(COLUMNS):
+        column = BoxLayout(orientation="vertical")
+        for _row in range(ROWS):
+            column.add_widget(Panel(min_y=20, max_y=100, size_hint_y=None))
+        root.add_widget(column)
+    Clock.tick()
+    return root
+
+
+def main():
+    root = build()
+    panels = [panel for column in root.children for panel in column.children]
+    for number, panel in enumerate(panels):
+        if number % 3 == 0:
+            panel.instant_expand_y()
+    Clock.tick()
+
+    start = time.perf_counter()
+    blob = snapshot_expand_states(root)
+    snapshot_time = time.perf_counter() - start
+    size = len(json.dumps(blob, separators=(",", ":")))
+
+    for panel in panels:
+        panel.instant_toggle_y()
+    Clock.tick()
+
+    layouts = [0]
+    do_layout = BoxLayout.do_layout
+
+    def counting_do_layout(self, *args):
+        layouts[0] += 1
+        return do_layout(self, *args)
+
+    BoxLayout.do_layout = counting_do_layout
+    start = time.perf_counter()
+    restored = restore_expand_states(root, blob)
+    # the layouts triggered by the restore run on the next pass of the Clock
+    Clock.tick()
+    restore_time = time.perf_counter() - start
+    BoxLayout.do_layout = do_layout
+
+    assert snapshot_expand_states(root) == blob
+    print(f"widgets:  {len(panels)}")
+    print(f"snapshot: {snapshot_time * 1000:.1f} ms, {size} bytes as JSON")
+    print(f"restore:  {restore_time * 1000:.1f} ms, {restored} widgets, "
+          f"{layouts[0]} layouts")
+
+
+if __name__ == "__main__":
+    main()
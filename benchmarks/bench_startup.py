@@ -0,0 +1,117 @@
+"""Counts how many times creating expandable widgets triggers the layout of
+their parent, per widget, when the widgets are built from kvlang (already
+inside their parent when their rules finish applying) and from Python (added
+to their parent after construction). Adding a widget to its parent triggers
+the layout once by itself. Also reports the creation time.
+
+Run from the repository root:
+
+    python benchmarks/bench_startup.py
+"""
+import os
+import sys
+import time
+
+os.environ.setdefault("KIVY_NO_ARGS", "1")
+os.environ.setdefault("KIVY_LOG_MODE", "PYTHON")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from kivy.clock import Clock  # noqa: E402
+from kivy.factory import Factory  # noqa: E402
+from kivy.lang import Builder  # noqa: E402
+from kivy.uix.boxlayout import BoxLayout  # noqa: E402
+from kivy.uix.label import Label  # noqa: E402
+
+from expandable import ExpandableMixin  # noqa: E402
+
+WIDGETS = 500
+
+triggers = [0]
+
+
+class CountingTrigger(object):
+    """Wraps a layout trigger, counting its calls in triggers."""
+
+    def __init__(self, callback):
+        self.trigger = Clock.create_trigger(callback, -1)
+
+    def __call__(self, *args):
+        triggers[0] += 1
+        self.trigger(*args)
+
+    @property
+    def is_triggered(self):
+        return self.trigger.is_triggered
+
+    def cancel(self):
+        self.trigger.cancel()
+
+
+class CountingBoxLayout(BoxLayout):
+    """A BoxLayout counting the calls to its layout trigger made by its
+    children. The trigger is set before Layout.__init__, which keeps it and
+    binds it to the properties of the layout and of its children."""
+
+    def __init__(self, **kwargs):
+        self._trigger_layout = CountingTrigger(self.do_layout)
+        super(CountingBoxLayout, self).__init__(**kwargs)
+
+
+class ExpandableLabel(Label, ExpandableMixin):
+    pass
+
+
+Factory.register("CountingBoxLayout", cls=CountingBoxLayout)
+Factory.register("ExpandableLabel", cls=ExpandableLabel)
+
+KV_CHILD = """
+    ExpandableLabel:
+        text: "panel"
+        min_y: 40
+        max_y: 200
+        start_expanded_y: True
+        min_x: 100
+        max_x_hint: 1
+"""
+
+
+def build_from_kv():
+    return Builder.load_string(
+        "CountingBoxLayout:\n    orientation: 'vertical'\n" +
+        KV_CHILD * WIDGETS
+    )
+
+
+def build_from_python():
+    root = CountingBoxLayout(orientation="vertical")
+    for _number in range(WIDGETS):
+        root.add_widget(ExpandableLabel(
+            text="panel",
+            min_y=40,
+            max_y=200,
+            start_expanded_y=True,
+            min_x=100,
+            max_x_hint=1
+        ))
+    return root
+
+
+def measure(build):
+    triggers[0] = 0
+    start = time.perf_counter()
+    root = build()
+    elapsed = time.perf_counter() - start
+    assert all(child.height == 200 for child in root.children)
+    return triggers[0] / WIDGETS, elapsed * 1000
+
+
+def main():
+    builds = (("kvlang", build_from_kv), ("python", build_from_python))
+    for name, build in builds:
+        per_widget, elapsed = measure(build)
+        print(f"{name}: {per_widget:.1f} layout triggers per widget, "
+              f"{elapsed:.0f} ms for {WIDGETS} widgets")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""Measures the CPU time spent running one resize animation of widgets in a
+BoxLayout, with no cap on the update rate and with caps of 60, 30 and 20
+updates per second (see max_resize_rate).
+
+The Clock is ticked as fast as a 120Hz display would tick it, so the
+uncapped animation updates on every frame. CPU time excludes the time the
+loop sleeps between frames.
+
+Run from the repository root:
+
+    python benchmarks/bench_step_rate.py
+"""
+import os
+import sys
+import time
+
+os.environ.setdefault("KIVY_NO_ARGS", "1")
+os.environ.setdefault("KIVY_LOG_MODE", "PYTHON")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from kivy.clock import Clock  # noqa: E402
+from kivy.uix.boxlayout import BoxLayout  # noqa: E402
+from kivy.uix.label import Label  # noqa: E402
+
+from expandable import ExpandableMixin  # noqa: E402
+
+WIDGETS = 50
+DURATION = 1.
+FRAME = 1 / 120.
+RUNS = 3
+
+
+class ExpandableLabel(Label, ExpandableMixin):
+    pass
+
+
+def animate(rate):
+    """Returns the CPU time and the number of frames taken by one expansion
+    of every widget."""
+    root = BoxLayout(orientation="vertical", size=(800, 6000))
+    widgets = [
+        ExpandableLabel(
+            min_y=40,
+            max_y=100,
+            duration_resize=DURATION,
+            max_resize_rate=rate
+        )
+        for _number in range(WIDGETS)
+    ]
+    for widget in widgets:
+        root.add_widget(widget)
+    Clock.tick()
+
+    for widget in widgets:
+        widget.expand_y()
+
+    frames = 0
+    start = time.process_time()
+    while any(widget.resizing for widget in widgets):
+        Clock.tick()
+        frames += 1
+        time.sleep(FRAME)
+    return time.process_time() - start, frames
+
+
+def main():
+    for rate in (0, 60, 30, 20):
+        cpu_time = min(animate(rate)[0] for _run in range(RUNS))
+        name = f"{rate}Hz cap" if rate else "no cap"
+        print(f"{name}: {cpu_time * 1000:.0f} ms of CPU time per animation "
+              f"of {WIDGETS} widgets (best of {RUNS})")
+
+
+if __name__ == "__main__":
+    main()
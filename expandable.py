@@ -1,31 +1,55 @@
-import time
+import re
+from array import array
+from bisect import bisect_left
+from collections import OrderedDict
+from collections import deque
+from contextlib import contextmanager
+from functools import partial
+from importlib import import_module
 from math import ceil
+from weakref import WeakKeyDictionary
+from weakref import ref
 
 from kivy import Logger
 from kivy.animation import Animation
 from kivy.animation import AnimationTransition
-from kivy.core.window import Window
-from kivy.core.window import WindowBase
+from kivy.animation import Parallel
+from kivy.animation import Sequence
+from kivy.clock import Clock
+from kivy.core.text import Label as CoreLabel
+from kivy.graphics import ScissorPop
+from kivy.graphics import ScissorPush
+from kivy.metrics import dpi2px
 from kivy.properties import AliasProperty
 from kivy.properties import BooleanProperty
 from kivy.properties import BoundedNumericProperty
+from kivy.properties import ListProperty
 from kivy.properties import NumericProperty
 from kivy.properties import ObjectProperty
 from kivy.properties import OptionProperty
-from kivy.uix.anchorlayout import AnchorLayout
-from kivy.uix.boxlayout import BoxLayout
-from kivy.uix.floatlayout import FloatLayout
-from kivy.uix.gridlayout import GridLayout
-from kivy.uix.relativelayout import RelativeLayout
-from kivy.uix.stacklayout import StackLayout
+from kivy.properties import StringProperty
+from kivy.uix.label import Label
 from kivy.uix.widget import Widget
 
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
 DO_SPECIAL_ANIM = True
 DO_DEFAULT_ANIM = False
 
 HORIZONTAL = True
 VERTICAL = False
 
+DRAG_VELOCITY_SAMPLES = 8
+"""The number of touch samples kept in the ring buffer used to estimate the
+velocity of a drag."""
+
+DRAG_VELOCITY_WINDOW = 0.1
+"""Only touch samples younger than this many seconds (relative to the latest
+sample) contribute to the velocity of a drag."""
+
 anim_transitions = [
     key
     for key in vars(AnimationTransition).keys()
@@ -36,11 +60,1084 @@ anim_transitions = [
     if not key.startswith("__")
 ]
 
+_snap_point_pattern = re.compile(
+    r"^\s*([-+]?(?:\d+\.?\d*|\.\d+))\s*(px|dp|sp|pt|in|mm|cm|%)?\s*$"
+)
+
+
+_lazy_imports = {
+    "AnchorLayout": "kivy.uix.anchorlayout",
+    "BoxLayout": "kivy.uix.boxlayout",
+    "FloatLayout": "kivy.uix.floatlayout",
+    "GridLayout": "kivy.uix.gridlayout",
+    "RelativeLayout": "kivy.uix.relativelayout",
+    "StackLayout": "kivy.uix.stacklayout",
+    "StencilView": "kivy.uix.stencilview",
+    "Window": "kivy.core.window",
+    "WindowBase": "kivy.core.window",
+}
+"""Maps the names this module resolves on first use to the modules defining
+them. Importing kivy.core.window creates the window, so neither it nor the
+layout modules are imported until a widget actually needs them."""
+
+_lazy_cache = {}
+
+
+def _lazy(name):
+    """Returns the class (or the Window) called name, importing its module the
+    first time it is asked for."""
+    try:
+        return _lazy_cache[name]
+    except KeyError:
+        value = getattr(import_module(_lazy_imports[name]), name)
+        _lazy_cache[name] = value
+        return value
+
+
+def __getattr__(name):
+    """Keeps expandable.Window, expandable.BoxLayout, etc. working without
+    importing them along with this module."""
+    if name in _lazy_imports:
+        return _lazy(name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 class ExpandableMixinError(Exception):
     pass
 
 
+def _parse_snap_point(value):
+    """Converts an entry of snap_points_x/snap_points_y to a tuple
+    (size, is_hint). Numbers and strings with units (such as "120dp") are
+    sizes in pixels. Strings ending in "%" are size hints, so "50%" is the
+    tuple (0.5, True)."""
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return float(value), False
+
+    match = None
+    if isinstance(value, str):
+        match = _snap_point_pattern.match(value)
+    if match is None:
+        raise ExpandableMixinError(
+            f"Invalid snap point: {value!r}; snap points must be numbers, "
+            f"strings with units (i.e., \"120dp\") or percentages (i.e., "
+            f"\"50%\")"
+        )
+
+    number, unit = match.groups()
+    if unit == "%":
+        return float(number) / 100, True
+    if unit is None or unit == "px":
+        return float(number), False
+    return float(dpi2px(number, unit)), False
+
+
+def _sorted_snap_sizes(points, allotted):
+    """Converts a list of (size, is_hint) snap points into pixels using the
+    allotted size. Returns a tuple (sizes, indices) where sizes is sorted and
+    indices[n] is the position of sizes[n] in points."""
+    pairs = sorted(
+        (size * allotted if is_hint else size, index)
+        for index, (size, is_hint) in enumerate(points)
+    )
+    return [pair[0] for pair in pairs], [pair[1] for pair in pairs]
+
+
+def _nearest_position(sizes, size):
+    """Returns the position of the value in the sorted list sizes which is
+    closest to size."""
+    position = bisect_left(sizes, size)
+    if position == 0:
+        return 0
+    if position == len(sizes):
+        return position - 1
+    if size - sizes[position - 1] <= sizes[position] - size:
+        return position - 1
+    return position
+
+
+def _get_fling_duration(duration, distance, velocity):
+    """If the release velocity of a drag points towards the target, returns the
+    time needed to cover the distance at that velocity, but never more than
+    duration. Otherwise, returns duration."""
+    if distance * velocity <= 0:
+        return duration
+    return min(duration, abs(distance / velocity))
+
+
+def _measure_label(label, text_size):
+    """Renders the text of the label with the given text_size, without
+    touching the texture of the label itself, and returns the size of the
+    resulting texture (which includes the padding of the label)."""
+    options = {key: getattr(label, key) for key in label._font_properties}
+    options["text_size"] = text_size
+    # the core label of the Label is None until its constructor has run
+    core_label_class = CoreLabel
+    if getattr(label, "_label", None) is not None:
+        core_label_class = type(label._label)
+    core_label = core_label_class(**options)
+    core_label.refresh()
+    if core_label.texture is None:
+        return 0, 0
+    return core_label.texture.size
+
+
+def _measure_content_width(widget):
+    """Returns the intrinsic width of the widget: the unwrapped text width of
+    a Label, or the width its children need. Children without a size_hint_x
+    contribute their width; children with one are measured recursively. A
+    widget without children needs only its padding."""
+    if isinstance(widget, Label):
+        return _measure_label(widget, (None, None))[0]
+
+    padding = getattr(widget, "padding", None) or (0, 0, 0, 0)
+    if not widget.children:
+        # its own width would make the measurement depend on itself
+        return padding[0] + padding[2]
+
+    widths = [
+        child.width if child.size_hint_x is None
+        else _measure_content_width(child)
+        for child in widget.children
+    ]
+    if (
+            isinstance(widget, _lazy("BoxLayout")) and
+            widget.orientation == "horizontal"
+    ):
+        content_width = sum(widths) + widget.spacing * (len(widths) - 1)
+    elif isinstance(widget, (_lazy("GridLayout"), _lazy("StackLayout"))):
+        return widget.minimum_width
+    else:
+        content_width = max(widths)
+    return content_width + padding[0] + padding[2]
+
+
+def _measure_content_height(widget, width):
+    """Returns the intrinsic height of the widget at the given width: the
+    wrapped text height of a Label, or the height its children need. Children
+    without a size_hint_y contribute their height; children with one are
+    measured recursively. A widget without children needs only its padding."""
+    if isinstance(widget, Label):
+        text_width = max(0, width - widget.padding[0] - widget.padding[2])
+        return _measure_label(widget, (text_width, None))[1]
+
+    padding = getattr(widget, "padding", None) or (0, 0, 0, 0)
+    if not widget.children:
+        return padding[1] + padding[3]
+
+    inner_width = max(0, width - padding[0] - padding[2])
+    heights = [
+        child.height if child.size_hint_y is None
+        else _measure_content_height(
+            child,
+            inner_width if child.size_hint_x is not None else child.width
+        )
+        for child in widget.children
+    ]
+    if (
+            isinstance(widget, _lazy("BoxLayout")) and
+            widget.orientation == "vertical"
+    ):
+        content_height = sum(heights) + widget.spacing * (len(heights) - 1)
+    elif isinstance(widget, (_lazy("GridLayout"), _lazy("StackLayout"))):
+        return widget.minimum_height
+    else:
+        content_height = max(heights)
+    return content_height + padding[1] + padding[3]
+
+
+class _NestedLayoutBatcher(object):
+    """Runs the layouts containing animating, nested expandable widgets once
+    per frame.
+
+    When a nested widget changes size, its parent layout is triggered. Once
+    the parent lays out, its minimum size (and so its own size, if bound)
+    changes, which triggers the grandparent, which moves the parent, which
+    triggers the parent again, and so on. Each level of nesting costs another
+    pass through the Clock, and inner layouts run once for every ancestor
+    above them.
+
+    Instead, the batcher takes over the pending layout triggers of every
+    ancestor of the animating widgets. At the end of the frame's Clock
+    processing, it runs the affected layouts deepest first (so minimum sizes
+    propagate upward in a single pass), and then outermost first for the
+    layouts which were triggered again by that pass (so children follow their
+    moved parents)."""
+
+    def __init__(self):
+        self._widgets = {}
+        self._dirty = set()
+        self._trigger_flush = Clock.create_trigger(self.flush, -1)
+
+    def mark(self, widget):
+        """Takes over the pending layout triggers of the layouts containing
+        widget, and schedules a flush."""
+        self._widgets[widget.uid] = widget
+        for layout in _get_layout_chain(widget):
+            if layout._trigger_layout.is_triggered:  # noqa
+                layout._trigger_layout.cancel()  # noqa
+                self._dirty.add(layout.uid)
+        self._trigger_flush()
+
+    def flush(self, *_args):
+        """Runs every layout containing a marked widget which needs to lay out
+        at most once bottom-up and at most once top-down."""
+        widgets = list(self._widgets.values())
+        dirty = self._dirty
+        self._widgets = {}
+        self._dirty = set()
+
+        depths = {}
+        layouts = {}
+        for widget in widgets:
+            chain = _get_layout_chain(widget)
+            for depth, layout in enumerate(reversed(chain)):
+                depths[layout.uid] = depth
+                layouts[layout.uid] = layout
+        ordered = sorted(layouts.values(), key=lambda lt: depths[lt.uid])
+
+        for layout in reversed(ordered):
+            if layout.uid in dirty or layout._trigger_layout.is_triggered:  # noqa
+                layout._trigger_layout.cancel()  # noqa
+                layout.do_layout()
+
+        for layout in ordered:
+            if layout._trigger_layout.is_triggered:  # noqa
+                layout._trigger_layout.cancel()  # noqa
+                layout.do_layout()
+
+
+def _get_layout_chain(widget):
+    """Returns the ancestors of widget that lay out their children, nearest
+    first."""
+    chain = []
+    parent = widget.parent
+    while parent is not None and parent is not parent.parent:
+        if hasattr(parent, "_trigger_layout"):
+            chain.append(parent)
+        parent = parent.parent
+    return chain
+
+
+_nested_layout_batcher = _NestedLayoutBatcher()
+
+
+_size_observed_properties = {
+    "width": "size",
+    "height": "size",
+    "size": "size",
+    "size_hint_x": "size_hint",
+    "size_hint_y": "size_hint",
+    "size_hint": "size_hint"
+}
+"""Maps each size property assigned by expandable widgets to the property
+which layouts bind their trigger to."""
+
+
+def _assign_sizes(widget, changes):
+    """Assigns the (name, value) pairs in changes to widget with the layout
+    trigger of its parent detached from the size and size_hint of widget, so
+    that the parent isn't triggered once per assignment. Returns the layout
+    trigger of the parent, or None if the parent doesn't lay out its
+    children. Triggering it is left to the caller."""
+    trigger = getattr(widget.parent, "_trigger_layout", None)
+    detached = []
+    if trigger is not None:
+        names = {_size_observed_properties[name] for name, _value in changes}
+        for name in names:
+            if trigger in widget.get_property_observers(name):
+                widget.funbind(name, trigger)
+                detached.append(name)
+    for name, value in changes:
+        setattr(widget, name, value)
+    for name in detached:
+        widget.fbind(name, trigger)
+    return trigger
+
+
+class _SizeBatch(object):
+    """Defers the size properties assigned by expandable widgets inside
+    ExpandableMixin.batch() until the outermost batch exits.
+
+    Assigning size_hint_x, width, etc. triggers the layout of the parent every
+    time, and every binding to those properties runs for each intermediate
+    value. The batch instead keeps the latest assignment for each axis of each
+    widget. On exit it assigns only the final values, with the layout trigger
+    of the parent detached from the assigned properties, then triggers each
+    affected layout exactly once, deepest first, so that a parent sees all of
+    its resized children in a single pass."""
+
+    def __init__(self):
+        self.depth = 0
+        self._pending = {}
+
+    def record(self, widget, axis, properties):
+        """Records the size properties to assign to widget for the given axis,
+        replacing any previous assignment recorded for that axis."""
+        entry = self._pending.get(widget.uid)
+        if entry is None:
+            entry = self._pending[widget.uid] = (widget, {})
+        entry[1][axis] = properties
+
+    def apply(self):
+        """Assigns every recorded size, then triggers the layout of each
+        affected parent once."""
+        pending = list(self._pending.values())
+        self._pending = {}
+
+        layouts = {}
+        for widget, axes in pending:
+            changes = [
+                (name, value)
+                for properties in axes.values()
+                for name, value in properties
+                if getattr(widget, name) != value
+            ]
+            if changes and _assign_sizes(widget, changes) is not None:
+                layouts[widget.parent.uid] = widget.parent
+
+        for layout in sorted(layouts.values(), key=_get_depth, reverse=True):
+            layout._trigger_layout()  # noqa
+
+
+def _get_depth(widget):
+    """Returns the number of ancestors of widget."""
+    depth = 0
+    parent = widget.parent
+    while parent is not None and parent is not parent.parent:
+        depth += 1
+        parent = parent.parent
+    return depth
+
+
+_size_batch = _SizeBatch()
+
+
+class _BoxAggregate(object):
+    """Keeps the sums of the fixed sizes (children whose size hint is None)
+    and of the size hints of the children of a BoxLayout up to date.
+
+    Every child is observed, so a child changing its size or size hint
+    updates the sums by the difference between its old and new contribution.
+    Resolving a size hint then reads the sums in O(1) time rather than
+    scanning every sibling. The sums are recomputed from scratch whenever
+    children are added or removed, which also discards any accumulated
+    floating point error."""
+
+    _properties = ("width", "size_hint_x", "height", "size_hint_y")
+
+    def __init__(self, parent):
+        self.fixed_width = 0.
+        self.hint_x = 0.
+        self.fixed_height = 0.
+        self.hint_y = 0.
+        self._children = {}
+        parent.fbind("children", self._on_children)
+        self._on_children(parent, parent.children)
+
+    def _on_children(self, _instance, children):
+        """Observes added children, stops observing removed children and
+        recomputes the sums."""
+        current = {child.uid: child for child in children}
+        for uid, (child, _contribution) in list(self._children.items()):
+            if uid not in current:
+                for name in self._properties:
+                    child.funbind(name, self._on_child)
+                del self._children[uid]
+
+        for uid, child in current.items():
+            if uid not in self._children:
+                for name in self._properties:
+                    child.fbind(name, self._on_child)
+            self._children[uid] = (child, self._get_contribution(child))
+
+        contributions = [entry[1] for entry in self._children.values()]
+        self.fixed_width = sum(entry[0] for entry in contributions)
+        self.hint_x = sum(entry[1] for entry in contributions)
+        self.fixed_height = sum(entry[2] for entry in contributions)
+        self.hint_y = sum(entry[3] for entry in contributions)
+
+    def _on_child(self, child, *_args):
+        """Applies the change in the contribution of child to the sums."""
+        entry = self._children.get(child.uid)
+        if entry is None:
+            return
+        old = entry[1]
+        new = self._get_contribution(child)
+        self._children[child.uid] = (child, new)
+        self.fixed_width += new[0] - old[0]
+        self.hint_x += new[1] - old[1]
+        self.fixed_height += new[2] - old[2]
+        self.hint_y += new[3] - old[3]
+
+    @staticmethod
+    def _get_contribution(child):
+        """Returns what child adds to (fixed_width, hint_x, fixed_height,
+        hint_y)."""
+        if child.size_hint_x is None:
+            horizontal = (child.width, 0.)
+        else:
+            horizontal = (0., child.size_hint_x)
+        if child.size_hint_y is None:
+            vertical = (child.height, 0.)
+        else:
+            vertical = (0., child.size_hint_y)
+        return horizontal + vertical
+
+
+def _get_box_aggregate(parent):
+    """Returns the _BoxAggregate of the BoxLayout parent, creating it the first
+    time.
+
+    The aggregate is stored on parent rather than in a module-level mapping:
+    it references the children, which reference parent, so a mapping would
+    keep parent and its whole subtree alive. Stored on parent, the aggregate
+    is collected along with it."""
+    aggregate = getattr(parent, "_expandable_box_aggregate", None)
+    if aggregate is None:
+        aggregate = parent._expandable_box_aggregate = _BoxAggregate(parent)
+    return aggregate
+
+
+class _SizeHintBatcher(object):
+    """Collects the expandable widgets which animate to a size hint within a
+    frame and have a custom_size_hint_batch_resolver. At the end of the
+    frame, each group of widgets sharing a parent, an axis and batch callbacks
+    is resolved (and, if needed, animated) with a single call to the
+    callbacks."""
+
+    def __init__(self):
+        self._groups = {}
+        self._trigger_flush = Clock.create_trigger(self.flush, -1)
+
+    def queue(self, widget, axis, hint, transition, duration):
+        """Queues the animation of widget to hint along axis ("x" or "y"),
+        replacing any animation already queued for it."""
+        self.discard(widget, axis)
+        key = (
+            widget.parent.uid,
+            axis,
+            widget.custom_size_hint_batch_resolver,
+            widget.custom_size_hint_batch_animation
+        )
+        group = self._groups.setdefault(key, {})
+        group[widget.uid] = (widget, hint, transition, duration)
+        self._trigger_flush()
+
+    def discard(self, widget, axis):
+        """Removes the animation queued for widget along axis, if any."""
+        for key, group in list(self._groups.items()):
+            if key[1] == axis and group.pop(widget.uid, None) is not None:
+                if not group:
+                    del self._groups[key]
+                return
+
+    def flush(self, *_args):
+        """Resolves and animates every queued group."""
+        groups = self._groups
+        self._groups = {}
+        for (_uid, axis, resolver, animator), group in groups.items():
+            requests = list(group.values())
+            widgets = [request[0] for request in requests]
+            parent = widgets[0].parent
+            for widget in widgets:
+                if axis == "x":
+                    widget._batched_hint_horizontal = False  # noqa
+                else:
+                    widget._batched_hint_vertical = False  # noqa
+
+            results = None
+            if parent is not None:
+                results = resolver(parent, axis, widgets)
+            if results is None:
+                results = [
+                    widget._resolve_size_hint_x() if axis == "x"  # noqa
+                    else widget._resolve_size_hint_y()  # noqa
+                    for widget in widgets
+                ]
+
+            special = []
+            for request, use_special_animation in zip(requests, results):
+                widget, hint, transition, duration = request
+                if use_special_animation:
+                    special.append(request)
+                elif axis == "x" and widget.size_hint_x != hint:
+                    widget.start_resize_animation(
+                        widget._create_resize_animation(  # noqa
+                            size_hint_x=hint,
+                            t=transition,
+                            d=duration
+                        ),
+                        HORIZONTAL
+                    )
+                elif axis == "y" and widget.size_hint_y != hint:
+                    widget.start_resize_animation(
+                        widget._create_resize_animation(  # noqa
+                            size_hint_y=hint,
+                            t=transition,
+                            d=duration
+                        ),
+                        VERTICAL
+                    )
+
+            if special and (
+                    animator is None or
+                    animator(parent, axis, special) is None
+            ):
+                for widget, hint, transition, duration in special:
+                    if axis == "x":
+                        widget._animate_width_hint_special_case(  # noqa
+                            hint, transition, duration
+                        )
+                    else:
+                        widget._animate_height_hint_special_case(  # noqa
+                            hint, transition, duration
+                        )
+
+            # widgets which didn't need to animate take their final size
+            for widget in widgets:
+                if axis == "x":
+                    widget._update_width()  # noqa
+                else:
+                    widget._update_height()  # noqa
+
+
+_size_hint_batcher = _SizeHintBatcher()
+
+
+class _FrozenTrigger(object):
+    """Stands in for the texture trigger of a Label whose text is frozen (see
+    freeze_text_on_resize), recording whether the texture would have been
+    updated instead of updating it."""
+
+    __slots__ = ("dirty",)
+
+    def __init__(self, dirty):
+        self.dirty = dirty
+
+    def __call__(self, *_args):
+        self.dirty = True
+
+    def cancel(self):
+        pass
+
+
+_label_texture_properties = (
+    "font_size", "font_name", "font_script_name", "font_direction", "bold",
+    "italic", "underline", "strikethrough", "font_family", "color",
+    "disabled_color", "disabled", "halign", "valign", "padding",
+    "outline_width", "disabled_outline_color", "outline_color", "shorten",
+    "mipmap", "line_height", "max_lines", "strip", "shorten_from",
+    "split_str", "ellipsis_options", "unicode_errors", "markup",
+    "font_hinting", "font_kerning", "font_blended", "font_context",
+    "font_features", "base_direction", "text_language",
+    "limit_render_to_text_bbox"
+)
+"""The properties of a Label, besides text and text_size, which change its
+texture. Those missing from the installed version of Kivy are ignored."""
+
+
+class _LayoutCache(object):
+    """A least recently used cache of the layouts and text textures of an
+    expandable widget (see layout_cache), bounded by an estimate of the
+    memory its entries take."""
+
+    def __init__(self, limit):
+        self.limit = limit
+        self.size = 0
+        self._entries = OrderedDict()
+        self._textures = {}
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key):
+        """Returns the value stored under key, or None."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        self._entries.move_to_end(key)
+        return entry[0]
+
+    def put(self, key, value, size, texture=None):
+        """Stores value, which takes about size bytes, under key, and evicts
+        the least recently used entries until the cache fits its limit.
+
+        texture is the texture held by value, if any. A Label refills its
+        texture in place when the size of its text doesn't change, so the
+        entry which held the same texture before is discarded: it no longer
+        shows its text."""
+        self.discard(key)
+        if texture is not None and texture in self._textures:
+            self.discard(self._textures[texture])
+        if size > self.limit:
+            return
+        self._entries[key] = (value, size, texture)
+        if texture is not None:
+            self._textures[texture] = key
+        self.size += size
+        self.evict()
+
+    def discard(self, key):
+        """Removes the entry stored under key, if any."""
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        _value, size, texture = entry
+        self.size -= size
+        if texture is not None:
+            del self._textures[texture]
+
+    def evict(self):
+        """Removes the least recently used entries until the cache fits its
+        limit."""
+        while self.size > self.limit:
+            self.discard(next(iter(self._entries)))
+
+    def clear(self):
+        """Removes every entry."""
+        self._entries.clear()
+        self._textures.clear()
+        self.size = 0
+
+
+class _CachedTextureTrigger(object):
+    """Stands in for the texture trigger of a Label while its expandable
+    ancestor resizes with layout_cache, reusing the texture rendered at
+    (about) the same text_size when there is one instead of rendering the
+    text again."""
+
+    __slots__ = ("label", "owner", "trigger", "event", "reused", "__weakref__")
+
+    def __init__(self, label, owner, trigger):
+        self.label = label
+        self.owner = owner
+        self.trigger = trigger
+        self.event = Clock.create_trigger(self.update, -1)
+        self.reused = False
+
+    def __call__(self, *_args):
+        if self.owner is None:
+            # released while wrapped by another stand-in (see
+            # freeze_text_on_resize), which put it back afterwards
+            self.trigger()
+        else:
+            self.event()
+
+    def cancel(self):
+        self.event.cancel()
+        self.trigger.cancel()
+
+    def release(self):
+        """Stops using the cache. The stand-in then passes the texture updates
+        to the texture trigger."""
+        self.event.cancel()
+        self.owner = None
+
+    @property
+    def is_triggered(self):
+        return self.event.is_triggered
+
+    def update(self, *_args):
+        """Gives the Label a cached texture, or renders its text and caches
+        the texture."""
+        label = self.label
+        cache = self.owner._get_layout_cache()  # noqa
+        key = self.owner._get_texture_cache_key(label)  # noqa
+        entry = cache.get(key)
+        if entry is not None:
+            label.texture, label.texture_size = entry
+            self.reused = True
+            return
+
+        label.texture_update()
+        self.reused = False
+        texture = label.texture
+        if texture is None:
+            cache.put(key, (None, tuple(label.texture_size)), 64)
+            return
+        # fill the texture now, while the core label holds this text layout
+        texture.bind()
+        cache.put(
+            key,
+            (texture, tuple(label.texture_size)),
+            64 + 4 * texture.width * texture.height,
+            texture
+        )
+
+
+class _HoverPrewarmer(object):
+    """Prewarms the widgets whose prewarm_on_hover is True when the mouse
+    enters them. A single binding to Window.mouse_pos serves every such
+    widget."""
+
+    def __init__(self):
+        self._widgets = WeakKeyDictionary()
+        self._bound = False
+
+    def add(self, widget):
+        """Starts watching widget."""
+        if not self._bound:
+            _lazy("Window").fbind("mouse_pos", self._on_mouse_pos)
+            self._bound = True
+        self._widgets[widget] = False
+
+    def discard(self, widget):
+        """Stops watching widget."""
+        self._widgets.pop(widget, None)
+
+    def _on_mouse_pos(self, _window, pos):
+        """Prewarms the widgets the mouse just entered. collide_point takes
+        the coordinates of the parent, which pos is converted to."""
+        for widget, hovered in list(self._widgets.items()):
+            parent = widget.parent
+            inside = (
+                parent is not None and
+                widget.get_root_window() is not None and
+                widget.collide_point(*parent.to_widget(*pos))
+            )
+            if inside and not hovered:
+                widget.prewarm()
+            self._widgets[widget] = inside
+
+
+_hover_prewarmer = _HoverPrewarmer()
+
+
+class _OverlayLayer(object):
+    """The layer over the window in which the widgets with overlay_expansion
+    are drawn while they are expanded. It is a plain Widget, so nothing is
+    laid out when the widgets in it resize, and it is only in the window
+    while it holds a widget."""
+
+    def __init__(self):
+        self._layer = None
+
+    def add(self, widget):
+        """Draws widget over the window."""
+        layer = self._layer
+        if layer is None:
+            layer = self._layer = Widget()
+        if layer.parent is None:
+            _lazy("Window").add_widget(layer)
+        layer.add_widget(widget)
+
+    def remove(self, widget):
+        """Removes widget from the layer."""
+        layer = self._layer
+        layer.remove_widget(widget)
+        if not layer.children and layer.parent is not None:
+            layer.parent.remove_widget(layer)
+
+
+_overlay_layer = _OverlayLayer()
+
+
+class AnimationGovernor(object):
+    """Watches recent frame times and degrades the resize animations of every
+    ExpandableMixin while the app is over its frame budget, so toggling
+    widgets doesn't add per-frame relayouts to frames that are already late:
+
+        level 0: animations run as configured
+        level 1: durations are multiplied by duration_scales[1]
+        level 2: durations are multiplied by duration_scales[2], and
+                 animations update at most step_rate times per second
+        level 3: toggles and snaps are instant (as with instant_toggle_x,
+                 instant_snap_x, etc.)
+
+    The governor is off until start() is called:
+
+        from expandable import animation_governor
+        animation_governor.start()
+
+    Every window frames, the mean frame time is compared to frame_budget. If
+    it exceeds frame_budget * degrade_ratio, the level goes up by one. If it is
+    below frame_budget * recover_ratio for recover_windows windows in a row,
+    the level goes down by one. Frames in between neither degrade nor recover,
+    so the level doesn't oscillate around the budget. Animations read the
+    level when they start; running animations are not affected.
+
+    level is the current level, and history holds the last history_length
+    decisions as (time, old_level, new_level, mean_frame_time) tuples. All the
+    attributes above can be tuned at any time."""
+
+    MAX_LEVEL = 3
+
+    def __init__(self):
+        self.frame_budget = 1 / 60.
+        self.window = 30
+        self.degrade_ratio = 1.5
+        self.recover_ratio = 1.1
+        self.recover_windows = 3
+        self.duration_scales = (1., 0.5, 0.5)
+        self.step_rate = 20.
+        self.history = deque(maxlen=50)
+        self.level = 0
+        self._samples = 0
+        self._total = 0.
+        self._calm_windows = 0
+        self._event = None
+
+    @property
+    def history_length(self):
+        return self.history.maxlen
+
+    @history_length.setter
+    def history_length(self, length):
+        self.history = deque(self.history, maxlen=length)
+
+    @property
+    def running(self):
+        """True if the governor is sampling frame times."""
+        return self._event is not None
+
+    @property
+    def duration_scale(self):
+        """The factor applied to the duration of new animations."""
+        if self.level >= self.MAX_LEVEL:
+            return 0.
+        return self.duration_scales[self.level]
+
+    @property
+    def step(self):
+        """The minimum interval between two updates of new animations, in
+        seconds, or 0 to update every frame."""
+        if self.level >= 2 and self.step_rate:
+            return 1. / self.step_rate
+        return 0.
+
+    @property
+    def instant(self):
+        """True if toggles and snaps should not animate at all."""
+        return self.level >= self.MAX_LEVEL
+
+    def start(self):
+        """Starts sampling the time of every frame."""
+        if self._event is None:
+            self._event = Clock.schedule_interval(self._on_frame, 0)
+
+    def stop(self):
+        """Stops sampling and returns to level 0."""
+        if self._event is not None:
+            self._event.cancel()
+            self._event = None
+        self.reset()
+
+    def reset(self):
+        """Returns to level 0 and discards the samples of the current
+        window. The history is kept."""
+        self._set_level(0, None)
+        self._samples = 0
+        self._total = 0.
+        self._calm_windows = 0
+
+    def record_frame(self, frame_time):
+        """Records the duration of a frame, in seconds. This is called every
+        frame once the governor is started, and can be called directly to
+        replay recorded frame times."""
+        self._samples += 1
+        self._total += frame_time
+        if self._samples < self.window:
+            return
+
+        mean = self._total / self._samples
+        self._samples = 0
+        self._total = 0.
+        if mean > self.frame_budget * self.degrade_ratio:
+            self._calm_windows = 0
+            if self.level < self.MAX_LEVEL:
+                self._set_level(self.level + 1, mean)
+        elif mean < self.frame_budget * self.recover_ratio:
+            self._calm_windows += 1
+            if self._calm_windows >= self.recover_windows and self.level:
+                self._calm_windows = 0
+                self._set_level(self.level - 1, mean)
+        else:
+            self._calm_windows = 0
+
+    def _on_frame(self, dt):
+        self.record_frame(dt)
+
+    def _set_level(self, level, mean):
+        """Changes the level and records the decision."""
+        if level == self.level:
+            return
+        self.history.append((Clock.get_time(), self.level, level, mean))
+        Logger.debug(
+            f"AnimationGovernor: level {self.level} -> {level} "
+            f"(mean frame time {mean})"
+        )
+        self.level = level
+
+
+animation_governor = AnimationGovernor()
+"""The AnimationGovernor consulted by every ExpandableMixin."""
+
+_size_hint_handlers = {}
+"""Maps a layout class, or the dotted name of one (such as
+"kivy.uix.boxlayout.BoxLayout"), to the (resolver, animator, pixel_target)
+handlers registered for it with ExpandableMixin.register_size_hint_resolver."""
+
+_size_hint_handler_cache = {}
+"""Maps a layout class to the handlers found for it along its MRO, or to None
+if there are none. Cleared whenever handlers are registered."""
+
+
+def _get_size_hint_handlers(parent_class):
+    """Returns the (resolver, animator, pixel_target) handlers registered for
+    parent_class or the nearest of its base classes, or None. After the first
+    lookup for a class, this is a single dictionary lookup."""
+    try:
+        return _size_hint_handler_cache[parent_class]
+    except KeyError:
+        pass
+
+    handlers = None
+    for base in parent_class.__mro__:
+        handlers = _size_hint_handlers.get(base)
+        if handlers is None:
+            handlers = _size_hint_handlers.get(
+                f"{base.__module__}.{base.__qualname__}"
+            )
+        if handlers is not None:
+            break
+    _size_hint_handler_cache[parent_class] = handlers
+    return handlers
+
+
+def _get_grid_cells(parent):
+    """Returns (rows, cols, cells) for the GridLayout parent, where rows and
+    cols are the number of rows and columns of the grid and cells[i] is the
+    (row, column) of parent.children[i]. Both counts are 0 if the grid has
+    neither rows nor cols."""
+    rows = parent.rows
+    cols = parent.cols
+    orientation = parent.orientation
+    num_children = len(parent.children)
+    if rows is None and cols is None:
+        return 0, 0, []
+    elif rows is None:
+        rows = ceil(num_children / cols)
+    elif cols is None:
+        cols = ceil(num_children / rows)
+    elif rows * cols != num_children:
+        if orientation[:2] in ("tb", "bt"):
+            cols = ceil(num_children / rows)
+        else:
+            rows = ceil(num_children / cols)
+
+    fills_rows = orientation[:2] in ("lr", "rl")
+    right_to_left = "rl" in orientation
+    bottom_to_top = "bt" in orientation
+
+    cells = []
+    # parent.children is in reverse order of addition
+    for position in range(num_children - 1, -1, -1):
+        if fills_rows:
+            row, col = divmod(position, cols)
+        else:
+            col, row = divmod(position, rows)
+        if right_to_left:
+            col = cols - 1 - col
+        if bottom_to_top:
+            row = rows - 1 - row
+        cells.append((row, col))
+
+    return rows, cols, cells
+
+
+def _solve_grid_tracks(num_tracks, tracks, sizes, hints, default, minimums,
+                       available, track_of_self, new_hint):
+    """Computes the size of every column (or row) of a GridLayout, before and
+    after the expandable widget in track_of_self gets the size hint new_hint.
+
+    tracks, sizes and hints hold, for each child of the grid, the column (or
+    row) containing it, its width (or height) and its size hint, which is
+    negative if the size hint is None. default and minimums are the
+    col_default_width and cols_minimum (or their row counterparts) of the
+    grid, and available is its width (or height) minus padding and spacing.
+
+    The minimum size of a track is the largest of default, its entry in
+    minimums and the sizes of its children without size hints. Whatever is
+    left of available is distributed between the tracks in proportion to the
+    largest size hint in each of them. Returns two lists of track sizes.
+
+    The children are packed into arrays once. With NumPy, each step is then a
+    vector operation; without it, a single loop over the packed arrays."""
+    if np is not None:
+        return _solve_grid_tracks_numpy(
+            num_tracks, tracks, sizes, hints, default, minimums, available,
+            track_of_self, new_hint
+        )
+
+    tracks = array("l", tracks)
+    sizes = array("d", sizes)
+    hints = array("d", hints)
+
+    mins = array("d", [default]) * num_tracks
+    for track, minimum in minimums.items():
+        if 0 <= track < num_tracks and minimum > mins[track]:
+            mins[track] = minimum
+
+    max_hints = array("d", [0.]) * num_tracks
+    for track, size, hint in zip(tracks, sizes, hints):
+        if hint < 0:
+            if size > mins[track]:
+                mins[track] = size
+        elif hint > max_hints[track]:
+            max_hints[track] = hint
+
+    remaining = available - sum(mins)
+
+    def distribute():
+        sum_hints = sum(max_hints)
+        if sum_hints <= 0:
+            return list(mins)
+        scale = remaining / sum_hints
+        return [
+            minimum + hint * scale
+            for minimum, hint in zip(mins, max_hints)
+        ]
+
+    before = distribute()
+    max_hints[track_of_self] = new_hint
+    return before, distribute()
+
+
+def _solve_grid_tracks_numpy(num_tracks, tracks, sizes, hints, default,
+                             minimums, available, track_of_self, new_hint):
+    """The NumPy implementation of _solve_grid_tracks."""
+    tracks = np.fromiter(tracks, dtype=np.intp)
+    sizes = np.fromiter(sizes, dtype=float)
+    hints = np.fromiter(hints, dtype=float)
+
+    mins = np.full(num_tracks, float(default))
+    keys = np.fromiter(minimums.keys(), dtype=np.intp, count=len(minimums))
+    values = np.fromiter(minimums.values(), dtype=float, count=len(minimums))
+    in_range = (keys >= 0) & (keys < num_tracks)
+    np.maximum.at(mins, keys[in_range], values[in_range])
+
+    fixed = hints < 0
+    np.maximum.at(mins, tracks[fixed], sizes[fixed])
+    max_hints = np.zeros(num_tracks)
+    np.maximum.at(max_hints, tracks[~fixed], hints[~fixed])
+
+    remaining = available - mins.sum()
+
+    def distribute():
+        sum_hints = max_hints.sum()
+        if sum_hints <= 0:
+            return mins.tolist()
+        return (mins + max_hints * (remaining / sum_hints)).tolist()
+
+    before = distribute()
+    max_hints[track_of_self] = new_hint
+    return before, distribute()
+
+
 class ExpandableMixin(Widget):
     """A robust mixin for creating widgets that can be in an "expanded" or
     "retracted" state, horizontally and vertically.
@@ -113,9 +1210,43 @@ class ExpandableMixin(Widget):
     If the widget has a value for both min_x and min_x_hint, then the value for 
     min_x_hint is ALWAYS prioritized."""
 
-    max_x = NumericProperty(None)
+    _max_x = NumericProperty(None)
+    """Used internally. Stores the value assigned to max_x unless max_x was
+    assigned "content"."""
+
+    _max_x_content = BooleanProperty(False)
+    """Used internally. Is True if max_x was assigned "content"."""
+
+    def _get_max_x(self, *_args):
+        """Returns the assigned max_x, or the measured width of the content if
+        max_x was assigned "content"."""
+        if self._max_x_content:
+            return self._get_content_width()
+        return self._max_x
+
+    def _set_max_x(self, value, *_args):
+        """Assigns max_x. The string "content" makes max_x follow the width of
+        the content of this widget."""
+        if value == "content":
+            self._max_x_content = True
+        else:
+            self._max_x = value
+            self._max_x_content = False
+        return True
+
+    max_x = AliasProperty(_get_max_x, _set_max_x, bind=[
+        "_max_x",
+        "_max_x_content",
+        "_content_version"
+    ], cache=True)
     """The width the widget will have when horizontally expanded. It can never 
     be assigned a value of None.
+
+    If this is assigned the string "content", then the expanded width is the
+    intrinsic width of the content of this widget (the unwrapped text of a
+    Label, or the widths of its children). The measurement is cached and only
+    repeated when the text, size hints or children of the widget or its
+    descendants change, so toggling never measures the content again.
     
     If the widget has a value for both max_x and max_x_hint, then the value for 
     max_x_hint is ALWAYS prioritized."""
@@ -127,13 +1258,73 @@ class ExpandableMixin(Widget):
     If the widget has a value for both min_y and min_y_hint, then the value for 
     min_y_hint is ALWAYS prioritized."""
 
-    max_y = NumericProperty(None)
+    _max_y = NumericProperty(None)
+    """Used internally. Stores the value assigned to max_y unless max_y was
+    assigned "content"."""
+
+    _max_y_content = BooleanProperty(False)
+    """Used internally. Is True if max_y was assigned "content"."""
+
+    def _get_max_y(self, *_args):
+        """Returns the assigned max_y, or the measured height of the content if
+        max_y was assigned "content"."""
+        if self._max_y_content:
+            return self._get_content_height()
+        return self._max_y
+
+    def _set_max_y(self, value, *_args):
+        """Assigns max_y. The string "content" makes max_y follow the height of
+        the content of this widget."""
+        if value == "content":
+            self._max_y_content = True
+        else:
+            self._max_y = value
+            self._max_y_content = False
+        return True
+
+    max_y = AliasProperty(_get_max_y, _set_max_y, bind=[
+        "_max_y",
+        "_max_y_content",
+        "_content_version",
+        "width"
+    ], cache=True)
     """The height the widget will have when vertically expanded. It can never 
     be assigned a value of None.
+
+    If this is assigned the string "content", then the expanded height is the
+    intrinsic height of the content of this widget at its current width (the
+    wrapped text of a Label, or the heights of its children). The measurement
+    is cached and only repeated when the width changes or when the text, size
+    hints or children of the widget or its descendants change, so toggling
+    never measures the content again.
     
-    If the widget has a value for both max_y and max_y_hint, then the value for 
+    If the widget has a value for both max_y and max_y_hint, then the value for
     max_y_hint is ALWAYS prioritized."""
 
+    snap_points_x = ListProperty([])
+    """An ascending list of the widths this widget can snap to horizontally.
+    Each entry is either a width (a number, or a string with units such as
+    "120dp") or a size_hint_x written as a percentage (the string "50%" is a
+    size_hint_x of 0.5). Use the snap_x method to animate to any of them.
+
+    If this list is not empty, it must have at least two entries. The first
+    entry is the retracted width and the last entry is the expanded width; they
+    are assigned to min_x/min_x_hint and max_x/max_x_hint whenever this list
+    changes. Every entry between them is an intermediate state which counts as
+    expanded."""
+
+    snap_points_y = ListProperty([])
+    """An ascending list of the heights this widget can snap to vertically.
+    Each entry is either a height (a number, or a string with units such as
+    "120dp") or a size_hint_y written as a percentage (the string "50%" is a
+    size_hint_y of 0.5). Use the snap_y method to animate to any of them.
+
+    If this list is not empty, it must have at least two entries. The first
+    entry is the retracted height and the last entry is the expanded height;
+    they are assigned to min_y/min_y_hint and max_y/max_y_hint whenever this
+    list changes. Every entry between them is an intermediate state which
+    counts as expanded."""
+
     duration_resize = NumericProperty(0.25)
     """The duration of the resize animation in units of seconds. That is, 
     whenever you expand or retract the widget horizontally or vertically without 
@@ -210,6 +1401,207 @@ class ExpandableMixin(Widget):
     If you want the animation to always take the full 5 seconds, then set this 
     property to True."""
 
+    toggle_policy = OptionProperty(
+        "immediate",
+        options=["immediate", "debounce", "throttle", "latest"]
+    )
+    """How calls to toggle_x, expand_x, retract_x (and their y counterparts)
+    are applied:
+
+        "immediate": every call changes the state and retargets the animation
+            right away.
+        "latest": calls are collected and the latest requested state is
+            applied at the next frame, so a burst of calls within a frame
+            starts at most one animation.
+        "debounce": the latest requested state is applied once no call has
+            been made for toggle_interval seconds.
+        "throttle": the first call is applied right away, then the latest
+            state requested during each toggle_interval is applied when the
+            interval ends.
+
+    With any policy other than "immediate", expand_state_x and friends only
+    change when the state is applied. Calls that end up not retargeting the
+    widget (for example, two toggles within a frame) are counted in
+    coalesced_toggles."""
+
+    toggle_interval = NumericProperty(0.1)
+    """The interval, in seconds, used by the "debounce" and "throttle"
+    toggle policies."""
+
+    coalesced_toggles = NumericProperty(0)
+    """The number of toggle, expand and retract calls absorbed by toggle_policy
+    without retargeting the widget. It can be reset at any time."""
+
+    clip_on_resize = BooleanProperty(False)
+    """If True, whatever this widget and its children draw is clipped to the
+    bounds of the widget while it is resizing, so the content doesn't
+    overflow a retracting widget. The clipping is done with a scissor
+    (ScissorPush/ScissorPop), which is much cheaper than a StencilView, and
+    is only inserted into the canvas while a resize animation runs: the
+    widget costs nothing extra at rest.
+
+    Scissors are axis-aligned in window coordinates, so clipping is not
+    accurate for widgets drawn with a rotation or scale (e.g., inside a
+    Scatter)."""
+
+    freeze_text_on_resize = OptionProperty(
+        "none",
+        options=["none", "clip", "scale"]
+    )
+    """Labels which wrap their text to their width (text_size bound to width)
+    re-wrap and re-render their text on every frame of a resize, which is
+    usually much more expensive than the layout itself. This freezes the
+    text of every Label in this widget (this widget included) while a resize
+    animation runs, and re-renders each changed Label once when it
+    completes:
+
+        "none": Labels update as usual.
+        "clip": Labels keep their texture at its size, and the widget is
+            clipped while it resizes (as with clip_on_resize).
+        "scale": Labels keep their texture, stretched to follow their size.
+
+    Labels added to the widget during an animation are not frozen."""
+
+    _frozen_labels = ObjectProperty(None, allownone=True)
+    """Used internally. Maps each frozen Label to (texture trigger, stand-in
+    trigger, texture size, size) at the time it was frozen, or None."""
+
+    layout_cache = BooleanProperty(False)
+    """If True, the layout of the content of this widget is cached while it
+    resizes, so toggling back and forth replays layouts instead of computing
+    them again. While a resize animation of the width or height runs, the
+    positions and sizes of the descendants settled at each frame are stored
+    under the size of the widget. When the widget later passes through a
+    size with a stored layout, the layout is applied directly and the pending
+    layouts of the widget and its descendants are cancelled. Frame times
+    vary, so passes rarely go through the very same sizes unless
+    layout_cache_quantize is True.
+
+    The textures of the Labels in the widget are cached as well, keyed by
+    their text_size rounded to layout_cache_bucket pixels, unless
+    freeze_text_on_resize is used. A Label showing a reused texture
+    re-renders its text once the animation completes.
+
+    The cache is cleared when the text, size hints, children, padding,
+    spacing, orientation, rows, cols or font_size of the content change.
+    Anything else changing the layout of the content (for example, code
+    resizing a child whose size_hint is None) should be followed by a call to
+    clear_layout_cache(). The cache is only used by Layouts; widgets with
+    nested expandable widgets resizing at the same time are not cached."""
+
+    layout_cache_bucket = NumericProperty(8)
+    """The size, in pixels, of the buckets the text sizes (and, with
+    layout_cache_quantize, the animated sizes) are rounded to by
+    layout_cache. Passes only go through the same buckets when buckets are
+    about as large as the distance the widget moves in a frame: larger
+    buckets give more hits and fewer entries, at the cost of a coarser
+    animation."""
+
+    layout_cache_quantize = BooleanProperty(False)
+    """If True, layout_cache rounds the animated width and height of the
+    widget to a multiple of layout_cache_bucket pixels on every frame of a
+    resize, so every pass goes through the same sizes and replays the layouts
+    stored by the previous ones, at the cost of a coarser animation. The last
+    frame of an animation is not rounded, so the widget always settles on its
+    exact size."""
+
+    layout_cache_limit = NumericProperty(32 * 1024 * 1024)
+    """The memory, in bytes, which the entries of layout_cache may take. The
+    least recently used entries are evicted beyond it. Textures count for 4
+    bytes per pixel, and take most of it: if the textures of a full pass
+    don't fit, toggling back and forth evicts every entry before it is
+    reused."""
+
+    _layout_cache = ObjectProperty(None, allownone=True)
+    """Used internally. The _LayoutCache of this widget, or None."""
+
+    _cached_labels = ObjectProperty(None, allownone=True)
+    """Used internally. Maps each Label whose texture trigger is replaced by a
+    _CachedTextureTrigger to its texture trigger, or None."""
+
+    _resize_clip = ObjectProperty(None, allownone=True)
+    """Used internally. The (ScissorPush, ScissorPop) pair in the canvas while
+    the widget is clipped, or None."""
+
+    prewarm_on_hover = BooleanProperty(False)
+    """If True, the widget calls prewarm() when the mouse enters it, so a click
+    that follows starts animating without any setup cost. Only useful on
+    platforms with a mouse."""
+
+    prewarm_on_focus = BooleanProperty(False)
+    """If True, the widget calls prewarm() when it gains keyboard focus. Only
+    has an effect if the widget has a focus property (see
+    kivy.uix.behaviors.FocusBehavior)."""
+
+    overlay_expansion = BooleanProperty(False)
+    """If True, the widget is drawn over its neighbours while it is expanded or
+    resizing, instead of pushing them aside. When it starts expanding, the
+    widget leaves its parent for a layer over the window, and a placeholder
+    with the retracted size of the widget takes its place in the parent.
+    Neither the parent nor the siblings are laid out again while the widget
+    resizes, whatever their number, which suits previews and tooltips. Once
+    it is fully retracted, the widget takes its place back.
+
+    While it is in the layer, the widget stays over its place (see
+    overlay_anchor), following it when it moves, and takes its width (or
+    height) along the axes it can't resize. The bounds along the axes it
+    resizes must be in pixels (min_x/max_x, min_y/max_y or pixel snap points):
+    size hints have no meaning in the layer. Widgets which aren't in the
+    window when they expand resize in place."""
+
+    overlay_anchor = OptionProperty(
+        "top-left",
+        options=["top-left", "top-right", "bottom-left", "bottom-right"]
+    )
+    """The corner of the widget which stays on the same corner of its place
+    while it is drawn over its neighbours (see overlay_expansion). With
+    "top-left", the widget grows to the right and downwards."""
+
+    cull_hidden_animations = OptionProperty(
+        "none",
+        options=["none", "complete", "pause"]
+    )
+    """What a resize animation does when the widget can't be seen: when it is
+    not in the window (for example, on a Screen which isn't the current one),
+    when it is entirely outside the window or outside a StencilView (such as
+    a ScrollView) containing it, or when it or one of its ancestors has an
+    opacity of 0. The visibility is checked on every frame of the animation:
+
+        "none": the animation runs as usual.
+        "complete": the animation stops, and the widget takes its final size
+            in one update.
+        "pause": the animation stops where it is. The widget then checks
+            every cull_poll_interval seconds whether it is visible again, and
+            resumes toward its state for the rest of the duration when it
+            is. resizing is False while the animation is paused."""
+
+    cull_poll_interval = NumericProperty(.1)
+    """How often, in seconds, a widget whose animation is paused by
+    cull_hidden_animations checks whether it is visible again."""
+
+    _overlay_placeholder = ObjectProperty(None, allownone=True)
+    """Used internally. The Widget holding the place of this widget in its
+    parent while this widget is in the overlay layer, or None."""
+
+    _layout_plan = ObjectProperty(None, allownone=True)
+    """Used internally. The analysis of the parent computed by prewarm(), or
+    None. See _get_layout_plan."""
+
+    max_resize_rate = NumericProperty(None, allownone=True)
+    """The maximum number of times per second resize animations of this
+    widget update its width, height or size hints. Between two updates, the
+    animation is not evaluated at all, so a cap of 30 roughly halves the work
+    of an animation on a 60Hz display. 0 means no cap. By default (None), the
+    global cap set with ExpandableMixin.set_default_max_resize_rate is used,
+    which is 0 unless it is changed.
+
+    If animation_governor caps the rate of animations as well, the lower of
+    the two rates applies."""
+
+    _default_max_resize_rate = 0
+    """Used internally. The cap used by widgets whose max_resize_rate is None,
+    in updates per second. See set_default_max_resize_rate."""
+
     transition_resize = OptionProperty(
         AnimationTransition.linear,
         options=anim_transitions
@@ -302,16 +1694,86 @@ class ExpandableMixin(Widget):
     This value will override any value assigned to transition_resize or 
     transition_resize_y."""
 
+    drag_resize_x = BooleanProperty(False)
+    """If True, the user can resize the widget horizontally by dragging the
+    edge given by drag_edge_x. When the touch is released, the velocity of the
+    drag decides which snap point (or, if there are no snap_points_x, whether
+    the expanded or retracted width) the widget animates to. The animation
+    starts at the width the finger left the widget at."""
+
+    drag_resize_y = BooleanProperty(False)
+    """If True, the user can resize the widget vertically by dragging the edge
+    given by drag_edge_y. When the touch is released, the velocity of the drag
+    decides which snap point (or, if there are no snap_points_y, whether the
+    expanded or retracted height) the widget animates to. The animation starts
+    at the height the finger left the widget at."""
+
+    drag_edge_x = OptionProperty("right", options=["left", "right"])
+    """The edge the user drags to resize the widget horizontally."""
+
+    drag_edge_y = OptionProperty("top", options=["top", "bottom"])
+    """The edge the user drags to resize the widget vertically."""
+
+    drag_handle_size = NumericProperty("16dp")
+    """How far from the draggable edge, in pixels, a touch can land and still
+    start a drag."""
+
+    fling_time = NumericProperty(0.15)
+    """When a drag is released, the widget animates to the snap point closest
+    to where the edge would be after travelling for this many seconds at the
+    release velocity. Larger values make flings more sensitive."""
+
+    batch_nested_layout = BooleanProperty(True)
+    """If True and this widget is nested inside another ExpandableMixin, the
+    layouts containing this widget are updated in one batch per frame while it
+    animates. Every affected layout runs at most once bottom-up (so minimum
+    sizes propagate to the outer layouts) and once top-down (so children
+    follow their moved parents), instead of cascading through the Clock once
+    per level of nesting."""
+
+    expandable_id = StringProperty("")
+    """A stable identifier used by snapshot_expand_states and
+    restore_expand_states (see the expandable_state module). If empty, the
+    widget is identified by its position in the widget tree instead, which
+    only survives between sessions if the tree is built the same way."""
+
     _resize_animation = ObjectProperty(None, allownone=True)
     """Private variable used for determining whether this widget is currently 
     animating something. Stores the Animation object which is performing the 
     current animation, or is None if there is no animation."""
 
     _timestamp_horizontal = NumericProperty(None, allownone=True)
-    """Used for determining how much any horizontal animation has progressed."""
+    """The frame time (Clock.get_time) at which the current horizontal
+    animation started or last ran, or None if there is none."""
 
     _timestamp_vertical = NumericProperty(None, allownone=True)
-    """Used for determining how much any vertical animation has progressed."""
+    """The frame time (Clock.get_time) at which the current vertical animation
+    started or last ran, or None if there is none."""
+
+    _elapsed_horizontal = NumericProperty(0)
+    """The time the current horizontal animation has run, accumulated frame by
+    frame from the Clock which steps it."""
+
+    _elapsed_vertical = NumericProperty(0)
+    """The time the current vertical animation has run."""
+
+    _animation_horizontal = ObjectProperty(None, allownone=True)
+    """The Animation resizing this widget horizontally, or None. Unlike
+    _resize_animation, it is not replaced by a vertical animation."""
+
+    _animation_vertical = ObjectProperty(None, allownone=True)
+    """The Animation resizing this widget vertically, or None."""
+
+    _progress_horizontal = NumericProperty(None, allownone=True)
+    """The fraction of its path the last interrupted horizontal animation had
+    traveled when it was cancelled, or None if no animation was interrupted
+    since the horizontal duration was last calculated. It is also reset when a
+    horizontal animation completes or is given its duration, since it would
+    otherwise shorten the next calculated duration."""
+
+    _progress_vertical = NumericProperty(None, allownone=True)
+    """The fraction of its path the last interrupted vertical animation had
+    traveled when it was cancelled, or None."""
 
     _prev_duration_horizontal = NumericProperty(None, allownone=True)
     """Used for the internal algorithm which dynamically assigns animation 
@@ -357,6 +1819,78 @@ class ExpandableMixin(Widget):
     widget constructor is called in Python, or after all of the rules in kvlang 
     are parsed for this instance."""
 
+    _content_version = NumericProperty(0)
+    """Used internally. Incremented whenever the text, size hints, children or
+    layout settings of this widget or any of its descendants change. It is
+    the key for the cached content measurements and layouts."""
+
+    _content_bindings = ObjectProperty(None, allownone=True)
+    """Used internally. A list of (widget, property name, uid) tuples for every
+    binding made to watch the content of this widget, or None if the content
+    is not watched."""
+
+    _content_width_cache = ObjectProperty(None, allownone=True)
+    """Used internally. A tuple (key, width) caching the last measured width of
+    the content."""
+
+    _content_height_cache = ObjectProperty(None, allownone=True)
+    """Used internally. A tuple (key, height) caching the last measured height
+    of the content."""
+
+    _drag_touch_horizontal = ObjectProperty(None, allownone=True)
+    """Used internally. The touch which is currently dragging the horizontal
+    edge of this widget, or None."""
+
+    _drag_touch_vertical = ObjectProperty(None, allownone=True)
+    """Used internally. The touch which is currently dragging the vertical edge
+    of this widget, or None."""
+
+    _drag_origin_horizontal = ObjectProperty(None, allownone=True)
+    """Used internally. A tuple (touch.x, width) recorded when a drag of the
+    horizontal edge starts, or None."""
+
+    _drag_origin_vertical = ObjectProperty(None, allownone=True)
+    """Used internally. A tuple (touch.y, height) recorded when a drag of the
+    vertical edge starts, or None."""
+
+    _drag_pending_size = NumericProperty(None, allownone=True)
+    """Used internally. The size the latest touch move asked for. It is applied
+    once per frame, no matter how many touch moves arrive."""
+
+    _drag_samples = ObjectProperty(None, allownone=True)
+    """Used internally. A ring buffer of (time, size) tuples used to estimate
+    the velocity of a drag."""
+
+    _snap_index_horizontal = NumericProperty(0)
+    """Used internally. The index of the horizontal snap point the widget is
+    at or animating to. Please never make assignments to this attribute at
+    runtime."""
+
+    _snap_index_vertical = NumericProperty(0)
+    """Used internally. The index of the vertical snap point the widget is at
+    or animating to. Please never make assignments to this attribute at
+    runtime."""
+
+    _snap_points_horizontal = ObjectProperty(None, allownone=True)
+    """Used internally. Caches the parsed horizontal snap points as a list of
+    (size, is_hint) tuples. Is None whenever the cache must be rebuilt."""
+
+    _snap_points_vertical = ObjectProperty(None, allownone=True)
+    """Used internally. Caches the parsed vertical snap points as a list of
+    (size, is_hint) tuples. Is None whenever the cache must be rebuilt."""
+
+    _snap_lookup_horizontal = ObjectProperty(None, allownone=True)
+    """Used internally. Caches a tuple (key, sizes, indices) where sizes is the
+    sorted list of horizontal snap points in pixels and indices maps each
+    sorted size to its index in snap_points_x. key is the allotted width used
+    to convert hints into pixels."""
+
+    _snap_lookup_vertical = ObjectProperty(None, allownone=True)
+    """Used internally. Caches a tuple (key, sizes, indices) where sizes is the
+    sorted list of vertical snap points in pixels and indices maps each sorted
+    size to its index in snap_points_y. key is the allotted height used to
+    convert hints into pixels."""
+
     def _get_resizing(self, *_args):
         """Return True if the widget is currently animating."""
         return self._resize_animation is not None
@@ -417,8 +1951,8 @@ class ExpandableMixin(Widget):
     expanded_x = AliasProperty(_get_fully_expanded_hor, bind=[
         "size_hint_x",
         "width",
-        "max_y_hint",
-        "max_y",
+        "max_x_hint",
+        "max_x",
         "expand_state_x"
     ])
     """Is True if this widget is horizontally expanded. This property is 
@@ -516,6 +2050,32 @@ class ExpandableMixin(Widget):
     ])
     """Is True if this widget is vertically retracting."""
 
+    def _get_snap_index_horizontal(self, *_args):
+        """Returns the index of the horizontal snap point the widget is at or
+        animating to."""
+        return self._snap_index_horizontal
+
+    snap_index_x = AliasProperty(_get_snap_index_horizontal, bind=[
+        "_snap_index_horizontal"
+    ])
+    """The index in snap_points_x of the width the widget is at or animating
+    to. If snap_points_x is empty, this is 0 when the widget is retracted or
+    retracting and 1 when it is expanded or expanding. This property is
+    read-only."""
+
+    def _get_snap_index_vertical(self, *_args):
+        """Returns the index of the vertical snap point the widget is at or
+        animating to."""
+        return self._snap_index_vertical
+
+    snap_index_y = AliasProperty(_get_snap_index_vertical, bind=[
+        "_snap_index_vertical"
+    ])
+    """The index in snap_points_y of the height the widget is at or animating
+    to. If snap_points_y is empty, this is 0 when the widget is retracted or
+    retracting and 1 when it is expanded or expanding. This property is
+    read-only."""
+
     custom_size_hint_resolver = ObjectProperty(None)
     """For advanced users.
     
@@ -576,12 +2136,95 @@ class ExpandableMixin(Widget):
     expand_state, expanding, resizing, etc) will be updated appropriately if you 
     use that method."""
 
+    custom_size_hint_batch_resolver = ObjectProperty(None)
+    """For advanced users. A batch variant of custom_size_hint_resolver.
+
+    If many expandable children of a custom layout resize together, a
+    per-widget resolver repeats the same analysis of the layout for each of
+    them. When this callback is assigned, resolving the size hint is deferred
+    to the end of the frame, and the callback is called once for every
+    expandable child of the same parent, resizing along the same axis, that
+    has the same batch callbacks.
+
+    The callback takes three positional parameters:
+        parent: the layout containing the widgets
+        x_or_y: str; whether you are resolving size_hint_x or size_hint_y
+        widgets: list; the widgets whose size hint must be resolved
+
+    It must assign the resolved size hint of each widget and return a list
+    with one boolean per widget, which is True if that widget needs the
+    special animation (see custom_size_hint_animation). If it returns None,
+    each widget is resolved individually instead."""
+
+    custom_size_hint_batch_animation = ObjectProperty(None)
+    """For advanced users. A batch variant of custom_size_hint_animation, used
+    together with custom_size_hint_batch_resolver.
+
+    The callback is called once per batch with the widgets for which the
+    batch resolver returned True. It takes three positional parameters:
+        parent: the layout containing the widgets
+        x_or_y: str; whether you are animating horizontally/vertically
+        requests: list of (widget, hint, transition, duration) tuples
+
+    If it returns None, the special animation of each widget is performed
+    individually instead. As with custom_size_hint_animation, use the
+    start_resize_animation method of each widget to animate it."""
+
+    animate_in_pixel_space = BooleanProperty(False)
+    """If True, animating to a hinted size (for example, from min_x to
+    max_x_hint) animates width/height in pixels towards the size the hint will
+    give this widget. That size is recomputed every frame, so the animation
+    follows the parent if it resizes meanwhile. The size hint is only assigned
+    once the animation completes.
+
+    This avoids resolving the current size into a size hint on every toggle,
+    as well as the special-case animations in BoxLayouts and GridLayouts. It
+    requires the handlers registered for the type of the parent to provide a
+    pixel_target (see register_size_hint_resolver), which every built-in
+    layout does; otherwise, the size hint is animated as usual."""
+
+    _pixel_progress_horizontal = NumericProperty(0)
+    """Used internally. The progress, from 0 to 1, of a horizontal animation in
+    pixel space (see animate_in_pixel_space)."""
+
+    _pixel_progress_vertical = NumericProperty(0)
+    """Used internally. The progress, from 0 to 1, of a vertical animation in
+    pixel space (see animate_in_pixel_space)."""
+
+    _pixel_animation_horizontal = ObjectProperty(None, allownone=True)
+    """Used internally. A tuple (pixel_target, hint, start_width) describing
+    the current horizontal animation in pixel space, or None."""
+
+    _pixel_animation_vertical = ObjectProperty(None, allownone=True)
+    """Used internally. A tuple (pixel_target, hint, start_height) describing
+    the current vertical animation in pixel space, or None."""
+
+    _batched_hint_horizontal = BooleanProperty(False)
+    """Used internally. Is True while an animation to a horizontal size hint
+    waits for the end of the frame to be resolved in a batch."""
+
+    _batched_hint_vertical = BooleanProperty(False)
+    """Used internally. Is True while an animation to a vertical size hint
+    waits for the end of the frame to be resolved in a batch."""
+
     def __init__(self, **kwargs):
         attributes = [
             "allow_resize_x",
             "allow_resize_y",
+            "animate_in_pixel_space",
+            "batch_nested_layout",
+            "clip_on_resize",
             "custom_size_hint_animation",
+            "custom_size_hint_batch_animation",
+            "custom_size_hint_batch_resolver",
             "custom_size_hint_resolver",
+            "cull_hidden_animations",
+            "cull_poll_interval",
+            "drag_edge_x",
+            "drag_edge_y",
+            "drag_handle_size",
+            "drag_resize_x",
+            "drag_resize_y",
             "duration_expand_x",
             "duration_expand_y",
             "duration_resize",
@@ -591,12 +2234,20 @@ class ExpandableMixin(Widget):
             "duration_retract_y",
             "expand_state_x",
             "expand_state_y",
+            "expandable_id",
             "expanded_x",
             "expanded_y",
             "expanding_x",
             "expanding_y",
             "fixed_duration_x",
             "fixed_duration_y",
+            "fling_time",
+            "freeze_text_on_resize",
+            "layout_cache",
+            "layout_cache_bucket",
+            "layout_cache_limit",
+            "layout_cache_quantize",
+            "max_resize_rate",
             "max_x",
             "max_x_hint",
             "max_y",
@@ -605,6 +2256,10 @@ class ExpandableMixin(Widget):
             "min_x_hint",
             "min_y",
             "min_y_hint",
+            "overlay_anchor",
+            "overlay_expansion",
+            "prewarm_on_focus",
+            "prewarm_on_hover",
             "resizing",
             "retract_state_x",
             "retract_state_y",
@@ -612,8 +2267,12 @@ class ExpandableMixin(Widget):
             "retracted_y",
             "retracting_x",
             "retracting_y",
+            "snap_points_x",
+            "snap_points_y",
             "start_expanded_x",
             "start_expanded_y",
+            "toggle_interval",
+            "toggle_policy",
             "transition_expand_x",
             "transition_expand_y",
             "transition_resize",
@@ -635,7 +2294,7 @@ class ExpandableMixin(Widget):
 
         self.bind(min_y_hint=self._update_height)
         self.bind(max_y_hint=self._update_height)
-        self.bind(min_x=self._update_height)
+        self.bind(min_y=self._update_height)
         self.bind(max_y=self._update_height)
         self.bind(expand_state_y=self._update_height)
 
@@ -644,10 +2303,148 @@ class ExpandableMixin(Widget):
         self.bind(retracted_x=self._clear_anim_data_horizontal)
         self.bind(retracted_y=self._clear_anim_data_vertical)
 
+        self.bind(snap_points_x=self._on_snap_points_x)
+        self.bind(snap_points_y=self._on_snap_points_y)
+        self.bind(_expanded_horizontal=self._sync_snap_index_horizontal)
+        self.bind(_expanded_vertical=self._sync_snap_index_vertical)
+
         self.bind(on_kv_post=self._after_initialization)
 
+        self.fbind(
+            "_pixel_progress_horizontal",
+            self._on_pixel_progress_horizontal
+        )
+        self.fbind("_pixel_progress_vertical", self._on_pixel_progress_vertical)
+
+        self._pending_states = {"x": None, "y": None}
+        self._layout_plan_bindings = []
+        self.fbind("prewarm_on_hover", self._on_prewarm_on_hover)
+        self.fbind("clip_on_resize", self._on_clip_on_resize)
+        self.fbind("freeze_text_on_resize", self._on_clip_on_resize)
+        self.fbind("freeze_text_on_resize", self._on_freeze_text_on_resize)
+        self.fbind("prewarm_on_focus", self._on_prewarm_on_focus)
+        self._paused_resizes = {}
+        self._cull_poll = None
+        self.fbind(
+            "cull_hidden_animations",
+            self._on_cull_hidden_animations
+        )
+        self.fbind("overlay_expansion", self._on_overlay_expansion)
+        self.fbind("overlay_anchor", self._update_overlay_geometry)
+        self.fbind("layout_cache", self._on_layout_cache)
+        self.fbind("layout_cache_limit", self._on_layout_cache_limit)
+        self.fbind("freeze_text_on_resize", self._on_layout_cache)
+        self._pending_layout = None
+        self._layout_capture_trigger = None
+        self._toggle_events = {"x": None, "y": None}
+
+        self._trigger_drag_update = Clock.create_trigger(
+            self._apply_drag_size
+        )
+        self.fbind("on_touch_down", self._on_drag_touch_down)
+        self.fbind("on_touch_move", self._on_drag_touch_move)
+        self.fbind("on_touch_up", self._on_drag_touch_up)
+
         super(ExpandableMixin, self).__init__(**kwargs)
 
+    @classmethod
+    @contextmanager
+    def batch(cls):
+        """A context manager which defers the sizes assigned by expandable
+        widgets until the block exits:
+
+            with ExpandableMixin.batch():
+                for panel in panels:
+                    panel.instant_retract_y()
+
+        States (expand_state_x, retract_state_y, etc.) change immediately, but
+        width, height and size hints (and so expanded_x, retracted_y, etc.) are
+        only assigned when the outermost batch exits, once per widget and axis.
+        The layout of each parent of a resized widget is then triggered exactly
+        once, so it lays out once on the next pass of the Clock. Batches can be
+        nested."""
+        _size_batch.depth += 1
+        try:
+            yield
+        finally:
+            _size_batch.depth -= 1
+            if not _size_batch.depth:
+                _size_batch.apply()
+
+    @staticmethod
+    def set_default_max_resize_rate(rate):
+        """Caps how many times per second the resize animations of every
+        widget whose max_resize_rate is None update it, for example 30 on
+        low-power displays. 0 removes the cap. Animations read the cap when
+        they start."""
+        if rate < 0:
+            raise ExpandableMixinError(
+                f"The maximum resize rate must not be negative; got {rate}"
+            )
+        ExpandableMixin._default_max_resize_rate = rate
+
+    @staticmethod
+    def register_size_hint_resolver(layout_class, resolver, animator=None,
+                                    pixel_target=None):
+        """Registers how expandable children of layout_class (and of its
+        subclasses, unless they have their own registration) resolve and
+        animate their size hints.
+
+        resolver(widget, axis) is called with axis "x" or "y" when widget must
+        animate to a size hint while its size hint along that axis is None. It
+        must assign the size hint which reproduces the current size of widget
+        and return False, or return True if assigning a size hint would make
+        widget snap to another size. In that case, animator(widget, axis, hint,
+        transition, duration) is called instead to animate widget smoothly
+        towards the size the hint will give it. These are the same signatures
+        as custom_size_hint_resolver and custom_size_hint_animation, which
+        still take priority over the registry for the widget they are assigned
+        to.
+
+        pixel_target(widget, axis, hint) must return the width (or height)
+        widget would have if it were given the size hint, with every other
+        child unchanged. It is required for widgets with animate_in_pixel_space
+        to animate in pixels in this layout.
+
+            def resolve_in_carousel(widget, axis):
+                if axis == "x":
+                    widget.size_hint_x = widget.width / widget.parent.width
+                else:
+                    widget.size_hint_y = widget.height / widget.parent.height
+                return False
+
+            ExpandableMixin.register_size_hint_resolver(
+                MyCarousel,
+                resolve_in_carousel
+            )
+
+        layout_class can also be the dotted name of the class, such as
+        "kivy.uix.carousel.Carousel", so registering doesn't require importing
+        it. A registration by class takes priority over one by name for the
+        same class.
+
+        Window, FloatLayout, RelativeLayout, AnchorLayout, BoxLayout,
+        StackLayout and GridLayout are registered by default (by name)."""
+        _size_hint_handlers[layout_class] = (resolver, animator, pixel_target)
+        _size_hint_handler_cache.clear()
+
+    def _create_resize_animation(self, t, d, **properties):
+        """Returns an Animation of properties with transition t and duration
+        d, used for every resize of this widget (and of the tracks of its
+        parent, in the special cases), after applying the degradation chosen
+        by animation_governor and the cap of max_resize_rate."""
+        governor = animation_governor
+        if governor.level:
+            d *= governor.duration_scale
+
+        rate = self.max_resize_rate
+        if rate is None:
+            rate = self._default_max_resize_rate
+        step = governor.step
+        if rate:
+            step = max(step, 1. / rate)
+        return Animation(t=t, d=d, s=step, **properties)
+
     def start_resize_animation(self, animation: Animation, anim_type: bool):
         """This method takes an animation object and performs that animation on
         this widget. The second argument informs the method whether we are
@@ -662,31 +2459,109 @@ class ExpandableMixin(Widget):
         specified by min_x/max_x/min_y/max_y/min_x_hint/max_x_hint/etc."""
         if anim_type is HORIZONTAL:
             def on_start(*_args):
-                self._timestamp_horizontal = time.perf_counter()
+                self._timestamp_horizontal = Clock.get_time()
+                self._elapsed_horizontal = 0.
+
+            def on_progress(animation, *_args):
+                if animation is not self._animation_horizontal:
+                    # cancelled by another observer of this frame
+                    return
+                # Animation counts no time for its first frame, so the time
+                # is accumulated here from the frame times of the Clock
+                now = Clock.get_time()
+                self._elapsed_horizontal += now - self._timestamp_horizontal
+                self._timestamp_horizontal = now
 
             def on_complete(*_args):
                 self._timestamp_horizontal = None
+                self._animation_horizontal = None
                 self._resize_animation = None
+                # nothing was interrupted; a snap point ends neither expanded
+                # nor retracted, which would clear this as well
+                self._clear_anim_data_horizontal(self, True)
                 self._update_width_and_height()
+
+            self._animation_horizontal = animation
         else:
             def on_start(*_args):
-                self._timestamp_vertical = time.perf_counter()
+                self._timestamp_vertical = Clock.get_time()
+                self._elapsed_vertical = 0.
+
+            def on_progress(animation, *_args):
+                if animation is not self._animation_vertical:
+                    # cancelled by another observer of this frame
+                    return
+                # Animation counts no time for its first frame, so the time
+                # is accumulated here from the frame times of the Clock
+                now = Clock.get_time()
+                self._elapsed_vertical += now - self._timestamp_vertical
+                self._timestamp_vertical = now
 
             def on_complete(*_args):
                 self._timestamp_vertical = None
+                self._animation_vertical = None
                 self._resize_animation = None
+                # nothing was interrupted; a snap point ends neither expanded
+                # nor retracted, which would clear this as well
+                self._clear_anim_data_vertical(self, True)
                 self._update_width_and_height()
 
-        animation.bind(on_start=on_start, on_complete=on_complete)
+            self._animation_vertical = animation
+
+        animation.bind(
+            on_start=on_start,
+            on_progress=on_progress,
+            on_complete=on_complete
+        )
+        if self.cull_hidden_animations != "none":
+            animation.bind(on_progress=self._on_cull_progress)
+        if self.layout_cache and hasattr(self, "do_layout"):
+            animation.bind(on_progress=self._on_layout_cache_progress)
+        if self.batch_nested_layout and self._is_nested():
+            animation.bind(on_progress=self._on_nested_progress)
         self._resize_animation = animation
         animation.start(self)
 
+    def _is_nested(self):
+        """Returns True if an ancestor of this widget is an ExpandableMixin."""
+        parent = self.parent
+        while parent is not None and parent is not parent.parent:
+            if isinstance(parent, ExpandableMixin):
+                return True
+            parent = parent.parent
+        return False
+
+    def _on_nested_progress(self, *_args):
+        """Hands the layouts containing this widget to the nested layout batcher
+        after every frame of a resize animation."""
+        _nested_layout_batcher.mark(self)
+
     def toggle_x(self, *_args):
         """If horizontal resizing is allowed, then change the horizontal state
-        and animate to the new width."""
+        and animate to the new width (or jump to it, if animation_governor is
+        at its last level).
+
+        Unless toggle_policy is "immediate", the toggle is deferred and may be
+        coalesced with other toggle_x, expand_x and retract_x calls."""
         if not self.allow_resize_x:
             return
 
+        if self.toggle_policy != "immediate":
+            self._queue_state("x", None)
+            return
+
+        self._toggle_x_now()
+
+    def _toggle_x_now(self):
+        """Changes the horizontal state and animates to the new width,
+        regardless of toggle_policy."""
+        if not self.allow_resize_x:
+            return
+
+        if animation_governor.instant:
+            self.instant_toggle_x()
+            return
+
         if self._expanded_horizontal:
             if self.min_x_hint is not None:
                 self._animate_width_hint(self.min_x_hint)
@@ -709,10 +2584,30 @@ class ExpandableMixin(Widget):
 
     def toggle_y(self, *_args):
         """If vertical resizing is allowed, then change the vertical state and
-        animate to the new height."""
+        animate to the new height (or jump to it, if animation_governor is at
+        its last level).
+
+        Unless toggle_policy is "immediate", the toggle is deferred and may be
+        coalesced with other toggle_y, expand_y and retract_y calls."""
+        if not self.allow_resize_y:
+            return
+
+        if self.toggle_policy != "immediate":
+            self._queue_state("y", None)
+            return
+
+        self._toggle_y_now()
+
+    def _toggle_y_now(self):
+        """Changes the vertical state and animates to the new height, regardless
+        of toggle_policy."""
         if not self.allow_resize_y:
             return
 
+        if animation_governor.instant:
+            self.instant_toggle_y()
+            return
+
         if self._expanded_vertical:
             if self.min_y_hint is not None:
                 self._animate_height_hint(self.min_y_hint)
@@ -734,96 +2629,955 @@ class ExpandableMixin(Widget):
 
         self._expanded_vertical = not self._expanded_vertical
 
+    def _queue_state(self, axis, expanded):
+        """Defers a change of the state along axis ("x" or "y") according to
+        toggle_policy. expanded is the requested state, or None to toggle the
+        latest requested state."""
+        if axis == "x":
+            if not self.allow_resize_x:
+                return
+            current = self._expanded_horizontal
+        else:
+            if not self.allow_resize_y:
+                return
+            current = self._expanded_vertical
+        pending = self._pending_states[axis]
+        if pending is None:
+            if expanded is not None and expanded == current:
+                return
+            target = not current if expanded is None else expanded
+        else:
+            target = not pending if expanded is None else expanded
+
+        policy = self.toggle_policy
+        event = self._toggle_events[axis]
+        if policy == "throttle" and event is None:
+            # leading edge: apply now, then hold further calls until the
+            # interval elapses
+            self._pending_states[axis] = target
+            self._flush_state(axis)
+            self._toggle_events[axis] = Clock.schedule_once(
+                partial(self._on_toggle_interval, axis),
+                self.toggle_interval
+            )
+            return
+
+        if pending is not None:
+            self.coalesced_toggles += 1
+        self._pending_states[axis] = target
+
+        if policy == "debounce":
+            if event is not None:
+                event.cancel()
+            self._toggle_events[axis] = Clock.schedule_once(
+                partial(self._flush_state, axis),
+                self.toggle_interval
+            )
+        elif policy == "latest" and event is None:
+            self._toggle_events[axis] = Clock.schedule_once(
+                partial(self._flush_state, axis)
+            )
+
+    def _flush_state(self, axis, *_args):
+        """Applies the state requested along axis, if it differs from the
+        current one. Returns True if the widget was toggled."""
+        self._toggle_events[axis] = None
+        target = self._pending_states[axis]
+        self._pending_states[axis] = None
+        if target is None:
+            return False
+
+        if axis == "x":
+            if target == self._expanded_horizontal:
+                self.coalesced_toggles += 1
+                return False
+            self._toggle_x_now()
+        else:
+            if target == self._expanded_vertical:
+                self.coalesced_toggles += 1
+                return False
+            self._toggle_y_now()
+        return True
+
+    def _on_toggle_interval(self, axis, *_args):
+        """Ends a throttling interval by applying the latest state requested
+        during it. If that toggles the widget, a new interval starts."""
+        if self._flush_state(axis):
+            self._toggle_events[axis] = Clock.schedule_once(
+                partial(self._on_toggle_interval, axis),
+                self.toggle_interval
+            )
+
     def expand_x(self, *_args):
         """If horizontal resizing is allowed, then ensure the horizontal state
         is the expand state. If not, animate to the expanded width."""
-        if not self._expanded_horizontal:
+        if self.toggle_policy != "immediate":
+            self._queue_state("x", True)
+        elif not self._expanded_horizontal:
             self.toggle_x()
 
     def retract_x(self, *_args):
         """If horizontal resizing is allowed, then ensure the horizontal state
         is in the retract state. If not, animate to the retracted width."""
-        if not self.retract_state_x:
+        if self.toggle_policy != "immediate":
+            self._queue_state("x", False)
+        elif not self.retract_state_x:
             self.toggle_x()
 
     def expand_y(self, *_args):
         """If vertical resizing is allowed, then ensure the vertical state is in
         the expand state. If not, animate to the expanded width."""
-        if not self._expanded_vertical:
+        if self.toggle_policy != "immediate":
+            self._queue_state("y", True)
+        elif not self._expanded_vertical:
             self.toggle_y()
 
     def retract_y(self, *_args):
         """If vertical resizing is allowed, then ensure the vertical state is in
         the retract state. If not, animate to the retracted width."""
-        if not self.retract_state_y:
+        if self.toggle_policy != "immediate":
+            self._queue_state("y", False)
+        elif not self.retract_state_y:
             self.toggle_y()
 
-    def instant_expand_x(self, *_args):
-        """If horizontal resizing is allowed, then immediately expand to the
-        expanded width without animating."""
-        if not self.allow_resize_x:
+    def prewarm_x(self, *_args):
+        """Does ahead of time the work the next horizontal toggle would do on
+        its first frame, so it starts animating without any setup cost: the
+        lookup of how the parent handles size hints, the analysis of the
+        rows, columns or cells of the parent (for BoxLayout, StackLayout and
+        GridLayout parents), the snap points and the measurement of the
+        content (if max_x is "content").
+
+        The analysis of the parent is kept until the parent changes (this
+        widget is moved, or the parent's children, size, orientation,
+        spacing, padding, rows or cols change), and is reused by every resize
+        until then. Does nothing if horizontal resizing isn't allowed or the
+        widget has no parent."""
+        if not self.allow_resize_x or self._get_layout_plan() is None:
             return
-
-        Animation.cancel_all(self, "size_hint_x")
-        Animation.cancel_all(self, "width")
-        if self.max_x_hint is not None:
-            self.size_hint_x = self.max_x_hint
-        elif self.max_x is not None:
-            self.width = self.max_x
+        self._get_snap_points_x()
+        if self._max_x_content:
+            self._get_content_width()
+
+    def prewarm_y(self, *_args):
+        """Does ahead of time the work the next vertical toggle would do on its
+        first frame. See prewarm_x."""
+        if not self.allow_resize_y or self._get_layout_plan() is None:
+            return
+        self._get_snap_points_y()
+        if self._max_y_content:
+            self._get_content_height()
+
+    def prewarm(self, *_args):
+        """Calls prewarm_x and prewarm_y."""
+        self.prewarm_x()
+        self.prewarm_y()
+
+    def _on_prewarm_on_hover(self, _instance, value):
+        """Starts or stops prewarming this widget when the mouse enters it."""
+        if value:
+            _hover_prewarmer.add(self)
         else:
-            raise ExpandableMixinError(
-                "allow_resize_x is True yet there is no max_x or max_x_hint"
+            _hover_prewarmer.discard(self)
+
+    def _on_prewarm_on_focus(self, _instance, value):
+        """Starts or stops prewarming this widget when it gains focus."""
+        if "focus" not in self.properties():
+            return
+        self.funbind("focus", self._on_focus_prewarm)
+        if value:
+            self.fbind("focus", self._on_focus_prewarm)
+
+    def _on_focus_prewarm(self, _instance, focus):
+        if focus:
+            self.prewarm()
+
+    def _is_clipped_on_resize(self):
+        """Returns True if the widget should be clipped while it resizes."""
+        return self.clip_on_resize or self.freeze_text_on_resize == "clip"
+
+    def _on_clip_on_resize(self, *_args):
+        """Starts or stops watching the resize animations to clip the widget
+        while they run."""
+        self.funbind("_animation_horizontal", self._update_resize_clip)
+        self.funbind("_animation_vertical", self._update_resize_clip)
+        if self._is_clipped_on_resize():
+            self.fbind("_animation_horizontal", self._update_resize_clip)
+            self.fbind("_animation_vertical", self._update_resize_clip)
+        self._update_resize_clip()
+
+    def _update_resize_clip(self, *_args):
+        """Inserts the scissor into the canvas when a resize animation starts
+        and removes it once no resize animation is left. The animations of
+        both axes are checked, since one can end while the other runs."""
+        resizing = self._is_clipped_on_resize() and (
+            self._animation_horizontal is not None or
+            self._animation_vertical is not None
+        )
+        clip = self._resize_clip
+        if resizing and clip is None:
+            clip = ScissorPush(), ScissorPop()
+            self.canvas.before.insert(0, clip[0])
+            self.canvas.after.add(clip[1])
+            self._resize_clip = clip
+            self.fbind("pos", self._update_scissor)
+            self.fbind("size", self._update_scissor)
+            self._update_scissor()
+        elif not resizing and clip is not None:
+            self.funbind("pos", self._update_scissor)
+            self.funbind("size", self._update_scissor)
+            self.canvas.before.remove(clip[0])
+            self.canvas.after.remove(clip[1])
+            self._resize_clip = None
+
+    def _on_freeze_text_on_resize(self, *_args):
+        """Starts or stops watching the resize animations to freeze the text
+        of the Labels in the widget while they run."""
+        self._thaw_text()
+        self.funbind("_animation_horizontal", self._update_text_freeze)
+        self.funbind("_animation_vertical", self._update_text_freeze)
+        if self.freeze_text_on_resize != "none":
+            self.fbind("_animation_horizontal", self._update_text_freeze)
+            self.fbind("_animation_vertical", self._update_text_freeze)
+        self._update_text_freeze()
+
+    def _update_text_freeze(self, *_args):
+        """Freezes the text when a resize animation starts and thaws it once no
+        resize animation is left."""
+        resizing = self.freeze_text_on_resize != "none" and (
+            self._animation_horizontal is not None or
+            self._animation_vertical is not None
+        )
+        if resizing and self._frozen_labels is None:
+            self._freeze_text()
+        elif not resizing and self._frozen_labels is not None:
+            self._thaw_text()
+
+    def _freeze_text(self):
+        """Replaces the texture trigger of every Label in this widget by a
+        stand-in, so changes to the text layout (such as text_size following
+        the width) no longer re-render the text. A texture update already
+        scheduled is postponed as well."""
+        frozen = {}
+        scale = self.freeze_text_on_resize == "scale"
+        stack = [self]
+        while stack:
+            widget = stack.pop()
+            stack.extend(widget.children)
+            if not isinstance(widget, Label):
+                continue
+
+            trigger = widget._trigger_texture  # noqa
+            if isinstance(trigger, _FrozenTrigger):
+                # frozen by an expandable ancestor
+                continue
+            trigger.cancel()
+            stand_in = _FrozenTrigger(bool(trigger.is_triggered))
+            widget._trigger_texture = stand_in  # noqa
+            frozen[widget] = (
+                trigger,
+                stand_in,
+                tuple(widget.texture_size),
+                tuple(widget.size)
             )
-        self._expanded_horizontal = True
+            if scale:
+                widget.fbind("size", self._scale_frozen_texture)
+        self._frozen_labels = frozen
+
+    def _scale_frozen_texture(self, label, size):
+        """Stretches the frozen texture of label by as much as label was
+        resized since it was frozen."""
+        _trigger, _stand_in, texture_size, frozen_size = (
+            self._frozen_labels[label]
+        )
+        label.texture_size = [
+            texture_size[index] * size[index] / frozen_size[index]
+            if frozen_size[index] else texture_size[index]
+            for index in (0, 1)
+        ]
 
-    def instant_retract_x(self, *_args):
-        """If horizontal resizing is allowed, then immediately retract to the
-        retracted width without animating."""
-        if not self.allow_resize_x:
+    def _thaw_text(self):
+        """Gives the frozen Labels their texture trigger back, and updates the
+        texture of those which changed (or were stretched) while frozen. The
+        updates run at the end of the frame, once the final size is
+        assigned."""
+        frozen = self._frozen_labels
+        if frozen is None:
             return
 
-        Animation.cancel_all(self, "size_hint_x")
-        Animation.cancel_all(self, "width")
-        if self.min_x_hint is not None:
-            self.size_hint_x = self.min_x_hint
-        elif self.min_x is not None:
-            self.width = self.min_x
-        else:
-            raise ExpandableMixinError(
-                "allow_resize_x is True yet there is no min_x or min_x_hint"
+        self._frozen_labels = None
+        for label, (trigger, stand_in, texture_size, _size) in frozen.items():
+            label._trigger_texture = trigger  # noqa
+            label.funbind("size", self._scale_frozen_texture)
+            if stand_in.dirty or tuple(label.texture_size) != texture_size:
+                trigger()
+
+    def _update_scissor(self, *_args):
+        """Moves the scissor to the bounds of the widget, in window
+        coordinates."""
+        push = self._resize_clip[0]
+        x, y = self.pos
+        width, height = self.size
+        # not self.right and self.top, which may not be updated yet when the
+        # size changes
+        left, bottom = self.to_window(x, y)
+        right, top = self.to_window(x + width, y + height)
+        push.x = int(left)
+        push.y = int(bottom)
+        push.width = max(0, int(ceil(right - left)))
+        push.height = max(0, int(ceil(top - bottom)))
+
+    def clear_layout_cache(self):
+        """Removes every layout and texture stored by layout_cache."""
+        if self._layout_cache is not None:
+            self._layout_cache.clear()
+
+    def _on_layout_cache(self, *_args):
+        """Starts or stops watching the content (which invalidates the cache)
+        and the resize animations (which use it)."""
+        self._uncache_textures()
+        self.funbind("_animation_horizontal", self._update_texture_cache)
+        self.funbind("_animation_vertical", self._update_texture_cache)
+        if not self.layout_cache:
+            self._layout_cache = None
+            self._pending_layout = None
+            if not (self._max_x_content or self._max_y_content):
+                self._unwatch_content()
+            return
+
+        if self._layout_capture_trigger is None:
+            self._layout_capture_trigger = Clock.create_trigger(
+                self._store_pending_layout
             )
-        self._expanded_horizontal = False
+        self._watch_content()
+        if self.freeze_text_on_resize == "none":
+            self.fbind("_animation_horizontal", self._update_texture_cache)
+            self.fbind("_animation_vertical", self._update_texture_cache)
+        self._update_texture_cache()
+
+    def _on_layout_cache_limit(self, *_args):
+        """Applies the new limit to the cache."""
+        cache = self._layout_cache
+        if cache is not None:
+            cache.limit = self.layout_cache_limit
+            cache.evict()
+
+    def _get_layout_cache(self):
+        """Returns the _LayoutCache of this widget, creating it if needed."""
+        cache = self._layout_cache
+        if cache is None:
+            cache = _LayoutCache(self.layout_cache_limit)
+            self._layout_cache = cache
+        return cache
+
+    def _get_layout_cache_key(self, exact):
+        """Returns the key of the layout for the current size of the widget,
+        rounded to layout_cache_bucket unless exact is True. Rounded sizes are
+        only used by layout_cache_quantize, which rounds the size itself."""
+        if exact:
+            return "layout", True, self.width, self.height
+        bucket = self.layout_cache_bucket or 1
+        return (
+            "layout",
+            False,
+            round(self.width / bucket),
+            round(self.height / bucket)
+        )
 
-    def instant_expand_y(self, *_args):
-        """If vertical resizing is allowed, then immediately expand to the
-        expanded height without animating."""
-        if not self.allow_resize_y:
+    def _get_texture_cache_key(self, label):
+        """Returns the key of the texture of label for its current text and
+        properties, with its text_size rounded to layout_cache_bucket. Only
+        label may reuse its textures, as it refills them in place."""
+        bucket = self.layout_cache_bucket or 1
+        text_size = tuple(
+            None if size is None else round(size / bucket)
+            for size in label.text_size
+        )
+        options = tuple(
+            repr(getattr(label, name, None))
+            for name in _label_texture_properties
+        )
+        return "texture", label.uid, label.text, text_size, options
+
+    def _on_layout_cache_progress(self, animation, _widget, progress):
+        """Stores the layout settled at the previous frame of a resize, then
+        applies the stored layout for the new size of the widget, if there is
+        one, instead of letting the layout run. With layout_cache_quantize,
+        the animated size is rounded to layout_cache_bucket first."""
+        if not self.layout_cache:
             return
+        self._store_pending_layout()
+        quantize = self.layout_cache_quantize and progress < 1
+        if quantize:
+            # every pass of the animation goes through the same sizes, so the
+            # layouts stored by one pass are found by the next ones
+            bucket = self.layout_cache_bucket or 1
+            animated = getattr(animation, "animated_properties", {})
+            if "width" in animated:
+                self.width = round(self.width / bucket) * bucket
+            if "height" in animated:
+                self.height = round(self.height / bucket) * bucket
+        key = self._get_layout_cache_key(not quantize)
+        if self._trigger_layout.is_triggered:
+            layout = self._get_layout_cache().get(key)
+            if layout is not None and self._apply_layout(layout):
+                return
 
-        Animation.cancel_all(self, "size_hint_y")
-        Animation.cancel_all(self, "height")
-        if self.max_y_hint is not None:
-            self.size_hint_y = self.max_y_hint
-        elif self.max_y is not None:
-            self.height = self.max_y
-        else:
-            raise ExpandableMixinError(
-                "allow_resize_y is True yet there is no max_y or max_y_hint"
-            )
-        self._expanded_vertical = True
+        self._pending_layout = (Clock.frames, self._content_version, key)
+        self._layout_capture_trigger()
 
-    def instant_retract_y(self, *_args):
-        """If vertical resizing is allowed, then immediately retract to the
-        retracted height without animating."""
-        if not self.allow_resize_y:
+    def _store_pending_layout(self, *_args):
+        """Stores the layout of the frame a resize left pending, once the
+        layouts of that frame have run. A layout is pending until the next
+        frame of the animation, or until the next frame starts if the
+        animation ended."""
+        pending = self._pending_layout
+        if pending is None:
             return
 
-        Animation.cancel_all(self, "size_hint_y")
-        Animation.cancel_all(self, "height")
+        frame, version, key = pending
+        if frame == Clock.frames:
+            # the layouts of this frame haven't run yet
+            return
+
+        self._pending_layout = None
+        self._layout_capture_trigger.cancel()
+        if version != self._content_version:
+            return
+        cache = self._get_layout_cache()
+        if key not in cache:
+            layout = self._capture_layout()
+            if layout is not None:
+                cache.put(key, layout, 64 + 72 * len(layout[1]))
+
+    def _capture_layout(self):
+        """Returns the current layout of the content as a tuple (minimum size
+        of this widget, entries), where entries is a list of (weak reference
+        to a widget, relative, x, y, width, height, minimum size) tuples,
+        parents before
+        children, for every widget laid out by this widget or by a Layout
+        inside it. The positions of relative entries are relative to the
+        position of this widget (widgets inside a RelativeLayout or a Scatter
+        are not). Returns None if a nested expandable widget is resizing."""
+        left, bottom = self.pos
+        entries = []
+        stack = [(self, True)]
+        while stack:
+            widget, relative = stack.pop()
+            # the children of widgets with their own coordinates (such as a
+            # RelativeLayout) don't move with this widget
+            relative = relative and type(widget).to_local is Widget.to_local
+            for child in widget.children:
+                if isinstance(child, ExpandableMixin) and child.resizing:
+                    return None
+                x, y = child.pos
+                if relative:
+                    x -= left
+                    y -= bottom
+                minimum_size = getattr(child, "minimum_size", None)
+                entries.append((
+                    ref(child),
+                    relative,
+                    x,
+                    y,
+                    child.width,
+                    child.height,
+                    None if minimum_size is None else tuple(minimum_size)
+                ))
+                if hasattr(child, "do_layout"):
+                    stack.append((child, relative))
+
+        minimum_size = getattr(self, "minimum_size", None)
+        if minimum_size is not None:
+            minimum_size = tuple(minimum_size)
+        return minimum_size, entries
+
+    def _apply_layout(self, layout):
+        """Gives the content the positions and sizes of a layout returned by
+        _capture_layout, and cancels the layouts pending for them. Returns
+        False, without applying anything, if a nested expandable widget is
+        resizing or a widget of the layout no longer exists."""
+        self_minimum_size, entries = layout
+        widgets = [entry[0]() for entry in entries]
+        for widget in widgets:
+            if widget is None:
+                return False
+            if isinstance(widget, ExpandableMixin) and widget.resizing:
+                return False
+
+        left, bottom = self.pos
+        for widget, entry in zip(widgets, entries):
+            _ref, relative, x, y, width, height, minimum_size = entry
+            if relative:
+                x += left
+                y += bottom
+            widget.pos = x, y
+            widget.size = width, height
+            if minimum_size is not None:
+                widget.minimum_size = minimum_size
+        if self_minimum_size is not None:
+            self.minimum_size = self_minimum_size
+
+        self._trigger_layout.cancel()
+        for widget in widgets:
+            if hasattr(widget, "do_layout"):
+                widget._trigger_layout.cancel()  # noqa
+        return True
+
+    def _update_texture_cache(self, *_args):
+        """Hands the texture updates of the Labels in the widget to the cache
+        when a resize animation starts, and takes them back once no resize
+        animation is left."""
+        resizing = (
+            self.layout_cache and
+            self.freeze_text_on_resize == "none" and (
+                self._animation_horizontal is not None or
+                self._animation_vertical is not None
+            )
+        )
+        if resizing and self._cached_labels is None:
+            self._cache_textures()
+        elif not resizing and self._cached_labels is not None:
+            self._uncache_textures()
+
+    def _cache_textures(self):
+        """Replaces the texture trigger of every Label in this widget by a
+        _CachedTextureTrigger. A texture update already scheduled goes through
+        the cache as well."""
+        cached = {}
+        stack = [self]
+        while stack:
+            widget = stack.pop()
+            stack.extend(widget.children)
+            if not isinstance(widget, Label):
+                continue
+
+            trigger = widget._trigger_texture  # noqa
+            if isinstance(trigger, (_FrozenTrigger, _CachedTextureTrigger)):
+                # handled by an expandable ancestor
+                continue
+            pending = trigger.is_triggered
+            trigger.cancel()
+            stand_in = _CachedTextureTrigger(widget, self, trigger)
+            widget._trigger_texture = stand_in  # noqa
+            cached[widget] = trigger, stand_in
+            if pending:
+                stand_in()
+        self._cached_labels = cached
+
+    def _uncache_textures(self):
+        """Gives the Labels their texture trigger back. Labels showing a
+        texture rendered for another text_size, or with an update pending,
+        are updated at the end of the frame."""
+        cached = self._cached_labels
+        if cached is None:
+            return
+
+        self._cached_labels = None
+        for label, (trigger, stand_in) in cached.items():
+            pending = stand_in.is_triggered
+            stand_in.release()
+            if label._trigger_texture is stand_in:  # noqa
+                label._trigger_texture = trigger  # noqa
+            if pending or stand_in.reused:
+                trigger()
+
+    def _is_hidden(self):
+        """Returns True if the widget can't be seen (see
+        cull_hidden_animations)."""
+        window = self.get_root_window()
+        if window is None:
+            return True
+
+        x, y = self.pos
+        width, height = self.size
+        left, bottom = self.to_window(x, y)
+        right, top = self.to_window(x + width, y + height)
+        if (
+            right <= 0 or top <= 0 or
+            left >= window.width or bottom >= window.height
+        ):
+            return True
+
+        stencil_view = _lazy("StencilView")
+        widget = self
+        while widget is not window:
+            if widget.opacity == 0:
+                return True
+            if isinstance(widget, stencil_view) and widget is not self:
+                x, y = widget.pos
+                width, height = widget.size
+                clip_left, clip_bottom = widget.to_window(x, y)
+                clip_right, clip_top = widget.to_window(x + width, y + height)
+                if (
+                    right <= clip_left or top <= clip_bottom or
+                    left >= clip_right or bottom >= clip_top
+                ):
+                    return True
+            widget = widget.parent
+        return False
+
+    def _on_cull_progress(self, animation, _widget, progress):
+        """Completes or pauses a resize animation, according to
+        cull_hidden_animations, once the widget can't be seen."""
+        if progress >= 1 or not self._is_hidden():
+            return
+
+        if animation is self._animation_horizontal:
+            axis = "x"
+        elif animation is self._animation_vertical:
+            axis = "y"
+        else:
+            return
+
+        if self.cull_hidden_animations == "complete":
+            # on_complete gives the widget the size of its state
+            animation.stop(self)
+        elif self.cull_hidden_animations == "pause":
+            self._pause_resize(axis, animation.duration * (1 - progress))
+
+    def _pause_resize(self, axis, remaining):
+        """Stops the resize animation along axis ("x" or "y") where it is, and
+        starts checking whether the widget is visible again."""
+        if axis == "x":
+            self._cancel_horizontal_resize()
+            self._timestamp_horizontal = None
+        else:
+            self._cancel_vertical_resize()
+            self._timestamp_vertical = None
+
+        self._paused_resizes[axis] = remaining
+        if self._cull_poll is None:
+            self._cull_poll = Clock.schedule_interval(
+                self._resume_culled,
+                self.cull_poll_interval
+            )
+
+    def _resume_culled(self, *_args):
+        """Resumes the paused resize animations once the widget is visible.
+        Stops checking once no animation is paused."""
+        if self._paused_resizes and self._is_hidden():
+            return
+
+        self._stop_cull_poll()
+        for axis, remaining in list(self._paused_resizes.items()):
+            self._resume_resize(axis, remaining)
+
+    def _resume_resize(self, axis, duration):
+        """Animates the widget along axis ("x" or "y") from its current size to
+        the size of its state in the given duration."""
+        if axis == "x":
+            size, is_hint = self._get_state_width()
+            transition = self._get_horizontal_animation_transition()
+            if is_hint:
+                self._animate_width_hint(
+                    size,
+                    transition=transition,
+                    duration=duration
+                )
+            else:
+                self._animate_width(
+                    size,
+                    transition=transition,
+                    duration=duration
+                )
+        else:
+            size, is_hint = self._get_state_height()
+            transition = self._get_vertical_animation_transition()
+            if is_hint:
+                self._animate_height_hint(
+                    size,
+                    transition=transition,
+                    duration=duration
+                )
+            else:
+                self._animate_height(
+                    size,
+                    transition=transition,
+                    duration=duration
+                )
+
+    def _stop_cull_poll(self):
+        """Stops checking whether the widget is visible again."""
+        if self._cull_poll is not None:
+            self._cull_poll.cancel()
+            self._cull_poll = None
+
+    def _on_cull_hidden_animations(self, *_args):
+        """Applies the new mode to the animations already paused: they resume
+        if culling is turned off, and complete if it is set to "complete"."""
+        if not self._paused_resizes:
+            return
+
+        mode = self.cull_hidden_animations
+        if mode == "none":
+            self._stop_cull_poll()
+            for axis, remaining in list(self._paused_resizes.items()):
+                self._resume_resize(axis, remaining)
+        elif mode == "complete":
+            self._stop_cull_poll()
+            self._paused_resizes.clear()
+            self._update_width_and_height()
+
+    def _on_overlay_expansion(self, *_args):
+        """Starts or stops watching the state and the resize animations to
+        move the widget to the overlay layer and back."""
+        names = (
+            "_expanded_horizontal",
+            "_expanded_vertical",
+            "_animation_horizontal",
+            "_animation_vertical"
+        )
+        for name in names:
+            self.funbind(name, self._update_overlay)
+        if self.overlay_expansion:
+            for name in names:
+                self.fbind(name, self._update_overlay)
+        self._update_overlay()
+
+    def _update_overlay(self, *_args):
+        """Moves the widget to the overlay layer when it starts expanding, and
+        back to its place once it is retracted and no resize animation is
+        left. The animations of both axes are checked, since one can end while
+        the other runs."""
+        overlaid = self.overlay_expansion and self._initialized and (
+            self.allow_resize_x and self._expanded_horizontal or
+            self.allow_resize_y and self._expanded_vertical or
+            self._animation_horizontal is not None or
+            self._animation_vertical is not None
+        )
+        if overlaid and self._overlay_placeholder is None:
+            self._enter_overlay()
+        elif not overlaid and self._overlay_placeholder is not None:
+            self._leave_overlay()
+
+    def _enter_overlay(self):
+        """Puts a placeholder with the retracted size of the widget in its
+        place, and moves the widget to the overlay layer."""
+        parent = self.parent
+        if parent is None or self.get_root_window() is None:
+            return
+
+        placeholder = Widget(
+            size_hint=tuple(self.size_hint),
+            size=tuple(self.size),
+            pos_hint=dict(self.pos_hint)
+        )
+        if self.allow_resize_x:
+            points = self._get_snap_points_x()
+            if any(is_hint for _size, is_hint in points):
+                raise ExpandableMixinError(
+                    "overlay_expansion requires horizontal bounds in pixels"
+                )
+            placeholder.size_hint_x = None
+            placeholder.width = points[0][0]
+        if self.allow_resize_y:
+            points = self._get_snap_points_y()
+            if any(is_hint for _size, is_hint in points):
+                raise ExpandableMixinError(
+                    "overlay_expansion requires vertical bounds in pixels"
+                )
+            placeholder.size_hint_y = None
+            placeholder.height = points[0][0]
+
+        index = parent.children.index(self)
+        parent.remove_widget(self)
+        parent.add_widget(placeholder, index=index)
+        self._overlay_placeholder = placeholder
+        self.size_hint = None, None
+        _overlay_layer.add(self)
+
+        placeholder.fbind("pos", self._update_overlay_geometry)
+        placeholder.fbind("size", self._update_overlay_geometry)
+        placeholder.fbind("parent", self._on_placeholder_parent)
+        self.fbind("size", self._update_overlay_geometry)
+        self._update_overlay_geometry()
+
+    def _leave_overlay(self):
+        """Moves the widget from the overlay layer back to the place of its
+        placeholder."""
+        placeholder = self._release_placeholder()
+        parent = placeholder.parent
+        if parent is None:
+            return
+
+        index = parent.children.index(placeholder)
+        parent.remove_widget(placeholder)
+        self.size_hint = tuple(placeholder.size_hint)
+        parent.add_widget(self, index=index)
+
+    def _release_placeholder(self):
+        """Removes the widget from the overlay layer and unbinds from its
+        placeholder. Returns the placeholder."""
+        placeholder = self._overlay_placeholder
+        self._overlay_placeholder = None
+        placeholder.funbind("pos", self._update_overlay_geometry)
+        placeholder.funbind("size", self._update_overlay_geometry)
+        placeholder.funbind("parent", self._on_placeholder_parent)
+        self.funbind("size", self._update_overlay_geometry)
+        _overlay_layer.remove(self)
+        return placeholder
+
+    def _on_placeholder_parent(self, placeholder, parent):
+        """Takes the widget out of the overlay layer if its placeholder is
+        removed from the parent: the widget no longer has a place."""
+        if parent is None:
+            self._release_placeholder()
+
+    def _update_overlay_geometry(self, *_args):
+        """Keeps the widget in the overlay layer over its placeholder, with the
+        corner given by overlay_anchor on the same corner of the placeholder,
+        and with the size of the placeholder along the axes the widget can't
+        resize."""
+        placeholder = self._overlay_placeholder
+        if placeholder is None:
+            return
+
+        x, y = placeholder.pos
+        width, height = placeholder.size
+        if not self.allow_resize_x:
+            self.width = width
+        if not self.allow_resize_y:
+            self.height = height
+
+        # the layer is at the origin of the window, so window coordinates are
+        # coordinates in the layer
+        left, bottom = placeholder.to_window(x, y)
+        right, top = placeholder.to_window(x + width, y + height)
+        vertical, horizontal = self.overlay_anchor.split("-")
+        self.pos = (
+            left if horizontal == "left" else right - self.width,
+            bottom if vertical == "bottom" else top - self.height
+        )
+
+    def _get_layout_plan(self):
+        """Returns the analysis of the parent made for this widget, computing
+        it if needed, or None if the widget has no parent. The plan is a
+        dictionary with the parent under "parent" and, depending on the type
+        of the parent, the result of _handle_child_of_stack_layout under
+        "stack" or the result of _get_grid_cells under "grid"."""
+        parent = self.parent
+        plan = self._layout_plan
+        if plan is not None and plan["parent"] is parent:
+            return plan
+
+        self._discard_layout_plan()
+        if parent is None:
+            return None
+
+        _get_size_hint_handlers(type(parent))
+        plan = {"parent": parent, "stack": None, "grid": None}
+        self.fbind("parent", self._discard_layout_plan)
+        watched = [(self, "parent")]
+        for name in ("children", "size", "orientation", "spacing", "padding",
+                     "rows", "cols"):
+            if name in parent.properties():
+                watched.append((parent, name))
+
+        if isinstance(parent, _lazy("BoxLayout")):
+            _get_box_aggregate(parent)
+        elif isinstance(parent, _lazy("StackLayout")):
+            plan["stack"] = self._handle_child_of_stack_layout()
+            # which row (or column) a child lands in depends on the sizes of
+            # its siblings
+            watched.extend((child, "size") for child in parent.children)
+        elif isinstance(parent, _lazy("GridLayout")):
+            plan["grid"] = _get_grid_cells(parent)
+
+        for dispatcher, name in watched[1:]:
+            dispatcher.fbind(name, self._invalidate_layout_plan)
+        self._layout_plan_bindings = watched
+        self._layout_plan = plan
+        return plan
+
+    def _get_planned(self, key, compute):
+        """Returns the entry key of the layout plan if it was computed by
+        prewarm() for the current parent, and compute() otherwise."""
+        plan = self._layout_plan
+        if plan is not None and plan["parent"] is self.parent:
+            value = plan[key]
+            if value is not None:
+                return value
+        return compute()
+
+    def _invalidate_layout_plan(self, *_args):
+        """Forgets the layout plan when the parent changes. The parent stays
+        watched until the next plan is computed, so widgets resizing every
+        frame don't rebind every frame."""
+        self._layout_plan = None
+
+    def _discard_layout_plan(self, *_args):
+        """Forgets the layout plan, and stops watching the parent."""
+        bindings = self._layout_plan_bindings
+        if bindings:
+            self.funbind("parent", self._discard_layout_plan)
+            for dispatcher, name in bindings[1:]:
+                dispatcher.funbind(name, self._invalidate_layout_plan)
+            self._layout_plan_bindings = []
+        self._layout_plan = None
+
+    def instant_expand_x(self, *_args):
+        """If horizontal resizing is allowed, then immediately expand to the
+        expanded width without animating."""
+        if not self.allow_resize_x:
+            return
+
+        self._cancel_horizontal_resize()
+        if self.max_x_hint is not None:
+            self._assign_width(self.max_x_hint, True)
+        elif self.max_x is not None:
+            self._assign_width(self.max_x, False)
+        else:
+            raise ExpandableMixinError(
+                "allow_resize_x is True yet there is no max_x or max_x_hint"
+            )
+        self._expanded_horizontal = True
+
+    def instant_retract_x(self, *_args):
+        """If horizontal resizing is allowed, then immediately retract to the
+        retracted width without animating."""
+        if not self.allow_resize_x:
+            return
+
+        self._cancel_horizontal_resize()
+        if self.min_x_hint is not None:
+            self._assign_width(self.min_x_hint, True)
+        elif self.min_x is not None:
+            self._assign_width(self.min_x, False)
+        else:
+            raise ExpandableMixinError(
+                "allow_resize_x is True yet there is no min_x or min_x_hint"
+            )
+        self._expanded_horizontal = False
+
+    def instant_expand_y(self, *_args):
+        """If vertical resizing is allowed, then immediately expand to the
+        expanded height without animating."""
+        if not self.allow_resize_y:
+            return
+
+        self._cancel_vertical_resize()
+        if self.max_y_hint is not None:
+            self._assign_height(self.max_y_hint, True)
+        elif self.max_y is not None:
+            self._assign_height(self.max_y, False)
+        else:
+            raise ExpandableMixinError(
+                "allow_resize_y is True yet there is no max_y or max_y_hint"
+            )
+        self._expanded_vertical = True
+
+    def instant_retract_y(self, *_args):
+        """If vertical resizing is allowed, then immediately retract to the
+        retracted height without animating."""
+        if not self.allow_resize_y:
+            return
+
+        self._cancel_vertical_resize()
         if self.min_y_hint is not None:
-            self.size_hint_y = self.min_y_hint
+            self._assign_height(self.min_y_hint, True)
         elif self.min_y is not None:
-            self.height = self.min_y
+            self._assign_height(self.min_y, False)
         else:
             raise ExpandableMixinError(
                 "allow_resize_y is True yet there is no min_y or min_y_hint"
@@ -854,6 +3608,630 @@ class ExpandableMixin(Widget):
         else:
             self.instant_expand_y()
 
+    def snap_x(self, index, *_args, duration=None):
+        """If horizontal resizing is allowed, then animate to the width given by
+        the snap point at the given index. If snap_points_x is empty, index 0
+        is the retracted width and index 1 is the expanded width.
+
+        The animation starts from the current width, so calling this method
+        in the middle of another animation smoothly retargets the widget. Unless
+        a duration is given or fixed_duration_x is True, the duration is scaled
+        by the distance left to travel relative to the distance between the
+        first and last snap points."""
+        if not self.allow_resize_x:
+            return
+
+        if animation_governor.instant:
+            self.instant_snap_x(index)
+            return
+
+        points = self._get_snap_points_x()
+        if not 0 <= index < len(points):
+            raise ExpandableMixinError(
+                f"Attempted to snap to invalid index: {index}; index must be "
+                f"between 0 and {len(points) - 1}"
+            )
+
+        size, is_hint = points[index]
+        will_expand = index > self._snap_index_horizontal or (
+            index == self._snap_index_horizontal and not is_hint and
+            size > self.width
+        )
+        transition = self._get_horizontal_animation_transition(will_expand)
+        target_width = size * self._get_allotted_width() if is_hint else size
+        if duration is None:
+            duration = self._get_snap_duration_x(target_width, will_expand)
+
+        if is_hint:
+            self._animate_width_hint(
+                size,
+                transition=transition,
+                duration=duration
+            )
+        else:
+            self._animate_width(
+                size,
+                transition=transition,
+                duration=duration
+            )
+
+        self._snap_index_horizontal = index
+        self._expanded_horizontal = index > 0
+        self._update_width()
+
+    def snap_y(self, index, *_args, duration=None):
+        """If vertical resizing is allowed, then animate to the height given by
+        the snap point at the given index. If snap_points_y is empty, index 0
+        is the retracted height and index 1 is the expanded height.
+
+        See the documentation for snap_x. The behavior of this method is
+        entirely analogous."""
+        if not self.allow_resize_y:
+            return
+
+        if animation_governor.instant:
+            self.instant_snap_y(index)
+            return
+
+        points = self._get_snap_points_y()
+        if not 0 <= index < len(points):
+            raise ExpandableMixinError(
+                f"Attempted to snap to invalid index: {index}; index must be "
+                f"between 0 and {len(points) - 1}"
+            )
+
+        size, is_hint = points[index]
+        will_expand = index > self._snap_index_vertical or (
+            index == self._snap_index_vertical and not is_hint and
+            size > self.height
+        )
+        transition = self._get_vertical_animation_transition(will_expand)
+        target_height = size * self._get_allotted_height() if is_hint else size
+        if duration is None:
+            duration = self._get_snap_duration_y(target_height, will_expand)
+
+        if is_hint:
+            self._animate_height_hint(
+                size,
+                transition=transition,
+                duration=duration
+            )
+        else:
+            self._animate_height(
+                size,
+                transition=transition,
+                duration=duration
+            )
+
+        self._snap_index_vertical = index
+        self._expanded_vertical = index > 0
+        self._update_height()
+
+    def instant_snap_x(self, index, *_args):
+        """If horizontal resizing is allowed, then immediately change to the
+        width given by the snap point at the given index without animating."""
+        if not self.allow_resize_x:
+            return
+
+        points = self._get_snap_points_x()
+        if not 0 <= index < len(points):
+            raise ExpandableMixinError(
+                f"Attempted to snap to invalid index: {index}; index must be "
+                f"between 0 and {len(points) - 1}"
+            )
+
+        self._cancel_horizontal_resize()
+        self._clear_anim_data_horizontal(self, True)
+        self._snap_index_horizontal = index
+        self._expanded_horizontal = index > 0
+        self._update_width()
+
+    def instant_snap_y(self, index, *_args):
+        """If vertical resizing is allowed, then immediately change to the
+        height given by the snap point at the given index without animating."""
+        if not self.allow_resize_y:
+            return
+
+        points = self._get_snap_points_y()
+        if not 0 <= index < len(points):
+            raise ExpandableMixinError(
+                f"Attempted to snap to invalid index: {index}; index must be "
+                f"between 0 and {len(points) - 1}"
+            )
+
+        self._cancel_vertical_resize()
+        self._clear_anim_data_vertical(self, True)
+        self._snap_index_vertical = index
+        self._expanded_vertical = index > 0
+        self._update_height()
+
+    def nearest_snap_index_x(self, width=None):
+        """Returns the index of the horizontal snap point closest to the given
+        width, or to the current width if no width is given. Hinted snap points
+        are converted to pixels using the width allotted by the parent. The
+        lookup is a binary search over a cached, sorted list of sizes.
+
+        Returns None if horizontal resizing is not allowed."""
+        if not self.allow_resize_x:
+            return None
+
+        if width is None:
+            width = self.width
+        sizes, indices = self._get_snap_lookup_x()
+        return indices[_nearest_position(sizes, width)]
+
+    def nearest_snap_index_y(self, height=None):
+        """Returns the index of the vertical snap point closest to the given
+        height, or to the current height if no height is given. Hinted snap
+        points are converted to pixels using the height allotted by the parent.
+        The lookup is a binary search over a cached, sorted list of sizes.
+
+        Returns None if vertical resizing is not allowed."""
+        if not self.allow_resize_y:
+            return None
+
+        if height is None:
+            height = self.height
+        sizes, indices = self._get_snap_lookup_y()
+        return indices[_nearest_position(sizes, height)]
+
+    def _get_snap_points_x(self):
+        """Returns the horizontal snap points as a list of (size, is_hint)
+        tuples. If snap_points_x is empty, the list contains the retracted and
+        expanded widths."""
+        if self.snap_points_x:
+            if self._snap_points_horizontal is None:
+                self._snap_points_horizontal = [
+                    _parse_snap_point(value) for value in self.snap_points_x
+                ]
+            return self._snap_points_horizontal
+
+        if self.min_x_hint is not None:
+            minimum = (self.min_x_hint, True)
+        else:
+            minimum = (self.min_x, False)
+        if self.max_x_hint is not None:
+            maximum = (self.max_x_hint, True)
+        else:
+            maximum = (self.max_x, False)
+        return [minimum, maximum]
+
+    def _get_snap_points_y(self):
+        """Returns the vertical snap points as a list of (size, is_hint)
+        tuples. If snap_points_y is empty, the list contains the retracted and
+        expanded heights."""
+        if self.snap_points_y:
+            if self._snap_points_vertical is None:
+                self._snap_points_vertical = [
+                    _parse_snap_point(value) for value in self.snap_points_y
+                ]
+            return self._snap_points_vertical
+
+        if self.min_y_hint is not None:
+            minimum = (self.min_y_hint, True)
+        else:
+            minimum = (self.min_y, False)
+        if self.max_y_hint is not None:
+            maximum = (self.max_y_hint, True)
+        else:
+            maximum = (self.max_y, False)
+        return [minimum, maximum]
+
+    def _get_snap_lookup_x(self):
+        """Returns a tuple (sizes, indices) where sizes is the sorted list of
+        horizontal snap points in pixels and indices[n] is the index of sizes[n]
+        in the list of snap points. The result is cached until the snap points
+        or the allotted width change."""
+        allotted_width = self._get_allotted_width()
+        key = (allotted_width, self.min_x, self.min_x_hint, self.max_x,
+               self.max_x_hint)
+        lookup = self._snap_lookup_horizontal
+        if lookup is None or lookup[0] != key:
+            lookup = (key,) + _sorted_snap_sizes(
+                self._get_snap_points_x(),
+                allotted_width
+            )
+            self._snap_lookup_horizontal = lookup
+        return lookup[1], lookup[2]
+
+    def _get_snap_lookup_y(self):
+        """Returns a tuple (sizes, indices) where sizes is the sorted list of
+        vertical snap points in pixels and indices[n] is the index of sizes[n]
+        in the list of snap points. The result is cached until the snap points
+        or the allotted height change."""
+        allotted_height = self._get_allotted_height()
+        key = (allotted_height, self.min_y, self.min_y_hint, self.max_y,
+               self.max_y_hint)
+        lookup = self._snap_lookup_vertical
+        if lookup is None or lookup[0] != key:
+            lookup = (key,) + _sorted_snap_sizes(
+                self._get_snap_points_y(),
+                allotted_height
+            )
+            self._snap_lookup_vertical = lookup
+        return lookup[1], lookup[2]
+
+    def _get_snap_duration_x(self, target_width, will_expand):
+        """Returns the duration for animating horizontally to target_width. The
+        full expand/retract duration is scaled by the distance left to travel
+        relative to the distance between the smallest and largest snap point,
+        unless fixed_duration_x is True."""
+        if will_expand:
+            duration = self._get_expand_anim_hor_duration()
+        else:
+            duration = self._get_retract_anim_hor_duration()
+
+        if self.fixed_duration_x:
+            return duration
+
+        sizes, _indices = self._get_snap_lookup_x()
+        span = sizes[-1] - sizes[0]
+        if span <= 0:
+            return duration
+        return duration * min(1, abs(target_width - self.width) / span)
+
+    def _get_snap_duration_y(self, target_height, will_expand):
+        """Returns the duration for animating vertically to target_height. See
+        _get_snap_duration_x."""
+        if will_expand:
+            duration = self._get_expand_anim_vert_duration()
+        else:
+            duration = self._get_retract_anim_vert_duration()
+
+        if self.fixed_duration_y:
+            return duration
+
+        sizes, _indices = self._get_snap_lookup_y()
+        span = sizes[-1] - sizes[0]
+        if span <= 0:
+            return duration
+        return duration * min(1, abs(target_height - self.height) / span)
+
+    def _get_allotted_width(self):
+        """Returns an estimate of the width a size_hint_x of 1 gives this
+        widget, which is the width of the parent minus its horizontal padding.
+        Used to compare hinted snap points with snap points in pixels."""
+        parent = self.parent
+        if parent is None:
+            return self.width
+        padding = getattr(parent, "padding", None) or (0, 0, 0, 0)
+        return max(0, parent.width - padding[0] - padding[2])
+
+    def _get_allotted_height(self):
+        """Returns an estimate of the height a size_hint_y of 1 gives this
+        widget, which is the height of the parent minus its vertical padding.
+        Used to compare hinted snap points with snap points in pixels."""
+        parent = self.parent
+        if parent is None:
+            return self.height
+        padding = getattr(parent, "padding", None) or (0, 0, 0, 0)
+        return max(0, parent.height - padding[1] - padding[3])
+
+    def _get_content_width(self):
+        """Returns the intrinsic width of the content of this widget. The
+        measurement is cached until the content changes."""
+        self._watch_content()
+        key = self._content_version
+        cache = self._content_width_cache
+        if cache is None or cache[0] != key:
+            cache = (key, _measure_content_width(self))
+            self._content_width_cache = cache
+        return cache[1]
+
+    def _get_content_height(self):
+        """Returns the intrinsic height of the content of this widget at its
+        current width. The measurement is cached until the content or the width
+        changes."""
+        self._watch_content()
+        key = (self._content_version, self.width)
+        cache = self._content_height_cache
+        if cache is None or cache[0] != key:
+            cache = (key, _measure_content_height(self, self.width))
+            self._content_height_cache = cache
+        return cache[1]
+
+    def _watch_content(self):
+        """Binds to the text, size hints, children and layout settings of every
+        descendant (and to all but the size hints of this widget) so that the
+        content measurements and layouts are invalidated when they change.
+        Does nothing if the content is already watched."""
+        if self._content_bindings is not None:
+            return
+
+        bindings = []
+        widgets = [self]
+        while widgets:
+            widget = widgets.pop()
+            names = [
+                "text",
+                "children",
+                "padding",
+                "spacing",
+                "orientation",
+                "rows",
+                "cols",
+                "font_size"
+            ]
+            if widget is not self:
+                names += ["size_hint_x", "size_hint_y"]
+            for name in names:
+                if widget.property(name, quiet=True) is None:
+                    continue
+                if name == "children":
+                    callback = self._on_content_children
+                else:
+                    callback = self._invalidate_content
+                uid = widget.fbind(name, callback)
+                bindings.append((widget, name, uid))
+            widgets.extend(widget.children)
+        self._content_bindings = bindings
+
+    def _unwatch_content(self):
+        """Removes every binding made by _watch_content."""
+        if self._content_bindings is None:
+            return
+        for widget, name, uid in self._content_bindings:
+            widget.unbind_uid(name, uid)
+        self._content_bindings = None
+
+    def _invalidate_content(self, *_args):
+        """Invalidates the cached content measurements and layouts."""
+        self._content_version += 1
+        if self._layout_cache is not None:
+            self._layout_cache.clear()
+
+    def _on_content_children(self, *_args):
+        """Rebinds to the descendants of this widget after its subtree changes,
+        and invalidates the cached content measurements."""
+        self._unwatch_content()
+        if self._max_x_content or self._max_y_content or self.layout_cache:
+            self._watch_content()
+        self._invalidate_content()
+
+    def _on_snap_points_x(self, *_args):
+        """Clears the cached horizontal snap points and assigns the first and
+        last snap points to min_x/min_x_hint and max_x/max_x_hint."""
+        self._snap_points_horizontal = None
+        self._snap_lookup_horizontal = None
+        if not self.snap_points_x:
+            return
+
+        points = self._get_snap_points_x()
+        if len(points) < 2:
+            raise ExpandableMixinError(
+                "snap_points_x must contain at least two snap points"
+            )
+
+        last = len(points) - 1
+        self._snap_index_horizontal = min(self._snap_index_horizontal, last)
+        (min_size, min_is_hint), (max_size, max_is_hint) = points[0], points[-1]
+        if min_is_hint:
+            self.min_x_hint = min_size
+        else:
+            self.min_x_hint = None
+            self.min_x = min_size
+        if max_is_hint:
+            self.max_x_hint = max_size
+        else:
+            self.max_x_hint = None
+            self.max_x = max_size
+
+    def _on_snap_points_y(self, *_args):
+        """Clears the cached vertical snap points and assigns the first and
+        last snap points to min_y/min_y_hint and max_y/max_y_hint."""
+        self._snap_points_vertical = None
+        self._snap_lookup_vertical = None
+        if not self.snap_points_y:
+            return
+
+        points = self._get_snap_points_y()
+        if len(points) < 2:
+            raise ExpandableMixinError(
+                "snap_points_y must contain at least two snap points"
+            )
+
+        last = len(points) - 1
+        self._snap_index_vertical = min(self._snap_index_vertical, last)
+        (min_size, min_is_hint), (max_size, max_is_hint) = points[0], points[-1]
+        if min_is_hint:
+            self.min_y_hint = min_size
+        else:
+            self.min_y_hint = None
+            self.min_y = min_size
+        if max_is_hint:
+            self.max_y_hint = max_size
+        else:
+            self.max_y_hint = None
+            self.max_y = max_size
+
+    def _sync_snap_index_horizontal(self, _instance, expanded):
+        """Keeps the horizontal snap index consistent with the horizontal
+        state when the widget is toggled, expanded or retracted."""
+        if not expanded:
+            self._snap_index_horizontal = 0
+        elif self._snap_index_horizontal == 0:
+            self._snap_index_horizontal = len(self._get_snap_points_x()) - 1
+
+    def _sync_snap_index_vertical(self, _instance, expanded):
+        """Keeps the vertical snap index consistent with the vertical state
+        when the widget is toggled, expanded or retracted."""
+        if not expanded:
+            self._snap_index_vertical = 0
+        elif self._snap_index_vertical == 0:
+            self._snap_index_vertical = len(self._get_snap_points_y()) - 1
+
+    def _on_drag_touch_down(self, _instance, touch):
+        """Starts a drag if the touch lands on a draggable edge of this widget.
+        Otherwise, the touch is handled as usual.
+
+        This and the other drag handlers are bound to the touch events rather
+        than overriding on_touch_down and friends, so they run before the
+        handlers of any class this mixin is combined with (for example,
+        ButtonBehavior consumes grabbed touches before they reach the
+        mixin)."""
+        dragging = (
+            self._drag_touch_horizontal is not None or
+            self._drag_touch_vertical is not None
+        )
+        if not dragging:
+            if self._collide_drag_edge_x(touch):
+                self._start_drag(touch, HORIZONTAL)
+                return True
+            if self._collide_drag_edge_y(touch):
+                self._start_drag(touch, VERTICAL)
+                return True
+        return False
+
+    def _on_drag_touch_move(self, _instance, touch):
+        """Records the size asked for by a dragging touch. The size is applied
+        at most once per frame, since touch moves can arrive faster than
+        frames."""
+        if touch.grab_current is not self:
+            return False
+
+        if touch is self._drag_touch_horizontal:
+            start_position, start_size = self._drag_origin_horizontal
+            delta = touch.x - start_position
+            if self.drag_edge_x == "left":
+                delta = -delta
+            sizes, _indices = self._get_snap_lookup_x()
+        elif touch is self._drag_touch_vertical:
+            start_position, start_size = self._drag_origin_vertical
+            delta = touch.y - start_position
+            if self.drag_edge_y == "bottom":
+                delta = -delta
+            sizes, _indices = self._get_snap_lookup_y()
+        else:
+            return False
+
+        size = min(max(start_size + delta, sizes[0]), sizes[-1])
+        self._drag_pending_size = size
+        self._drag_samples.append((touch.time_update, size))
+        self._trigger_drag_update()
+        return True
+
+    def _on_drag_touch_up(self, _instance, touch):
+        """Ends a drag. The velocity of the drag is used to pick the snap point
+        the widget animates to, starting from the current size."""
+        if touch.grab_current is not self:
+            return False
+
+        if touch is self._drag_touch_horizontal:
+            axis = HORIZONTAL
+        elif touch is self._drag_touch_vertical:
+            axis = VERTICAL
+        else:
+            return False
+
+        touch.ungrab(self)
+        self._trigger_drag_update.cancel()
+        self._apply_drag_size()
+
+        if axis is HORIZONTAL:
+            size = self.width
+            self._drag_samples.append((touch.time_update, size))
+            velocity = self._get_drag_velocity()
+            self._drag_touch_horizontal = None
+            self._drag_origin_horizontal = None
+
+            index = self.nearest_snap_index_x(size + velocity * self.fling_time)
+            hint, is_hint = self._get_snap_points_x()[index]
+            target = hint * self._get_allotted_width() if is_hint else hint
+            duration = self._get_snap_duration_x(target, target > size)
+            duration = _get_fling_duration(duration, target - size, velocity)
+            self.snap_x(index, duration=duration)
+        else:
+            size = self.height
+            self._drag_samples.append((touch.time_update, size))
+            velocity = self._get_drag_velocity()
+            self._drag_touch_vertical = None
+            self._drag_origin_vertical = None
+
+            index = self.nearest_snap_index_y(size + velocity * self.fling_time)
+            hint, is_hint = self._get_snap_points_y()[index]
+            target = hint * self._get_allotted_height() if is_hint else hint
+            duration = self._get_snap_duration_y(target, target > size)
+            duration = _get_fling_duration(duration, target - size, velocity)
+            self.snap_y(index, duration=duration)
+
+        self._drag_samples = None
+        return True
+
+    def _collide_drag_edge_x(self, touch):
+        """Returns True if the touch is close enough to the horizontally
+        draggable edge to start a drag."""
+        if not (self.drag_resize_x and self.allow_resize_x):
+            return False
+        if not self.y <= touch.y <= self.top:
+            return False
+        edge = self.right if self.drag_edge_x == "right" else self.x
+        return abs(touch.x - edge) <= self.drag_handle_size
+
+    def _collide_drag_edge_y(self, touch):
+        """Returns True if the touch is close enough to the vertically
+        draggable edge to start a drag."""
+        if not (self.drag_resize_y and self.allow_resize_y):
+            return False
+        if not self.x <= touch.x <= self.right:
+            return False
+        edge = self.top if self.drag_edge_y == "top" else self.y
+        return abs(touch.y - edge) <= self.drag_handle_size
+
+    def _start_drag(self, touch, axis):
+        """Grabs the touch and stops any animation along the dragged axis so
+        the edge follows the finger."""
+        touch.grab(self)
+        if axis is HORIZONTAL:
+            self._cancel_horizontal_resize()
+            self._clear_anim_data_horizontal(self, True)
+            self._drag_touch_horizontal = touch
+            self._drag_origin_horizontal = (touch.x, self.width)
+            self.size_hint_x = None
+            size = self.width
+        else:
+            self._cancel_vertical_resize()
+            self._clear_anim_data_vertical(self, True)
+            self._drag_touch_vertical = touch
+            self._drag_origin_vertical = (touch.y, self.height)
+            self.size_hint_y = None
+            size = self.height
+
+        self._drag_samples = deque(maxlen=DRAG_VELOCITY_SAMPLES)
+        self._drag_samples.append((touch.time_update, size))
+
+    def _apply_drag_size(self, *_args):
+        """Assigns the size asked for by the latest touch move. Bound to a
+        Clock trigger so that it runs at most once per frame."""
+        size = self._drag_pending_size
+        if size is None:
+            return
+
+        self._drag_pending_size = None
+        if self._drag_touch_horizontal is not None:
+            self.width = size
+        elif self._drag_touch_vertical is not None:
+            self.height = size
+
+    def _get_drag_velocity(self):
+        """Estimates the velocity of the current drag in pixels per second from
+        the samples in the ring buffer that are at most DRAG_VELOCITY_WINDOW
+        seconds older than the latest sample."""
+        samples = self._drag_samples
+        if not samples or len(samples) < 2:
+            return 0.
+
+        latest_time, latest_size = samples[-1]
+        oldest_time, oldest_size = latest_time, latest_size
+        for sample_time, sample_size in samples:
+            if latest_time - sample_time <= DRAG_VELOCITY_WINDOW:
+                oldest_time, oldest_size = sample_time, sample_size
+                break
+
+        elapsed = latest_time - oldest_time
+        if elapsed <= 0:
+            return 0.
+        return (latest_size - oldest_size) / elapsed
+
     def _update_width(self, *_args):
         """This method assigns the width/size_hint_x to the value reflected by
         the current state. But only if the widget has been "initialized" (i.e.,
@@ -862,33 +4240,48 @@ class ExpandableMixin(Widget):
         allowed, and only if we aren't currently resizing."""
         if not self._initialized:
             return
-        print("hi")
+
         if not self.allow_resize_x:
             return
 
-        if self.resizing:
+        if self.resizing or self._drag_touch_horizontal is not None:
             return
 
+        if self._batched_hint_horizontal:
+            return
+
+        self._assign_width(*self._get_state_width())
+
+    def _get_state_width(self):
+        """Returns (size, is_hint), the width (if is_hint is False) or the
+        size_hint_x (if is_hint is True) reflected by the current horizontal
+        state."""
+        if self.snap_points_x:
+            points = self._get_snap_points_x()
+            # the state may change before _sync_snap_index_horizontal runs
+            index = self._snap_index_horizontal
+            if not self._expanded_horizontal:
+                index = 0
+            elif index == 0:
+                index = len(points) - 1
+            return points[index]
+
         if not self._expanded_horizontal:
             if self.min_x_hint is not None:
-                self.size_hint_x = self.min_x_hint
-            elif self.min_x is not None:
-                self.size_hint_x = None
-                self.width = self.min_x
-            else:
-                raise ExpandableMixinError(
-                    "allow_resize_x is True yet there is no min_x or min_x_hint"
-                )
-        else:
-            if self.max_x_hint is not None:
-                self.size_hint_x = self.max_x_hint
-            elif self.max_x is not None:
-                self.size_hint_x = None
-                self.width = self.max_x
-            else:
-                raise ExpandableMixinError(
-                    "allow_resize_x is True yet there is no max_x or max_x_hint"
-                )
+                return self.min_x_hint, True
+            if self.min_x is not None:
+                return self.min_x, False
+            raise ExpandableMixinError(
+                "allow_resize_x is True yet there is no min_x or min_x_hint"
+            )
+
+        if self.max_x_hint is not None:
+            return self.max_x_hint, True
+        if self.max_x is not None:
+            return self.max_x, False
+        raise ExpandableMixinError(
+            "allow_resize_x is True yet there is no max_x or max_x_hint"
+        )
 
     def _update_height(self, *_args):
         """This method assigns the height/size_hint_y to the value reflected by
@@ -902,29 +4295,76 @@ class ExpandableMixin(Widget):
         if not self.allow_resize_y:
             return
 
-        if self.resizing:
+        if self.resizing or self._drag_touch_vertical is not None:
             return
 
+        if self._batched_hint_vertical:
+            return
+
+        self._assign_height(*self._get_state_height())
+
+    def _get_state_height(self):
+        """Returns (size, is_hint), the height (if is_hint is False) or the
+        size_hint_y (if is_hint is True) reflected by the current vertical
+        state."""
+        if self.snap_points_y:
+            points = self._get_snap_points_y()
+            # the state may change before _sync_snap_index_vertical runs
+            index = self._snap_index_vertical
+            if not self._expanded_vertical:
+                index = 0
+            elif index == 0:
+                index = len(points) - 1
+            return points[index]
+
         if not self._expanded_vertical:
             if self.min_y_hint is not None:
-                self.size_hint_y = self.min_y_hint
-            elif self.min_y is not None:
-                self.size_hint_y = None
-                self.height = self.min_y
-            else:
-                raise ExpandableMixinError(
-                    "allow_resize_y is True yet there is no min_y or min_y_hint"
-                )
+                return self.min_y_hint, True
+            if self.min_y is not None:
+                return self.min_y, False
+            raise ExpandableMixinError(
+                "allow_resize_y is True yet there is no min_y or min_y_hint"
+            )
+
+        if self.max_y_hint is not None:
+            return self.max_y_hint, True
+        if self.max_y is not None:
+            return self.max_y, False
+        raise ExpandableMixinError(
+            "allow_resize_y is True yet there is no max_y or max_y_hint"
+        )
+
+    def _assign_width(self, size, is_hint):
+        """Assigns size to size_hint_x if is_hint is True, and to width
+        otherwise. Inside ExpandableMixin.batch(), the assignment is recorded
+        and deferred until the batch exits."""
+        if is_hint:
+            properties = (("size_hint_x", size),)
         else:
-            if self.max_y_hint is not None:
-                self.size_hint_y = self.max_y_hint
-            elif self.max_y is not None:
-                self.size_hint_y = None
-                self.height = self.max_y
-            else:
-                raise ExpandableMixinError(
-                    "allow_resize_y is True yet there is no max_y or max_y_hint"
-                )
+            properties = (("size_hint_x", None), ("width", size))
+
+        if _size_batch.depth:
+            _size_batch.record(self, HORIZONTAL, properties)
+            return
+
+        for name, value in properties:
+            setattr(self, name, value)
+
+    def _assign_height(self, size, is_hint):
+        """Assigns size to size_hint_y if is_hint is True, and to height
+        otherwise. Inside ExpandableMixin.batch(), the assignment is recorded
+        and deferred until the batch exits."""
+        if is_hint:
+            properties = (("size_hint_y", size),)
+        else:
+            properties = (("size_hint_y", None), ("height", size))
+
+        if _size_batch.depth:
+            _size_batch.record(self, VERTICAL, properties)
+            return
+
+        for name, value in properties:
+            setattr(self, name, value)
 
     def _update_width_and_height(self, *_args):
         """A convenience method for calling both _update_width and
@@ -948,6 +4388,8 @@ class ExpandableMixin(Widget):
         The method will then assign a width/height to the expanded/retracted
         value, based on whether the user has assigned a value to
         start_expanded_x/y. If they did not, then the widget starts retracted.
+        Each size is computed and assigned exactly once (see
+        _assign_initial_size).
 
         This method is meant to be bound to the "kv_post" event. Note that the
         "kv_post" event is fired after instantiating the class in Python or
@@ -957,6 +4399,11 @@ class ExpandableMixin(Widget):
         if self._initialized:
             return
 
+        if self.snap_points_x:
+            self._on_snap_points_x()
+        if self.snap_points_y:
+            self._on_snap_points_y()
+
         has_min_x = self.min_x is not None or self.min_x_hint is not None
         has_max_x = self.max_x is not None or self.max_x_hint is not None
         has_min_y = self.min_y is not None or self.min_y_hint is not None
@@ -978,18 +4425,7 @@ class ExpandableMixin(Widget):
                     "allow_resize_x is True yet there is no max_x or max_x_hint"
                 )
 
-            if self.start_expanded_x:
-                if self.max_x_hint is not None:
-                    self.size_hint_x = self.max_x_hint
-                else:
-                    self.width = self.max_x
-                self._expanded_horizontal = True
-            else:
-                if self.min_x_hint is not None:
-                    self.size_hint_x = self.min_x_hint
-                elif self.min_x is not None:
-                    self.width = self.min_x
-                self._expanded_horizontal = False
+            self._expanded_horizontal = bool(self.start_expanded_x)
 
         if self.allow_resize_y:
             if not has_min_y:
@@ -1002,21 +4438,68 @@ class ExpandableMixin(Widget):
                     "allow_resize_y is True yet there is no max_y or max_y_hint"
                 )
 
-            if self.start_expanded_y:
-                if self.max_y_hint is not None:
-                    self.size_hint_y = self.max_y_hint
-                else:
-                    self.height = self.max_y
-                self._expanded_vertical = True
-            else:
-                if self.min_y_hint is not None:
-                    self.size_hint_y = self.min_y_hint
-                else:
-                    self.height = self.min_y
-                self._expanded_vertical = False
+            self._expanded_vertical = bool(self.start_expanded_y)
 
         self._initialized = True
-        self._update_width_and_height()
+        self._assign_initial_size()
+
+        # these may have been given to the constructor before the bindings
+        if self.prewarm_on_hover:
+            self._on_prewarm_on_hover(self, True)
+        if self.prewarm_on_focus:
+            self._on_prewarm_on_focus(self, True)
+        if self.clip_on_resize or self.freeze_text_on_resize == "clip":
+            self._on_clip_on_resize()
+        if self.freeze_text_on_resize != "none":
+            self._on_freeze_text_on_resize()
+        if self.layout_cache:
+            self._on_layout_cache()
+        if self.overlay_expansion:
+            self._on_overlay_expansion()
+
+    def _assign_initial_size(self):
+        """Gives the widget the size reflected by its starting state.
+
+        Assigning size_hint_x, width, size_hint_y and height one at a time
+        would trigger the layout of the parent up to four times per widget
+        built inside its parent (as kvlang does). Instead, the size hints and
+        the sizes of both axes are assigned together, only if they change, and
+        with the layout trigger of the parent detached. The parent is then
+        triggered once, unless its layout is already pending (as it is after
+        kvlang adds the widget), since that layout hasn't run yet and will see
+        the final size."""
+        if _size_batch.depth:
+            self._update_width_and_height()
+            return
+
+        size_hint = list(self.size_hint)
+        size = list(self.size)
+        if self.allow_resize_x:
+            self._set_initial_axis(size_hint, size, 0, *self._get_state_width())
+        if self.allow_resize_y:
+            self._set_initial_axis(size_hint, size, 1, *self._get_state_height())
+
+        changes = []
+        if size_hint != self.size_hint:
+            changes.append(("size_hint", size_hint))
+        if size != self.size:
+            changes.append(("size", size))
+        if not changes:
+            return
+
+        trigger = _assign_sizes(self, changes)
+        if trigger is not None and not trigger.is_triggered:
+            trigger()
+
+    @staticmethod
+    def _set_initial_axis(size_hint, size, index, value, is_hint):
+        """Stores value in size_hint (if is_hint is True) or in size
+        (otherwise) at index, for _assign_initial_size."""
+        if is_hint:
+            size_hint[index] = value
+        else:
+            size_hint[index] = None
+            size[index] = value
 
     def _clear_anim_data_horizontal(self, _instance, finished_animating):
         """This clears internal flags used to perform logic for calculating
@@ -1024,6 +4507,7 @@ class ExpandableMixin(Widget):
         if finished_animating:
             self._percent_expanded_horizontal = None
             self._prev_duration_horizontal = None
+            self._progress_horizontal = None
 
     def _clear_anim_data_vertical(self, _instance, finished_animating):
         """This clears internal flags used to perform logic for calculating
@@ -1031,6 +4515,7 @@ class ExpandableMixin(Widget):
         if finished_animating:
             self._percent_expanded_vertical = None
             self._prev_duration_vertical = None
+            self._progress_vertical = None
 
     def _resolve_parent(self, *_args):
         """If the parent of this widget is set to None for some ungodly reason,
@@ -1049,7 +4534,7 @@ class ExpandableMixin(Widget):
                     return
                 find_self(child)
 
-        find_self(Window)
+        find_self(_lazy("Window"))
 
     def _handle_child_of_stack_layout(self, *_args):
         """
@@ -1074,7 +4559,7 @@ class ExpandableMixin(Widget):
         children of StackLayout are mapped to.
         """
         parent = self.parent
-        if not isinstance(parent, StackLayout):
+        if not isinstance(parent, _lazy("StackLayout")):
             Logger.warning(
                 "Ran handle_child_of_stack_layout when self not in StackLayout!"
             )
@@ -1092,6 +4577,8 @@ class ExpandableMixin(Widget):
                 # should only happen on first pass
                 if len(cols[current]) == 0:
                     cols[current].append(child)
+                    if child is self:
+                        col_of_self = current
                     continue
 
                 # calculate height of column if child were added to it
@@ -1102,7 +4589,7 @@ class ExpandableMixin(Widget):
                     if widget.size_hint_y is None:
                         total_height += widget.height
                     else:
-                        total_height += widget.size_hint_y / allotted_height
+                        total_height += widget.size_hint_y * allotted_height
 
                 if total_height <= allotted_height:
                     # place child in current column
@@ -1134,6 +4621,8 @@ class ExpandableMixin(Widget):
                 # should only happen on first pass
                 if len(rows[current]) == 0:
                     rows[current].append(child)
+                    if child is self:
+                        row_of_self = current
                     continue
 
                 # calculate width of row if child were added to it
@@ -1144,7 +4633,7 @@ class ExpandableMixin(Widget):
                     if widget.size_hint_x is None:
                         total_width += widget.width
                     else:
-                        total_width += widget.size_hint_x / allotted_width
+                        total_width += widget.size_hint_x * allotted_width
 
                 if total_width <= allotted_width:
                     # place child in current row
@@ -1185,110 +4674,27 @@ class ExpandableMixin(Widget):
         _row = "rows"
         _col = "cols"
         result = {_row: {}, _col: {}}
-        if not isinstance(parent, GridLayout):
+        if not isinstance(parent, _lazy("GridLayout")):
             Logger.warning(
                 "Ran handle_child_of_grid_layout when self not in GridLayout!"
             )
             return result
 
-        prefix = parent.orientation[:2]
-        orientation = parent.orientation
-
-        rows = parent.rows
-        cols = parent.cols
-        num_children = len(parent.children)
-        if rows is None and cols is None:
-            return result
-        elif rows is None:
-            rows = ceil(num_children / cols)
-        elif cols is None:
-            cols = ceil(num_children / rows)
-        elif rows * cols != num_children:
-            if prefix == "tb" or prefix == "bt":
-                cols = ceil(num_children / rows)
-            else:
-                rows = ceil(num_children / cols)
-
-        result[_row][0] = result[_row][rows - 1] = []
-        result[_col][0] = result[_col][cols - 1] = []
-
-        def add_child(_child, _row_num, _col_num):
-            result[_row][_row_num].append(_child)
-            result[_col][_col_num].append(_child)
+        rows, cols, cells = self._get_planned(
+            "grid",
+            lambda: _get_grid_cells(parent)
+        )
+        for row_num in range(rows):
+            result[_row][row_num] = []
+        for col_num in range(cols):
+            result[_col][col_num] = []
+
+        for child, (row_num, col_num) in zip(parent.children, cells):
+            result[_row][row_num].append(child)
+            result[_col][col_num].append(child)
             if child is self:
-                result["row_of_self"] = _row_num
-                result["col_of_self"] = _col_num
-
-        if orientation == "lr-tb":
-            row_num = col_num = 0
-            for child in reversed(parent.children):
-                add_child(child, row_num, col_num)
-                col_num += 1
-                if col_num == cols:
-                    row_num += 1
-                    col_num = 0
-        elif orientation == "lr-bt":
-            row_num = rows - 1
-            col_num = 0
-            for child in reversed(parent.children):
-                add_child(child, row_num, col_num)
-                col_num += 1
-                if col_num == cols:
-                    row_num -= 1
-                    col_num = 0
-        elif orientation == "rl-tb":
-            row_num = 0
-            col_num = cols - 1
-            for child in reversed(parent.children):
-                add_child(child, row_num, col_num)
-                col_num -= 1
-                if col_num < 0:
-                    row_num += 1
-                    col_num = cols - 1
-        elif orientation == "rl-bt":
-            row_num = rows - 1
-            col_num = cols - 1
-            for child in reversed(parent.children):
-                add_child(child, row_num, col_num)
-                col_num -= 1
-                if col_num < 0:
-                    row_num -= 1
-                    col_num = cols - 1
-        elif orientation == "tb-lr":
-            row_num = col_num = 0
-            for child in reversed(parent.children):
-                add_child(child, row_num, col_num)
-                row_num += 1
-                if row_num == rows:
-                    row_num = 0
-                    col_num += 1
-        elif orientation == "tb-rl":
-            row_num = 0
-            col_num = cols - 1
-            for child in reversed(parent.children):
-                add_child(child, row_num, col_num)
-                row_num += 1
-                if row_num == rows:
-                    row_num = 0
-                    col_num -= 1
-        elif orientation == "bt-lr":
-            row_num = rows - 1
-            col_num = 0
-            for child in reversed(parent.children):
-                add_child(child, row_num, col_num)
-                row_num -= 1
-                if row_num < 0:
-                    row_num = rows - 1
-                    col_num += 1
-        elif orientation == "bt-rl":
-            row_num = rows - 1
-            col_num = cols - 1
-            for child in reversed(parent.children):
-                add_child(child, row_num, col_num)
-                row_num -= 1
-                if row_num < 0:
-                    row_num = rows - 1
-                    col_num -= 1
+                result["row_of_self"] = row_num
+                result["col_of_self"] = col_num
 
         return result
 
@@ -1308,16 +4714,17 @@ class ExpandableMixin(Widget):
         parent handles size hints. Different Layouts have different approaches
         to interpreting size hints. We need to account for every possibility.
 
-        This method has not been tested with a RecycleBoxLayout or a
-        RecycleGridLayout. However, the logic used in this method for BoxLayouts
-        and GridLayouts will be used for RecycleBoxLayouts and
-        RecycleGridLayouts, respectively.
+        The resolver is looked up by the type of the parent in the registry
+        filled by register_size_hint_resolver, along the MRO of that type. So
+        RecycleBoxLayout and RecycleGridLayout, which subclass BoxLayout and
+        GridLayout, use their handlers unless they are registered separately.
 
         If you have your own widgets which listen to the size_hints of their
         children, or you have a subclass of one of the default Layout classes
         which overrides the do_layout logic, then you can add custom behavior to
-        properly resolve for that widget by assigning a callback to the
-        custom_size_hint_resolver attribute. The custom_size_hint_resolver
+        properly resolve for all widgets in that layout with
+        register_size_hint_resolver, or for one widget by assigning a callback
+        to the custom_size_hint_resolver attribute. The custom_size_hint_resolver
         callback will be given the argument "x" or "y" corresponding to the type
         of size_hint being resolved. If the callback returns any non-None value,
         then the default behavior of this method will be ignored.
@@ -1340,45 +4747,348 @@ class ExpandableMixin(Widget):
 
         self._resolve_parent()
         parent = self.parent
-        padding_hor = parent.padding[0] + parent.padding[2]
 
         if parent is None:
             Logger.warning("Widget is detached from widget tree!")
             self.size_hint_x = 1
             return DO_DEFAULT_ANIM
 
+        handlers = _get_size_hint_handlers(type(parent))
+        if handlers is not None:
+            return handlers[0](self, "x")
+
+        Logger.warning(
+            "Assigned size_hint, but parent does not listen to size_hint!"
+        )
+        self.size_hint_x = 1
+        return DO_DEFAULT_ANIM
+
+    def _get_expand_anim_hor_duration(self, *_args):
+        """Returns the full duration for horizontally expanding. This does not
+        account for the eventual logic that may be performed to reduce the
+        actual animation time."""
+        if self.duration_expand_x:
+            return self.duration_expand_x
+        elif self.duration_resize_x:
+            return self.duration_resize_x
+        else:
+            return self.duration_resize
+
+    def _get_retract_anim_hor_duration(self, *_args):
+        """Returns the full duration for horizontally retracting. This does not
+        account for the eventual logic that may be performed to reduce the
+        actual animation time."""
+        if self.duration_retract_x:
+            return self.duration_retract_x
+        elif self.duration_resize_x:
+            return self.duration_resize_x
+        else:
+            return self.duration_resize
+
+    def _get_horizontal_animation_duration(self):
+        """Calculates the actual horizontal animation duration, based on whether
+        we should be expanding or retracting.
+
+        To see the reason this method exists, imagine the user assigns a large
+        value for duration_resize (say, 5 seconds). Then, the expandable widget
+        calls its toggle_x. It slowly expands/retracts; then suppose, after 1
+        second, the widget calls toggle_x again. Well, is has only traveled 1/5
+        of the distance it needs to reach the new width, and yet the second
+        animation will cover this small distance in 5 seconds, which may feel
+        terrible for the user.
+
+        The logic performed here will cause the actual animation time from the
+        previous example to only take 1 second.
+
+        If, for whatever reason, the example behavior is actually preferable,
+        then assigning fixed_duration_x to True will cause it happen.
+        """
+        was_expanding = will_retract = self._expanded_horizontal
+        if will_retract:
+            duration = self._get_retract_anim_hor_duration()
+        else:
+            duration = self._get_expand_anim_hor_duration()
+
+        if self.fixed_duration_x:
+            return duration
+
+        # if we are starting an animation in the middle of an expansion or
+        # retraction
+        if self._progress_horizontal is not None:
+            progress = self._progress_horizontal
+            self._progress_horizontal = None
+
+            # the interrupted animation was heading from _percent_expanded
+            # (fully expanded or retracted if None) to the opposite state
+            start = self._percent_expanded_horizontal
+            if start is None:
+                start = 0. if was_expanding else 1.
+            target = 1. if was_expanding else 0.
+            self._percent_expanded_horizontal = (
+                start + (target - start) * progress
+            )
+
+            if will_retract:
+                duration = self._percent_expanded_horizontal * duration
+            else:
+                duration = (1 - self._percent_expanded_horizontal) * duration
+            self._prev_duration_horizontal = duration
+
+        return duration
+
+    def _get_horizontal_animation_transition(self, will_expand=None):
+        """Returns the animation transition for based on whether we will
+        horizontally expand or retract. If will_expand is not given, it is
+        determined from the current horizontal state."""
+        if will_expand is None:
+            will_expand = not self._expanded_horizontal
+        if will_expand:
+            if self.transition_expand_x:
+                return self.transition_expand_x
+            elif self.transition_resize_x:
+                return self.transition_resize_x
+            else:
+                return self.transition_resize
+        else:
+            if self.transition_retract_x:
+                return self.transition_retract_x
+            elif self.transition_resize_x:
+                return self.transition_resize_x
+            else:
+                return self.transition_resize
+
+    def _animate_width_hint_special_case(self, x_hint, transition, duration):
+        """There are some cases where resolving the size_hint_x would cause the
+        widget to "snap" into place, making a smooth animation simply
+        impossible. This method is called whenever one of these edge cases occur
+        to perform a smooth animation before assigning a size_hint to the
+        widget.
+
+        The only known edge cases where this can happen occur in BoxLayouts or
+        GridLayouts. The animation is performed by the animator registered for
+        the type of the parent (see register_size_hint_resolver)."""
+        if not self.allow_resize_x:
+            return
+
+        if self.custom_size_hint_animation is not None:
+            result = self.custom_size_hint_animation(
+                self,
+                "x",
+                x_hint,
+                transition,
+                duration
+            )
+            if result is not None:
+                return
+
+        handlers = _get_size_hint_handlers(type(self.parent))
+        if handlers is not None and handlers[1] is not None:
+            handlers[1](self, "x", x_hint, transition, duration)
+
+    def _animate_width_hint(self, x_hint, *_args, transition=None,
+                            duration=None):
+        """If we are allowed to resize horizontally, and if the x_hint is one
+        of the values min_x_hint or max_x_hint (or a hinted snap point), then we
+        perform the needed animation to animate to that value of x_hint. This
+        will call self._resolve_size_hint_x if the current size_hint_x is None
+        and possibly call self._animate_width_hint_special_case if necessary.
+
+        The transition and duration are determined from the horizontal state
+        unless they are given."""
+        if not self.allow_resize_x:
+            return
+
+        valid_hints = [self.min_x_hint, self.max_x_hint] + [
+            size for size, is_hint in self._get_snap_points_x() if is_hint
+        ]
+        if x_hint not in valid_hints:
+            raise ExpandableMixinError(
+                f"Attempted to set invalid size_hint_x: {x_hint}; value must be"
+                f" one of {valid_hints}"
+            )
+
+        self._cancel_horizontal_resize()
+
+        if transition is None:
+            transition = self._get_horizontal_animation_transition()
+        if duration is None:
+            duration = self._get_horizontal_animation_duration()
+        else:
+            # only calculated durations account for an interrupted animation
+            self._clear_anim_data_horizontal(self, True)
+
+        if self.animate_in_pixel_space and self.parent is not None:
+            handlers = _get_size_hint_handlers(type(self.parent))
+            if handlers is not None and handlers[2] is not None:
+                self._animate_width_hint_in_pixels(
+                    x_hint,
+                    handlers[2],
+                    transition,
+                    duration
+                )
+                return
+
         if (
-                isinstance(parent, WindowBase) or
-                isinstance(parent, FloatLayout) or
-                isinstance(parent, RelativeLayout)
+                self.custom_size_hint_batch_resolver is not None and
+                self.size_hint_x is None and
+                self.parent is not None
         ):
-            """Please see corresponding docstring in _resolve_size_hint_y."""
+            self._batched_hint_horizontal = True
+            _size_hint_batcher.queue(self, "x", x_hint, transition, duration)
+            return
+
+        use_special_animation = self._resolve_size_hint_x()
+
+        if use_special_animation:
+            self._animate_width_hint_special_case(
+                x_hint,
+                transition,
+                duration
+            )
+            return
+
+        if self.size_hint_x != x_hint:
+            self.start_resize_animation(self._create_resize_animation(
+                size_hint_x=x_hint,
+                t=transition,
+                d=duration
+            ), HORIZONTAL)
+
+    def _resolve_size_hint_y(self, *_args):
+        """
+        If the size_hint_y is currently None, we cannot animate on size_hint.
+        Thus, find what value of size_hint_y would lead to the current height,
+        if possible, and set this widget's size_hint_y to that value.
+
+        This is much more nuanced than it sounds.
+
+        First of all, we may be the child of a widget that does not honor size
+        hints at all. In that case, just return the default value of
+        size_hint_y. Also log a warning to the user.
+
+        If our parent does honor size hints, then we need to understand how that
+        parent handles size hints. Different Layouts have different approaches
+        to interpreting size hints. Great effort has been expended to account
+        for every edge case.
+
+        Some widgets will "snap" to a height after being assigned a size_hint_y,
+        meaning a smooth animation will not be possible. In that case, this
+        method will return True. When this method returns True, a special method
+        is called during the animation process in the internals of this widget.
+        It performs dark magic under-the-hood to ensure a smooth animation.
+
+        The resolver is looked up by the type of the parent in the registry
+        filled by register_size_hint_resolver, along the MRO of that type. So
+        RecycleBoxLayout and RecycleGridLayout, which subclass BoxLayout and
+        GridLayout, use their handlers unless they are registered separately.
+
+        If you have your own widgets which listen to the size_hints of their
+        children, or you have a subclass of one of the default Layout classes
+        which overrides the do_layout logic, then you can add custom behavior to
+        properly resolve for all widgets in that layout with
+        register_size_hint_resolver, or for one widget by assigning a callback
+        to the custom_size_hint_resolver attribute.
+
+        :return: By default, this method returns a boolean. It returns True if
+        we need a special behavior to perform a smooth animation. This method
+        returns False otherwise. But if the user assigns a callback to
+        custom_size_hint_resolver, this method will return the response of
+        self.custom_size_hint_resolver if the return value is not None.
+        """
+        if self.custom_size_hint_resolver is not None:
+            custom_result = self.custom_size_hint_resolver(self, "y")
+            if custom_result is not None:
+                return custom_result
+
+        self._resolve_parent()
+        parent = self.parent
+
+        if parent is None:
+            Logger.warning("Widget is detached from widget tree!")
+            self.size_hint_y = 1
+            return DO_DEFAULT_ANIM
+
+        handlers = _get_size_hint_handlers(type(parent))
+        if handlers is not None:
+            return handlers[0](self, "y")
+
+        Logger.warning(
+            "Assigned size_hint, but parent does not listen to size_hint!"
+        )
+        self.size_hint_y = 1
+        return DO_DEFAULT_ANIM
+
+    def _resolve_in_float_layout(self, axis):
+        """Resolves the size hint of a child of a Window, FloatLayout or
+        RelativeLayout.
+
+        The size_hint represents a percentage of the size of the containing
+        Layout. For example, size_hint_y=0.5 would make the child widget
+        have half the height of the containing Layout."""
+        parent = self.parent
+        if axis == "x":
             self.size_hint_x = self.width / parent.width
             return DO_DEFAULT_ANIM
+        else:
+            self.size_hint_y = self.height / parent.height
+            return DO_DEFAULT_ANIM
+
+    def _resolve_in_anchor_layout(self, axis):
+        """Resolves the size hint of a child of an AnchorLayout.
+
+        The notes below describe size_hint_y; size_hint_x is entirely
+        analogous.
 
-        if isinstance(parent, AnchorLayout):
-            """Please see corresponding docstring in _resolve_size_hint_y."""
+        The size_hint_y is the percentage of the allotted height awarded to
+        the widget. The allotted height is the AnchorLayout height minus the
+        height of the vertical padding (padding-top and padding-bottom, i.e.
+        padding[1] and padding[3]). Every child has the same allotted
+        height."""
+        parent = self.parent
+        if axis == "x":
+            padding_hor = parent.padding[0] + parent.padding[2]
             allotted_width = parent.width - padding_hor
             if allotted_width <= 0:
                 self.size_hint_x = 1
             else:
                 self.size_hint_x = self.width / allotted_width
             return DO_DEFAULT_ANIM
+        else:
+            padding_vert = parent.padding[1] + parent.padding[3]
+            allotted_height = parent.height - padding_vert
+            if allotted_height <= 0:
+                self.size_hint_y = 1
+            else:
+                self.size_hint_y = self.height / allotted_height
+            return DO_DEFAULT_ANIM
 
-        if isinstance(parent, BoxLayout):
-            """Please see corresponding docstring in _resolve_size_hint_y."""
-            num_siblings = len(parent.children) - 1
+    def _resolve_in_box_layout(self, axis):
+        """Resolves the size hint of a child of a BoxLayout.
+
+        The notes below describe size_hint_y; size_hint_x is entirely
+        analogous.
+
+        If orientation is "horizontal":
+            size_hint_y is the percent height of the allotted height, which 
+            is the BoxLayout height minus the vertical padding.
+        If orientation is "vertical":
+            The allotted height is the height of the BoxLayout minus the
+            height of every widget with a size_hint of None, the spacing
+            between each child ((len(children) - 1) * spacing), and the
+            vertical and horizontal padding. Every child with a non-None
+            size_hint_y gets some ratio of the allotted height. This ratio 
+            is that widget's size_hint_y over the sum of every non-None 
+            size_hint_y."""
+        parent = self.parent
+        if axis == "x":
+            padding_hor = parent.padding[0] + parent.padding[2]
             if parent.orientation == "vertical":
                 allotted_width = parent.width - padding_hor
                 self.size_hint_x = self.width / allotted_width
             else:
-                sum_fixed_widths = 0.
-                sum_hint_x = 0.
-                for child in parent.children:
-                    if child.size_hint_x is None:
-                        sum_fixed_widths += child.width
-                    else:
-                        sum_hint_x += child.size_hint_x
+                aggregate = _get_box_aggregate(parent)
+                sum_fixed_widths = aggregate.fixed_width
+                sum_hint_x = aggregate.hint_x
                 if sum_hint_x == 0:
                     return DO_SPECIAL_ANIM
                 spacing_hor = (len(parent.children) - 1) * parent.spacing
@@ -1392,168 +5102,339 @@ class ExpandableMixin(Widget):
                 else:
                     self.size_hint_x = sum_hint_x * self.width / allotted_width
             return DO_DEFAULT_ANIM
+        else:
+            padding_vert = parent.padding[1] + parent.padding[3]
+            if parent.orientation == "horizontal":
+                allotted_height = parent.height - padding_vert
+                self.size_hint_y = self.height / allotted_height
+            else:
+                aggregate = _get_box_aggregate(parent)
+                sum_fixed_heights = aggregate.fixed_height
+                sum_hint_y = aggregate.hint_y
+                if sum_hint_y == 0:
+                    """If we are the only child of a vertically-oriented 
+                    BoxLayout, any size_hint_y will cause us to fill the entire 
+                    allotted space. Resolving the size_hint_y does not allow, 
+                    then, for a smooth animation, hence we return True to 
+                    perform dark magic."""
+                    return DO_SPECIAL_ANIM
+                spacing_vert = (len(parent.children) - 1) * parent.spacing
+                allotted_height = (
+                        parent.height - padding_vert -
+                        spacing_vert - sum_fixed_heights
+                )
+                allotted_height = max(0, allotted_height)
+                if allotted_height == 0:
+                    self.size_hint_y = 1
+                else:
+                    height = self.height
+                    self.size_hint_y = sum_hint_y * height / allotted_height
+            return DO_DEFAULT_ANIM
 
-        if isinstance(parent, StackLayout):
-            """Please see corresponding docstring in _resolve_size_hint_y."""
-            result = self._handle_child_of_stack_layout()
+    def _resolve_in_stack_layout(self, axis):
+        """Resolves the size hint of a child of a StackLayout.
+
+        The notes below describe size_hint_y; size_hint_x is entirely
+        analogous.
+
+        The size_hint_y is a percentage of allotted height awarded to the
+        widget. However, how allotted height is calculated depends on
+        orientation:
+        If the orientation starts with "tb" or "bt":
+            Allotted height can be different for each column. For column n,
+            allotted height is GridLayout height minus vertical padding
+            minus (vertical spacing * ((# of rows in column n) - 1)).
+
+            Converting height to size_hint_y, therefore, requires knowing
+            the number of rows in that column. The most straightforward way
+            to calculate this is to iterate over the children list of the
+            StackLayout and determine the rows in each column ourselves. The
+            tricky part is that a StackLayout will add a widget to a row if
+            it can. But adding a new widget reduces the height of all
+            previous widgets in that row that have size_hint_y's since
+            adding an extra widget adds more vertical spacing and therefore
+            reduces the allotted height for that column.
+        If the orientation starts with "rl" or "lr":
+            The allotted height doesn't care about the spacing between rows.
+            It is just GridLayout height minus vertical padding."""
+        parent = self.parent
+        if axis == "x":
+            padding_hor = parent.padding[0] + parent.padding[2]
+            result = self._get_planned(
+                "stack",
+                self._handle_child_of_stack_layout
+            )
             if "rows" in result:
-                row_of_self = result["rows_of_self"]
+                row_of_self = result["row_of_self"]
                 rows = result["rows"]
                 spacing_hor = (len(rows[row_of_self]) - 1) * parent.spacing[0]
                 allotted_width = parent.width - padding_hor - spacing_hor
             else:
                 allotted_width = parent.width - padding_hor
-            self.size_hint_y = self.height / allotted_width
+            self.size_hint_x = self.width / allotted_width
+            return DO_DEFAULT_ANIM
+        else:
+            padding_vert = parent.padding[1] + parent.padding[3]
+            result = self._get_planned(
+                "stack",
+                self._handle_child_of_stack_layout
+            )
+            if "rows" in result:
+                allotted_height = parent.height - padding_vert
+            else:
+                col_of_self = result["col_of_self"]
+                cols = result["cols"]
+                spacing_vert = (len(cols[col_of_self]) - 1) * parent.spacing[1]
+                allotted_height = parent.height - padding_vert - spacing_vert
+            self.size_hint_y = self.height / allotted_height
             return DO_DEFAULT_ANIM
 
-        if isinstance(parent, GridLayout):
-            """Please see corresponding docstring in _resolve_size_hint_y."""
+    def _resolve_in_grid_layout(self, axis):
+        """Resolves the size hint of a child of a GridLayout.
+
+        The notes below describe size_hint_y; size_hint_x is entirely
+        analogous.
+
+        If rows is None and cols is None:
+            The Layout does not manage the position and size of any child.
+            Whatever is assigned to pos and size of the child is that
+            child's pos and size. size_hint_y has no effect.
+        If row_force_default is True:
+            The height of the widget is the height of its slot if it has a
+            non-None size_hint_y (the slot height of row n is given by
+            rows_minimum[n], or by row_height_default if n is not in the
+            dictionary). If the size_hint_y is None, the widget's height is
+            whatever value is assigned to the height attribute.
+        If row_force_default is False:
+            A non-None size_hint_y means that the widget height will be
+            exactly that of the slot. A None size_hint_y means that the
+            height of the widget will be whatever is assigned to the height
+            attribute of the widget.
+            So, how is the slot height calculated? The slot height is the
+            sum of the minimum height for that row and some fraction of the
+            allotted height for rows.
+
+            Minimum height:
+                Look for any widgets in row n with a None size_hint_y, and
+                find the maximum height of all widgets in that row with a
+                None size_hint_y.
+
+                Then, for row n, look for the value of n mapped by
+                rows_minimum. If n is even a key in the dictionary, that is.
+
+                Then look at the value of row_default_height.
+
+                Whatever is largest of these values is the minimum height
+                for that row.
+            Allotted height:
+                The allotted height is the height of the GridLayout minus
+                the minimum height of each row, minus the vertical padding,
+                minus the vertical spacing (spacing[1] * (len(children)-1)).
+
+                If the allotted height is negative, just make it zero.
+
+                Then, for each row n, calculate the maximum non-None
+                size_hint_y for every widget in that row.
+
+                Sum the maximum size_hint_y in each row for every row that
+                has at least one widget with a non-None size_hint_y.
+
+                Each row with a maximum non-None size_hint_y gets an
+                additional max_size_hint_y/sum_size_hint_y * allotted_height
+                added to its minimum height. That is the height of every
+                slot in that row.
+
+                If the allotted height is zero or there are no children with
+                a non-None size_hint_y, then the minimum height for the row
+                is the slot height for the row.
+        We return True from this method if we need special logic to animate
+        from a non-None to a None size_hint_y in a smooth manner. This case
+        will happen for most cases that we are in a GridLayout widget, since
+        a child of a GridLayout will instantaneously "snap" to fill its slot
+        once we set the size_hint_y to some value."""
+        parent = self.parent
+        if axis == "x":
             if parent.rows is None and parent.cols is None:
-                self.size_hint_y = 1
+                self.size_hint_x = 1
                 return DO_DEFAULT_ANIM
             else:
                 return DO_SPECIAL_ANIM
-
-        Logger.warning(
-            "Assigned size_hint, but parent does not listen to size_hint!"
-        )
-        self.size_hint_y = True
-        return DO_DEFAULT_ANIM
-
-    def _get_expand_anim_hor_duration(self, *_args):
-        """Returns the full duration for horizontally expanding. This does not
-        account for the eventual logic that may be performed to reduce the
-        actual animation time."""
-        if self.duration_expand_x:
-            return self.duration_expand_x
-        elif self.duration_resize_x:
-            return self.duration_resize_x
         else:
-            return self.duration_resize
+            if parent.rows is None and parent.cols is None:
+                self.size_hint_y = 1
+                return DO_DEFAULT_ANIM
+            else:
+                return DO_SPECIAL_ANIM
 
-    def _get_retract_anim_hor_duration(self, *_args):
-        """Returns the full duration for horizontally retracting. This does not
-        account for the eventual logic that may be performed to reduce the
-        actual animation time."""
-        if self.duration_retract_x:
-            return self.duration_retract_x
-        elif self.duration_resize_x:
-            return self.duration_resize_x
+    def _get_pixel_target_in_float_layout(self, axis, hint):
+        """Returns the size a Window, FloatLayout or RelativeLayout gives this
+        widget for the size hint along the axis ("x" or "y")."""
+        if axis == "x":
+            return hint * self.parent.width
         else:
-            return self.duration_resize
-
-    def _get_horizontal_animation_duration(self):
-        """Calculates the actual horizontal animation duration, based on whether
-        we should be expanding or retracting.
-
-        To see the reason this method exists, imagine the user assigns a large
-        value for duration_resize (say, 5 seconds). Then, the expandable widget
-        calls its toggle_x. It slowly expands/retracts; then suppose, after 1
-        second, the widget calls toggle_x again. Well, is has only traveled 1/5
-        of the distance it needs to reach the new width, and yet the second
-        animation will cover this small distance in 5 seconds, which may feel
-        terrible for the user.
+            return hint * self.parent.height
 
-        The logic performed here will cause the actual animation time from the
-        previous example to only take 1 second.
-
-        If, for whatever reason, the example behavior is actually preferable,
-        then assigning fixed_duration_x to True will cause it happen.
-        """
-        was_expanding = will_retract = self._expanded_horizontal
-        if will_retract:
-            duration = self._get_retract_anim_hor_duration()
+    def _get_pixel_target_in_anchor_layout(self, axis, hint):
+        """Returns the size an AnchorLayout gives this widget for the size hint
+        along the axis ("x" or "y")."""
+        parent = self.parent
+        if axis == "x":
+            padding_hor = parent.padding[0] + parent.padding[2]
+            return hint * max(0, parent.width - padding_hor)
         else:
-            duration = self._get_expand_anim_hor_duration()
-
-        if self.fixed_duration_x:
-            return duration
-
-        # if we are starting an animation in the middle of an expansion or
-        # retraction
-        if self._timestamp_horizontal is not None:
+            padding_vert = parent.padding[1] + parent.padding[3]
+            return hint * max(0, parent.height - padding_vert)
 
-            # how much of the expansion/retraction was achieved?
-            if will_retract:
-                total_duration = self._get_expand_anim_hor_duration()
-            else:
-                total_duration = self._get_retract_anim_hor_duration()
-            time_passed = time.perf_counter() - self._timestamp_horizontal
-            percent = min(1, time_passed / total_duration)
-
-            # initialize percent expanded if necessary
-            if self._percent_expanded_horizontal is None:
-                if was_expanding:
-                    self._percent_expanded_horizontal = percent
-                else:
-                    self._percent_expanded_horizontal = 1 - percent
-            else:
-                if was_expanding:
-                    self._percent_expanded_horizontal += percent
-                else:
-                    self._percent_expanded_horizontal -= percent
+    def _get_pixel_target_in_box_layout(self, axis, hint):
+        """Returns the size a BoxLayout gives this widget for the size hint
+        along the axis ("x" or "y"), with every sibling unchanged."""
+        parent = self.parent
+        if axis == "x":
+            padding_hor = parent.padding[0] + parent.padding[2]
+            if parent.orientation == "vertical":
+                return hint * max(0, parent.width - padding_hor)
 
-            if will_retract:
-                duration = self._percent_expanded_horizontal * duration
+            aggregate = _get_box_aggregate(parent)
+            if self.size_hint_x is None:
+                other_widths = aggregate.fixed_width - self.width
+                other_hints = aggregate.hint_x
             else:
-                duration = (1 - self._percent_expanded_horizontal) * duration
-            self._prev_duration_horizontal = duration
-
-        return duration
+                other_widths = aggregate.fixed_width
+                other_hints = aggregate.hint_x - self.size_hint_x
+            spacing_hor = (len(parent.children) - 1) * parent.spacing
+            allotted_width = max(
+                0,
+                parent.width - padding_hor - spacing_hor - other_widths
+            )
+            if other_hints + hint <= 0:
+                return 0.
+            return allotted_width * hint / (other_hints + hint)
+        else:
+            padding_vert = parent.padding[1] + parent.padding[3]
+            if parent.orientation == "horizontal":
+                return hint * max(0, parent.height - padding_vert)
 
-    def _get_horizontal_animation_transition(self):
-        """Returns the animation transition for based on whether we will
-        horizontally expand or retract."""
-        will_expand = not self._expanded_horizontal
-        if will_expand:
-            if self.transition_expand_x:
-                return self.transition_expand_x
-            elif self.transition_resize_x:
-                return self.transition_resize_x
+            aggregate = _get_box_aggregate(parent)
+            if self.size_hint_y is None:
+                other_heights = aggregate.fixed_height - self.height
+                other_hints = aggregate.hint_y
             else:
-                return self.transition_resize
+                other_heights = aggregate.fixed_height
+                other_hints = aggregate.hint_y - self.size_hint_y
+            spacing_vert = (len(parent.children) - 1) * parent.spacing
+            allotted_height = max(
+                0,
+                parent.height - padding_vert - spacing_vert - other_heights
+            )
+            if other_hints + hint <= 0:
+                return 0.
+            return allotted_height * hint / (other_hints + hint)
+
+    def _get_pixel_target_in_stack_layout(self, axis, hint):
+        """Returns the size a StackLayout gives this widget for the size hint
+        along the axis ("x" or "y"), using the same allotted size as
+        _resolve_in_stack_layout."""
+        parent = self.parent
+        result = self._get_planned(
+            "stack",
+            self._handle_child_of_stack_layout
+        )
+        if axis == "x":
+            padding_hor = parent.padding[0] + parent.padding[2]
+            allotted_width = parent.width - padding_hor
+            if "rows" in result:
+                row = result["rows"][result["row_of_self"]]
+                allotted_width -= (len(row) - 1) * parent.spacing[0]
+            return hint * max(0, allotted_width)
         else:
-            if self.transition_retract_x:
-                return self.transition_retract_x
-            elif self.transition_resize_x:
-                return self.transition_resize_x
-            else:
-                return self.transition_resize
-
-    def _animate_width_hint_special_case(self, x_hint, transition, duration):
-        """There are some cases where resolving the size_hint_x would cause the
-        widget to "snap" into place, making a smooth animation simply
-        impossible. This method is called whenever one of these edge cases occur
-        to perform a smooth animation before assigning a size_hint to the
-        widget.
-
-        The only known edge cases where this can happen occur in BoxLayouts or
-        GridLayouts."""
-        if not self.allow_resize_x:
-            return
+            padding_vert = parent.padding[1] + parent.padding[3]
+            allotted_height = parent.height - padding_vert
+            if "cols" in result:
+                col = result["cols"][result["col_of_self"]]
+                allotted_height -= (len(col) - 1) * parent.spacing[1]
+            return hint * max(0, allotted_height)
+
+    def _get_pixel_target_in_grid_layout(self, axis, hint):
+        """Returns the size a GridLayout gives this widget for the size hint
+        along the axis ("x" or "y"): the size of its column (or row) once its
+        own size no longer counts towards the minimum of that column (or
+        row)."""
+        parent = self.parent
+        rows, cols, cells = self._get_planned(
+            "grid",
+            lambda: _get_grid_cells(parent)
+        )
+        if not cells:
+            return self.width if axis == "x" else self.height
+        children = parent.children
+        row_of_self, col_of_self = cells[children.index(self)]
 
-        if self.custom_size_hint_animation is not None:
-            result = self.custom_size_hint_animation(
-                self,
-                "x",
-                x_hint,
-                transition,
-                duration
+        if axis == "x":
+            if parent.col_force_default:
+                return parent.cols_minimum.get(
+                    col_of_self,
+                    parent.col_default_width
+                )
+            spacing = (cols - 1) * parent.spacing[0]
+            padding = parent.padding[0] + parent.padding[2]
+            _before, widths = _solve_grid_tracks(
+                cols,
+                [col_num for _row_num, col_num in cells],
+                [child.width for child in children],
+                [
+                    hint if child is self else
+                    -1. if child.size_hint_x is None else child.size_hint_x
+                    for child in children
+                ],
+                parent.col_default_width,
+                parent.cols_minimum,
+                parent.width - spacing - padding,
+                col_of_self,
+                hint
             )
-            if result is not None:
-                return
-
+            return widths[col_of_self]
+        else:
+            if parent.row_force_default:
+                return parent.rows_minimum.get(
+                    row_of_self,
+                    parent.row_default_height
+                )
+            spacing = (rows - 1) * parent.spacing[1]
+            padding = parent.padding[1] + parent.padding[3]
+            _before, heights = _solve_grid_tracks(
+                rows,
+                [row_num for row_num, _col_num in cells],
+                [child.height for child in children],
+                [
+                    hint if child is self else
+                    -1. if child.size_hint_y is None else child.size_hint_y
+                    for child in children
+                ],
+                parent.row_default_height,
+                parent.rows_minimum,
+                parent.height - spacing - padding,
+                row_of_self,
+                hint
+            )
+            return heights[row_of_self]
+
+    def _animate_in_box_layout(self, axis, hint, transition, duration):
+        """Animates a child of a BoxLayout to the given size hint along the
+        axis ("x" or "y") when resolving the size hint would make it snap.
+
+        If orientation is vertical, then the allotted height is divided
+        between all widgets with non-None size_hint_y's. But if we are the 
+        only child, then we get all of the allotted height no matter the 
+        value of our size_hint_y. Hence, assigning a value to size_hint_y 
+        causes widget to "snap" into a particular height, ruining a smooth 
+        animation. Hence, we cheat by simply animating the height to the 
+        allotted height."""
         parent = self.parent
-
-        if isinstance(parent, BoxLayout):
-            """Please see corresponding docstring in 
-            _animate_height_hint_special_case."""
+        if axis == "x":
             self.size_hint_x = None
 
-            sum_widths = 0.
-            for child in parent.children:
-                if child.size_hint_x is None and child is not self:
-                    sum_widths += child.width
+            # the aggregate now counts our own width as fixed
+            sum_widths = _get_box_aggregate(parent).fixed_width - self.width
 
             padding_hor = parent.padding[0] + parent.padding[2]
             spacing_hor = parent.spacing * (len(parent.children) - 1)
@@ -1561,15 +5442,64 @@ class ExpandableMixin(Widget):
             full_width = parent.width - padding_and_spacing - sum_widths
             full_width = max(0, full_width)
 
-            anim = Animation(width=full_width, t=transition, d=duration)
+            anim = self._create_resize_animation(
+                width=full_width,
+                t=transition,
+                d=duration
+            )
             self.start_resize_animation(anim, HORIZONTAL)
+        else:
+            self.size_hint_y = None
+
+            # the aggregate now counts our own height as fixed
+            sum_heights = _get_box_aggregate(parent).fixed_height - self.height
+
+            padding_vert = parent.padding[1] + parent.padding[3]
+            spacing_vert = parent.spacing * (len(parent.children) - 1)
+            padding_and_spacing = padding_vert + spacing_vert
+            height = parent.height - padding_and_spacing - sum_heights
+            height = max(0, height)
 
-        if isinstance(parent, GridLayout):
-            """Please see corresponding docstring in 
-            _animate_height_hint_special_case."""
-            result = self._handle_child_of_grid_layout()
+            anim = self._create_resize_animation(
+                height=height,
+                t=transition,
+                d=duration
+            )
+            self.start_resize_animation(anim, VERTICAL)
 
-            col_of_self = result["col_of_self"]
+    def _animate_in_grid_layout(self, axis, hint, transition, duration):
+        """Animates a child of a GridLayout to the given size hint along the
+        axis ("x" or "y") when resolving the size hint would make it snap.
+
+        Notice that we have an issue for a child of a GridLayout if we
+        animate from a min_x to a max_x_hint (or a max_x to a
+        min_x_hint). As soon as we add a size_hint, the widget will
+        instantaneously fill its slot, ruining what is supposed to be a
+        smooth animation. Therefore, if we are animating a GridLayout that
+        is "switching" from a None size_hint_y to a non-None size_hint_y,
+        we have to cheat.
+
+        Save the current rows_minimum of the GridLayout to some temporary
+        variable and then make a new rows_minimum that maps each row to its
+        current slot height. Then set force_row_default to True.
+
+        Calculate what the new height of each row will be after we set the
+        widget size_hint_y. Make a second rows_minimum dict and animate to 
+        it. Note that GridLayouts don't, by default, bind their layout logic 
+        to the rows_minimum property (this is likely a bug that should be 
+        fixed, make an MR to the kivy source code), so bind rows_minimum to 
+        the private method _trigger_layout.
+
+        Once this animation is complete, set the size_hint_y to
+        min/max_y_hint. Also unbind _trigger_layout."""
+        parent = self.parent
+        if axis == "x":
+            rows, cols, cells = self._get_planned(
+                "grid",
+                lambda: _get_grid_cells(parent)
+            )
+            children = parent.children
+            col_of_self = cells[children.index(self)][1]
 
             if parent.col_force_default:
                 if col_of_self in parent.cols_minimum:
@@ -1577,7 +5507,11 @@ class ExpandableMixin(Widget):
                 else:
                     full_width = parent.col_default_width
 
-                anim = Animation(width=full_width, t=transition, d=duration)
+                anim = self._create_resize_animation(
+                    width=full_width,
+                    t=transition,
+                    d=duration
+                )
                 self.start_resize_animation(anim, HORIZONTAL)
                 return
 
@@ -1585,383 +5519,135 @@ class ExpandableMixin(Widget):
             # to this value after we're done
             temp = parent.cols_minimum
 
-            # calculate the width of the slot for each column. This requires
-            # calculating the minimum width for each column AND the fraction of
-            # allotted width provided up to each column
-
-            # mins[n] is the minimum width of column n
-            mins = {}
-            # max_size_hints[n] is the largest size_hint_x found in column n
-            max_size_hints = {}
-
-            col_default_width = parent.col_default_width
-
-            cols = result["cols"]
-            num_cols = len(cols.keys())
-
-            # loop through every child in column. Determine the minimum width of
-            # the column, as well as the largest size_hint_x in that column.
-            for col_num in cols.keys():
-
-                minimum_from_dict = None
-                if col_num in parent.cols_minimum:
-                    minimum_from_dict = parent.cols_minimum[col_num]
-
-                minimum_from_children = None
-                max_size_hint = None
-                for child in cols[col_num]:
-                    if child.size_hint_x is None:
-                        # find a value for minimum_from_children
-                        if minimum_from_children is None:
-                            minimum_from_children = child.width
-                        else:
-                            minimum_from_children = max(
-                                minimum_from_children,
-                                child.width
-                            )
-                    else:
-                        # find the largest size_hint_x in the column
-                        if max_size_hint is None:
-                            max_size_hint = child.size_hint_x
-                        else:
-                            max_size_hint = max(
-                                max_size_hint,
-                                child.size_hint_x
-                            )
-
-                min_width = col_default_width
-
-                if minimum_from_dict is not None:
-                    min_width = max(min_width, minimum_from_dict)
-
-                if minimum_from_children is not None:
-                    min_width = max(min_width, minimum_from_children)
-
-                # the minimum width for col_num is...
-                mins[col_num] = min_width
-                # the maximum size_hint for col_num is...
-                if max_size_hint is not None:
-                    max_size_hints[col_num] = max_size_hint
-
-            spacing = (num_cols - 1) * parent.spacing[0]
-            padding = parent.padding[0] + parent.padding[2]
-            allotted_width = parent.width - spacing - padding
-            allotted_width -= sum(mins.values())
-
-            # create a cols_minimum dictionary that represents the widths of
-            # each column currently. Then make another one that represents the
-            # widths of each column after expandable widget gets a new size hint
-            widths_before = {}
-            widths_after = {}
-            dicts = [widths_before, widths_after]
-            for dictionary in dicts:
-                sum_size_hint = sum(max_size_hints.values())
-                for column in cols.keys():
-                    width = mins[column]
-
-                    if sum_size_hint > 0:
-                        ratio = max_size_hints[column] / sum_size_hint
-                        width += ratio * allotted_width
-
-                    dictionary[column] = width
-                max_size_hints[col_of_self] = x_hint
-
-            # set col_force_default to True
-            parent.col_force_default = True
-            parent.cols_minimum = widths_before
-
-            # bind parent.rows_minimum to parent._trigger_layout
-            parent.bind(cols_minimum=parent._trigger_layout)  # noqa
-
-            # create animations
-            anim1 = Animation(
-                cols_minimum=widths_after,
-                t=transition,
-                d=duration
-            )
-            anim2 = Animation(
-                width=widths_after[col_of_self],
-                t=transition,
-                d=duration
-            )
-
-            # unbind parent._trigger_layout, set parent.cols_minimum back to its
-            # original value
-            def on_complete(*_args):
-                parent.unbind(cols_minimum=parent._trigger_layout)  # noqa
-                parent.cols_minimum = temp
-            anim1.bind(on_complete=on_complete)
-
-            # animate self and cols_minimum to new value
-            self.start_resize_animation(anim2, HORIZONTAL)
-            anim1.start(parent)
-
-    def _animate_width_hint(self, x_hint, *_args):
-        """If we are allowed to resize horizontally, and if the x_hint is one
-        of the values min_x_hint or max_x_hint, then we perform the needed
-        animation to animate to that value of x_hint. This will call
-        self._resolve_size_hint_x if the current size_hint_x is None and
-        possibly call self._animate_width_hint_special_case if necessary."""
-        if not self.allow_resize_x:
-            return
-
-        if x_hint not in [self.min_x_hint, self.max_x_hint]:
-            raise ExpandableMixinError(
-                f"Attempted to set invalid size_hint_x: {x_hint}; value must be"
-                f" either {self.min_x_hint} or {self.max_x_hint}"
-            )
-
-        Animation.cancel_all(self, "size_hint_x")
-        Animation.cancel_all(self, "width")
-
-        transition = self._get_horizontal_animation_transition()
-        duration = self._get_horizontal_animation_duration()
-
-        use_special_animation = self._resolve_size_hint_x()
-
-        if use_special_animation:
-            self._animate_width_hint_special_case(
-                x_hint,
-                transition,
-                duration
-            )
-            return
-
-        if self.size_hint_x != x_hint:
-            self.start_resize_animation(Animation(
-                size_hint_x=x_hint,
-                t=transition,
-                d=duration
-            ), HORIZONTAL)
-
-    def _resolve_size_hint_y(self, *_args):
-        """
-        If the size_hint_y is currently None, we cannot animate on size_hint.
-        Thus, find what value of size_hint_y would lead to the current height,
-        if possible, and set this widget's size_hint_y to that value.
-
-        This is much more nuanced than it sounds.
+            # calculate the width of the slot for each column, currently and
+            # after the expandable widget gets its new size hint
+            spacing = (cols - 1) * parent.spacing[0]
+            padding = parent.padding[0] + parent.padding[2]
+            widths_before, widths_after = _solve_grid_tracks(
+                cols,
+                [col_num for _row_num, col_num in cells],
+                [child.width for child in children],
+                [
+                    -1. if child.size_hint_x is None else child.size_hint_x
+                    for child in children
+                ],
+                parent.col_default_width,
+                parent.cols_minimum,
+                parent.width - spacing - padding,
+                col_of_self,
+                hint
+            )
+            widths_before = dict(enumerate(widths_before))
+            widths_after = dict(enumerate(widths_after))
 
-        First of all, we may be the child of a widget that does not honor size
-        hints at all. In that case, just return the default value of
-        size_hint_y. Also log a warning to the user.
+            # set col_force_default to True
+            parent.col_force_default = True
+            parent.cols_minimum = widths_before
 
-        If our parent does honor size hints, then we need to understand how that
-        parent handles size hints. Different Layouts have different approaches
-        to interpreting size hints. Great effort has been expended to account
-        for every edge case.
+            # bind parent.cols_minimum to parent._trigger_layout
+            parent.bind(cols_minimum=parent._trigger_layout)  # noqa
 
-        Some widgets will "snap" to a height after being assigned a size_hint_y,
-        meaning a smooth animation will not be possible. In that case, this
-        method will return True. When this method returns True, a special method
-        is called during the animation process in the internals of this widget.
-        It performs dark magic under-the-hood to ensure a smooth animation.
+            # create animations
+            anim1 = self._create_resize_animation(
+                cols_minimum=widths_after,
+                t=transition,
+                d=duration
+            )
+            anim2 = self._create_resize_animation(
+                width=widths_after[col_of_self],
+                t=transition,
+                d=duration
+            )
 
-        This method has not been tested with a RecycleBoxLayout or a
-        RecycleGridLayout. However, the logic used in this method for BoxLayouts
-        and GridLayouts will be used for RecycleBoxLayouts and
-        RecycleGridLayouts, respectively.
+            # unbind parent._trigger_layout, set parent.cols_minimum and
+            # parent.col_force_default back to their original values
+            def on_complete(*_args):
+                parent.unbind(cols_minimum=parent._trigger_layout)  # noqa
+                parent.cols_minimum = temp
+                parent.col_force_default = False
+            anim1.bind(on_complete=on_complete)
 
-        If you have your own widgets which listen to the size_hints of their
-        children, or you have a subclass of one of the default Layout classes
-        which overrides the do_layout logic, then you can add custom behavior to
-        properly resolve for that widget by assigning a callback to the
-        custom_size_hint_resolver attribute.
+            # animate self and cols_minimum to new value
+            self.start_resize_animation(anim2, HORIZONTAL)
+            anim1.start(parent)
+        else:
 
-        :return: By default, this method returns a boolean. It returns True if
-        we need a special behavior to perform a smooth animation. This method
-        returns False otherwise. But if the user assigns a callback to
-        custom_size_hint_resolver, this method will return the response of
-        self.custom_size_hint_resolver if the return value is not None.
-        """
-        if self.custom_size_hint_resolver is not None:
-            custom_result = self.custom_size_hint_resolver(self, "y")
-            if custom_result is not None:
-                return custom_result
+            rows, cols, cells = self._get_planned(
+                "grid",
+                lambda: _get_grid_cells(parent)
+            )
+            children = parent.children
+            row_of_self = cells[children.index(self)][0]
 
-        self._resolve_parent()
-        parent = self.parent
-        padding_vert = parent.padding[1] + parent.padding[3]
+            if parent.row_force_default:
+                if row_of_self in parent.rows_minimum:
+                    full_height = parent.rows_minimum[row_of_self]
+                else:
+                    full_height = parent.row_default_height
 
-        if parent is None:
-            Logger.warning("Widget is detached from widget tree!")
-            self.size_hint_y = 1
-            return DO_DEFAULT_ANIM
+                anim = self._create_resize_animation(
+                    height=full_height,
+                    t=transition,
+                    d=duration
+                )
+                self.start_resize_animation(anim, VERTICAL)
+                return
 
-        if (
-                isinstance(parent, WindowBase) or
-                isinstance(parent, FloatLayout) or
-                isinstance(parent, RelativeLayout)
-        ):
-            """Window, FloatLayout, RelativeLayout:
-            The size_hint represents a percentage of the size of the containing
-            Layout. For example, size_hint_y=0.5 would make the child widget
-            have half the height of the containing Layout."""
-            self.size_hint_y = self.height / parent.height
-            return DO_DEFAULT_ANIM
+            # we will override this attribute, but we will need to set it back
+            # to this value after we're done
+            temp = parent.rows_minimum
 
-        if isinstance(parent, AnchorLayout):
-            """ AnchorLayout:
-            The size_hint_y is the percentage of the allotted height awarded to
-            the widget. The allotted height is the AnchorLayout height minus the
-            height of the vertical padding (padding-top and padding-bottom, i.e.
-            padding[1] and padding[3]). Every child has the same allotted
-            height."""
-            allotted_height = parent.height - padding_vert
-            if allotted_height <= 0:
-                self.size_hint_y = 1
-            else:
-                self.size_hint_y = self.height / allotted_height
-            return DO_DEFAULT_ANIM
+            # calculate the height of the slot for each row, currently and
+            # after the expandable widget gets its new size hint
+            spacing = (rows - 1) * parent.spacing[1]
+            padding = parent.padding[1] + parent.padding[3]
+            heights_before, heights_after = _solve_grid_tracks(
+                rows,
+                [row_num for row_num, _col_num in cells],
+                [child.height for child in children],
+                [
+                    -1. if child.size_hint_y is None else child.size_hint_y
+                    for child in children
+                ],
+                parent.row_default_height,
+                parent.rows_minimum,
+                parent.height - spacing - padding,
+                row_of_self,
+                hint
+            )
+            heights_before = dict(enumerate(heights_before))
+            heights_after = dict(enumerate(heights_after))
 
-        if isinstance(parent, BoxLayout):
-            """BoxLayout:
-            If orientation is "horizontal":
-                size_hint_y is the percent height of the allotted height, which 
-                is the BoxLayout height minus the vertical padding.
-            If orientation is "vertical":
-                The allotted height is the height of the BoxLayout minus the
-                height of every widget with a size_hint of None, the spacing
-                between each child ((len(children) - 1) * spacing), and the
-                vertical and horizontal padding. Every child with a non-None
-                size_hint_y gets some ratio of the allotted height. This ratio 
-                is that widget's size_hint_y over the sum of every non-None 
-                size_hint_y."""
-            num_siblings = len(parent.children) - 1
-            if parent.orientation == "horizontal":
-                allotted_height = parent.height - padding_vert
-                self.size_hint_y = self.height / allotted_height
-            else:
-                sum_fixed_heights = 0.
-                sum_hint_y = 0.
-                for child in parent.children:
-                    if child.size_hint_y is None:
-                        sum_fixed_heights += child.height
-                    else:
-                        sum_hint_y += child.size_hint_y
-                if sum_hint_y == 0:
-                    """If we are the only child of a vertically-oriented 
-                    BoxLayout, any size_hint_y will cause us to fill the entire 
-                    allotted space. Resolving the size_hint_y does not allow, 
-                    then, for a smooth animation, hence we return True to 
-                    perform dark magic."""
-                    return DO_SPECIAL_ANIM
-                spacing_vert = (len(parent.children) - 1) * parent.spacing
-                allotted_height = (
-                        parent.height - padding_vert -
-                        spacing_vert - sum_fixed_heights
-                )
-                allotted_height = max(0, allotted_height)
-                if allotted_height == 0:
-                    self.size_hint_y = 1
-                else:
-                    height = self.height
-                    self.size_hint_y = sum_hint_y * height / allotted_height
-            return DO_DEFAULT_ANIM
+            # set row_force_default to True
+            parent.row_force_default = True
+            parent.rows_minimum = heights_before
 
-        if isinstance(parent, StackLayout):
-            """StackLayout:
-            The size_hint_y is a percentage of allotted height awarded to the
-            widget. However, how allotted height is calculated depends on
-            orientation:
-            If the orientation starts with "tb" or "bt":
-                Allotted height can be different for each column. For column n,
-                allotted height is GridLayout height minus vertical padding
-                minus (vertical spacing * ((# of rows in column n) - 1)).
-
-                Converting height to size_hint_y, therefore, requires knowing
-                the number of rows in that column. The most straightforward way
-                to calculate this is to iterate over the children list of the
-                StackLayout and determine the rows in each column ourselves. The
-                tricky part is that a StackLayout will add a widget to a row if
-                it can. But adding a new widget reduces the height of all
-                previous widgets in that row that have size_hint_y's since
-                adding an extra widget adds more vertical spacing and therefore
-                reduces the allotted height for that column.
-            If the orientation starts with "rl" or "lr":
-                The allotted height doesn't care about the spacing between rows.
-                It is just GridLayout height minus vertical padding."""
-            result = self._handle_child_of_stack_layout()
-            if "rows" in result:
-                allotted_height = parent.height - padding_vert
-            else:
-                col_of_self = result["cols_of_self"]
-                cols = result["cols"]
-                spacing_vert = (len(cols[col_of_self]) - 1) * parent.spacing[1]
-                allotted_height = parent.height - padding_vert - spacing_vert
-            self.size_hint_y = self.height / allotted_height
-            return DO_DEFAULT_ANIM
+            # bind parent.rows_minimum to parent._trigger_layout
+            parent.bind(rows_minimum=parent._trigger_layout)  # noqa
 
-        if isinstance(parent, GridLayout):
-            """GridLayout:
-            If rows is None and cols is None:
-                The Layout does not manage the position and size of any child.
-                Whatever is assigned to pos and size of the child is that
-                child's pos and size. size_hint_y has no effect.
-            If row_force_default is True:
-                The height of the widget is the height of its slot if it has a
-                non-None size_hint_y (the slot height of row n is given by
-                rows_minimum[n], or by row_height_default if n is not in the
-                dictionary). If the size_hint_y is None, the widget's height is
-                whatever value is assigned to the height attribute.
-            If row_force_default is False:
-                A non-None size_hint_y means that the widget height will be
-                exactly that of the slot. A None size_hint_y means that the
-                height of the widget will be whatever is assigned to the height
-                attribute of the widget.
-                So, how is the slot height calculated? The slot height is the
-                sum of the minimum height for that row and some fraction of the
-                allotted height for rows.
-
-                Minimum height:
-                    Look for any widgets in row n with a None size_hint_y, and
-                    find the maximum height of all widgets in that row with a
-                    None size_hint_y.
-
-                    Then, for row n, look for the value of n mapped by
-                    rows_minimum. If n is even a key in the dictionary, that is.
-
-                    Then look at the value of row_default_height.
-
-                    Whatever is largest of these values is the minimum height
-                    for that row.
-                Allotted height:
-                    The allotted height is the height of the GridLayout minus
-                    the minimum height of each row, minus the vertical padding,
-                    minus the vertical spacing (spacing[1] * (len(children)-1)).
-
-                    If the allotted height is negative, just make it zero.
-
-                    Then, for each row n, calculate the maximum non-None
-                    size_hint_y for every widget in that row.
-
-                    Sum the maximum size_hint_y in each row for every row that
-                    has at least one widget with a non-None size_hint_y.
-
-                    Each row with a maximum non-None size_hint_y gets an
-                    additional max_size_hint_y/sum_size_hint_y * allotted_height
-                    added to its minimum height. That is the height of every
-                    slot in that row.
-
-                    If the allotted height is zero or there are no children with
-                    a non-None size_hint_y, then the minimum height for the row
-                    is the slot height for the row.
-            We return True from this method if we need special logic to animate
-            from a non-None to a None size_hint_y in a smooth manner. This case
-            will happen for most cases that we are in a GridLayout widget, since
-            a child of a GridLayout will instantaneously "snap" to fill its slot
-            once we set the size_hint_y to some value."""
-            if parent.rows is None and parent.cols is None:
-                self.size_hint_y = 1
-                return DO_DEFAULT_ANIM
-            else:
-                return DO_SPECIAL_ANIM
+            # create animations
+            anim1 = self._create_resize_animation(
+                rows_minimum=heights_after,
+                t=transition,
+                d=duration
+            )
+            anim2 = self._create_resize_animation(
+                height=heights_after[row_of_self],
+                t=transition,
+                d=duration
+            )
 
-        Logger.warning(
-            "Assigned size_hint, but parent does not listen to size_hint!"
-        )
-        self.size_hint_y = True
-        return DO_DEFAULT_ANIM
+            # unbind parent._trigger_layout, set parent.rows_minimum and
+            # parent.row_force_default back to their original values
+            def on_complete(*_args):
+                parent.unbind(rows_minimum=parent._trigger_layout)  # noqa
+                parent.rows_minimum = temp
+                parent.row_force_default = False
+            anim1.bind(on_complete=on_complete)
+
+            # animate self and rows_minimum to new value
+            self.start_resize_animation(anim2, VERTICAL)
+            anim1.start(parent)
 
     def _get_expand_anim_vert_duration(self, *_args):
         """Returns the full duration for vertically expanding. This does not
@@ -1999,27 +5685,19 @@ class ExpandableMixin(Widget):
 
         # if we are starting an animation in the middle of an expansion or
         # retraction
-        if self._timestamp_vertical is not None:
-
-            # how much of the expansion/retraction was achieved?
-            if will_retract:
-                total_duration = self._get_expand_anim_vert_duration()
-            else:
-                total_duration = self._get_retract_anim_vert_duration()
-            time_passed = time.perf_counter() - self._timestamp_vertical
-            percent = min(1, time_passed / total_duration)
-
-            # initialize percent expanded if necessary
-            if self._percent_expanded_vertical is None:
-                if will_retract:
-                    self._percent_expanded_vertical = percent
-                else:
-                    self._percent_expanded_vertical = 1 - percent
-            else:
-                if was_expanding:
-                    self._percent_expanded_vertical += percent
-                else:
-                    self._percent_expanded_vertical -= percent
+        if self._progress_vertical is not None:
+            progress = self._progress_vertical
+            self._progress_vertical = None
+
+            # the interrupted animation was heading from _percent_expanded
+            # (fully expanded or retracted if None) to the opposite state
+            start = self._percent_expanded_vertical
+            if start is None:
+                start = 0. if was_expanding else 1.
+            target = 1. if was_expanding else 0.
+            self._percent_expanded_vertical = (
+                start + (target - start) * progress
+            )
 
             if will_retract:
                 duration = self._percent_expanded_vertical * duration
@@ -2029,10 +5707,12 @@ class ExpandableMixin(Widget):
 
         return duration
 
-    def _get_vertical_animation_transition(self):
+    def _get_vertical_animation_transition(self, will_expand=None):
         """Returns the animation transition for based on whether we will
-        vertically expand or retract."""
-        will_expand = not self._expanded_vertical
+        vertically expand or retract. If will_expand is not given, it is
+        determined from the current vertical state."""
+        if will_expand is None:
+            will_expand = not self._expanded_vertical
         if will_expand:
             if self.transition_expand_y:
                 return self.transition_expand_y
@@ -2056,7 +5736,8 @@ class ExpandableMixin(Widget):
         widget.
 
         The only known edge cases where this can happen occur in BoxLayouts or
-        GridLayouts."""
+        GridLayouts. The animation is performed by the animator registered for
+        the type of the parent (see register_size_hint_resolver)."""
         if not self.allow_resize_y:
             return
 
@@ -2071,208 +5752,61 @@ class ExpandableMixin(Widget):
             if result is not None:
                 return
 
-        parent = self.parent
-
-        if isinstance(parent, BoxLayout):
-            """If orientation is vertical, then the allotted height is divided 
-            between all widgets with non-None size_hint_y's. But if we are the 
-            only child, then we get all of the allotted height no matter the 
-            value of our size_hint_y. Hence, assigning a value to size_hint_y 
-            causes widget to "snap" into a particular height, ruining a smooth 
-            animation. Hence, we cheat by simply animating the height to the 
-            allotted height."""
-            self.size_hint_y = None
-
-            sum_heights = 0.
-            for child in parent.children:
-                if child.size_hint_y is None and child is not self:
-                    sum_heights += child.height
-
-            padding_vert = parent.padding[1] + parent.padding[3]
-            spacing_vert = parent.spacing * (len(parent.children) - 1)
-            padding_and_spacing = padding_vert + spacing_vert
-            height = parent.height - padding_and_spacing - sum_heights
-            height = max(0, height)
-
-            duration = self._get_vertical_animation_duration()
-            transition = self._get_vertical_animation_transition()
-            anim = Animation(height=height, t=transition, d=duration)
-            self.start_resize_animation(anim, VERTICAL)
-
-        if isinstance(parent, GridLayout):
-            """
-            Notice that we have an issue for a child of a GridLayout if we
-            animate from a min_x to a max_x_hint (or a max_x to a
-            min_x_hint). As soon as we add a size_hint, the widget will
-            instantaneously fill its slot, ruining what is supposed to be a
-            smooth animation. Therefore, if we are animating a GridLayout that
-            is "switching" from a None size_hint_y to a non-None size_hint_y,
-            we have to cheat.
-
-            Save the current rows_minimum of the GridLayout to some temporary
-            variable and then make a new rows_minimum that maps each row to its
-            current slot height. Then set force_row_default to True.
-
-            Calculate what the new height of each row will be after we set the
-            widget size_hint_y. Make a second rows_minimum dict and animate to 
-            it. Note that GridLayouts don't, by default, bind their layout logic 
-            to the rows_minimum property (this is likely a bug that should be 
-            fixed, make an MR to the kivy source code), so bind rows_minimum to 
-            the private method _trigger_layout.
-
-            Once this animation is complete, set the size_hint_y to
-            min/max_y_hint. Also unbind _trigger_layout.
-            """
-
-            result = self._handle_child_of_grid_layout()
-
-            row_of_self = result["row_of_self"]
-
-            if parent.row_force_default:
-                if row_of_self in parent.rows_minimum:
-                    full_height = parent.rows_minimum[row_of_self]
-                else:
-                    full_height = parent.row_default_width
-
-                anim = Animation(width=full_height, t=transition, d=duration)
-                self.start_resize_animation(anim, VERTICAL)
-                return
-
-            # we will override this attribute, but we will need to set it back
-            # to this value after we're done
-            temp = parent.rows_minimum
-
-            # calculate the width of the slot for each row. This requires
-            # calculating the minimum width for each row AND the fraction of
-            # allotted width provided to each row
-
-            # mins[n] is the minimum height of row n
-            mins = {}
-            # max_size_hints[n] is the largest size_hint_y found in row n
-            max_size_hints = {}
-
-            row_default_width = parent.row_default_width
-
-            rows = result["rows"]
-            num_rows = len(rows.keys())
-
-            # loop through every child in row. Determine the minimum height of
-            # the row, as well as the largest size_hint_y in that row.
-            for row_num in rows.keys():
-
-                minimum_from_dict = None
-                if row_num in parent.rows_minimum:
-                    minimum_from_dict = parent.rows_minimum[row_num]
-
-                minimum_from_children = None
-                max_size_hint = None
-                for child in rows[row_num]:
-                    if child.size_hint_y is None:
-                        # find a value for minimum_from_children
-                        if minimum_from_children is None:
-                            minimum_from_children = child.height
-                        else:
-                            minimum_from_children = max(
-                                minimum_from_children,
-                                child.height
-                            )
-                    else:
-                        # find the largest size_hint_y in the row
-                        if max_size_hint is None:
-                            max_size_hint = child.size_hint_y
-                        else:
-                            max_size_hint = max(
-                                max_size_hint,
-                                child.size_hint_y
-                            )
-
-                min_height = row_default_width
-
-                if minimum_from_dict is not None:
-                    min_height = max(min_height, minimum_from_dict)
-
-                if minimum_from_children is not None:
-                    min_height = max(min_height, minimum_from_children)
-
-                # the minimum width for col_num is...
-                mins[row_num] = min_height
-                # the maximum size_hint for col_num is...
-                if max_size_hint is not None:
-                    max_size_hints[row_num] = max_size_hint
-
-            spacing = (num_rows - 1) * parent.spacing[1]
-            padding = parent.padding[1] + parent.padding[3]
-            allotted_height = parent.height - spacing - padding
-            allotted_height -= sum(mins.values())
-
-            # create a rows_minimum dictionary that represents the height of
-            # each row currently. Then make another one that represents the
-            # height of each row after expandable widget gets a new size hint
-            heights_before = {}
-            heights_after = {}
-            dicts = [heights_before, heights_after]
-            for dictionary in dicts:
-                sum_size_hint = sum(max_size_hints.values())
-                for row in rows.keys():
-                    height = mins[row]
-
-                    if sum_size_hint > 0:
-                        ratio = max_size_hints[row] / sum_size_hint
-                        height += ratio * allotted_height
-
-                    dictionary[row] = height
-                max_size_hints[row_of_self] = y_hint
-
-            # set row_force_default to True
-            parent.row_force_default = True
-            parent.rows_minimum = heights_before
-
-            # bind parent.rows_minimum to parent._trigger_layout
-            parent.bind(rows_minimum=parent._trigger_layout)  # noqa
-
-            # create animations
-            anim1 = Animation(
-                rows_minimum=heights_after,
-                t=transition,
-                d=duration
-            )
-            anim2 = Animation(
-                height=heights_after[row_of_self],
-                t=transition,
-                d=duration
-            )
-
-            # unbind parent._trigger_layout, set parent.cols_minimum back to its
-            # original value
-            def on_complete(*_args):
-                parent.unbind(rows_minimum=parent._trigger_layout)  # noqa
-                parent.rows_minimum = temp
-            anim1.bind(on_complete=on_complete)
-
-            # animate self and cols_minimum to new value
-            self.start_resize_animation(anim2, HORIZONTAL)
-            anim1.start(parent)
+        handlers = _get_size_hint_handlers(type(self.parent))
+        if handlers is not None and handlers[1] is not None:
+            handlers[1](self, "y", y_hint, transition, duration)
 
-    def _animate_height_hint(self, y_hint, *_args):
+    def _animate_height_hint(self, y_hint, *_args, transition=None,
+                             duration=None):
         """If we are allowed to resize vertically, and if the y_hint is one of
-        the values min_y_hint or max_y_hint, then we perform the needed
-        animation to animate to that value of y_hint. This will call
-        self._resolve_size_hint_xy if the current size_hint_y is None and
-        possibly call self._animate_height_hint_special_case if necessary."""
+        the values min_y_hint or max_y_hint (or a hinted snap point), then we
+        perform the needed animation to animate to that value of y_hint. This
+        will call self._resolve_size_hint_y if the current size_hint_y is None
+        and possibly call self._animate_height_hint_special_case if necessary.
+
+        The transition and duration are determined from the vertical state
+        unless they are given."""
         if not self.allow_resize_y:
             return
 
-        if y_hint not in [self.min_y_hint, self.max_y_hint]:
+        valid_hints = [self.min_y_hint, self.max_y_hint] + [
+            size for size, is_hint in self._get_snap_points_y() if is_hint
+        ]
+        if y_hint not in valid_hints:
             raise ExpandableMixinError(
                 f"Attempted to set invalid size_hint_y: {y_hint}; value must be"
-                + f"{self.min_y_hint} or {self.max_y_hint}"
+                f" one of {valid_hints}"
             )
 
-        Animation.cancel_all(self, "height")
-        Animation.cancel_all(self, "size_hint_y")
+        self._cancel_vertical_resize()
+
+        if transition is None:
+            transition = self._get_vertical_animation_transition()
+        if duration is None:
+            duration = self._get_vertical_animation_duration()
+        else:
+            # only calculated durations account for an interrupted animation
+            self._clear_anim_data_vertical(self, True)
+
+        if self.animate_in_pixel_space and self.parent is not None:
+            handlers = _get_size_hint_handlers(type(self.parent))
+            if handlers is not None and handlers[2] is not None:
+                self._animate_height_hint_in_pixels(
+                    y_hint,
+                    handlers[2],
+                    transition,
+                    duration
+                )
+                return
 
-        transition = self._get_vertical_animation_transition()
-        duration = self._get_vertical_animation_duration()
+        if (
+                self.custom_size_hint_batch_resolver is not None and
+                self.size_hint_y is None and
+                self.parent is not None
+        ):
+            self._batched_hint_vertical = True
+            _size_hint_batcher.queue(self, "y", y_hint, transition, duration)
+            return
 
         use_special_animation = self._resolve_size_hint_y()
         if use_special_animation:
@@ -2284,58 +5818,246 @@ class ExpandableMixin(Widget):
             return
 
         if self.size_hint_y != y_hint:
-            self.start_resize_animation(Animation(
+            self.start_resize_animation(self._create_resize_animation(
                 size_hint_y=y_hint,
                 t=transition,
                 d=duration
             ), VERTICAL)
 
-    def _animate_width(self, new_width, *_args):
+    def _animate_width_hint_in_pixels(self, x_hint, pixel_target, transition,
+                                      duration):
+        """Animates the width towards the width x_hint gives this widget, as
+        computed by pixel_target every frame. The size hint is assigned once
+        the animation completes (see animate_in_pixel_space)."""
+        self._pixel_animation_horizontal = (pixel_target, x_hint, self.width)
+        self.size_hint_x = None
+        self._pixel_progress_horizontal = 0
+        anim = self._create_resize_animation(
+            _pixel_progress_horizontal=1,
+            t=transition,
+            d=duration
+        )
+
+        def on_complete(*_args):
+            self._pixel_animation_horizontal = None
+        anim.bind(on_complete=on_complete)
+        self.start_resize_animation(anim, HORIZONTAL)
+
+    def _animate_height_hint_in_pixels(self, y_hint, pixel_target, transition,
+                                       duration):
+        """Animates the height towards the height y_hint gives this widget, as
+        computed by pixel_target every frame. The size hint is assigned once
+        the animation completes (see animate_in_pixel_space)."""
+        self._pixel_animation_vertical = (pixel_target, y_hint, self.height)
+        self.size_hint_y = None
+        self._pixel_progress_vertical = 0
+        anim = self._create_resize_animation(
+            _pixel_progress_vertical=1,
+            t=transition,
+            d=duration
+        )
+
+        def on_complete(*_args):
+            self._pixel_animation_vertical = None
+        anim.bind(on_complete=on_complete)
+        self.start_resize_animation(anim, VERTICAL)
+
+    def _on_pixel_progress_horizontal(self, _instance, progress):
+        """Moves the width towards the live pixel target of the current
+        horizontal animation in pixel space."""
+        if self._pixel_animation_horizontal is None or self.parent is None:
+            return
+        pixel_target, hint, start_width = self._pixel_animation_horizontal
+        target_width = pixel_target(self, "x", hint)
+        self.width = start_width + (target_width - start_width) * progress
+
+    def _on_pixel_progress_vertical(self, _instance, progress):
+        """Moves the height towards the live pixel target of the current
+        vertical animation in pixel space."""
+        if self._pixel_animation_vertical is None or self.parent is None:
+            return
+        pixel_target, hint, start_height = self._pixel_animation_vertical
+        target_height = pixel_target(self, "y", hint)
+        self.height = start_height + (target_height - start_height) * progress
+
+    @staticmethod
+    def _get_animation_progress(animation, elapsed):
+        """Returns the fraction, between 0 and 1, of its path that animation
+        has moved this widget after running for elapsed seconds.
+
+        The elapsed time is accumulated frame by frame from the Clock stepping
+        the animation, so the result is exact even if frames were dropped, and
+        replaying the same frame times (e.g. with a Clock whose time is
+        controlled by a test) gives the same result. The elapsed fraction of
+        the duration is then passed through the transition, since that is how
+        far the widget actually moved."""
+        duration = animation.duration
+        if not duration:
+            return 1.
+
+        progress = min(1., max(0., elapsed / duration))
+        if isinstance(animation, (Sequence, Parallel)):
+            return progress
+        return min(1., max(0., animation.transition(progress)))
+
+    def _cancel_horizontal_resize(self):
+        """Cancels every horizontal resize animation: of width, of size_hint_x,
+        in pixel space, and any animation to a horizontal size hint waiting to
+        be resolved in a batch. A horizontal state change deferred by
+        toggle_policy, and a horizontal animation paused by
+        cull_hidden_animations, are discarded as well. resizing becomes False
+        once neither axis animates."""
+        self._pending_states["x"] = None
+        self._paused_resizes.pop("x", None)
+        if self._animation_horizontal is not None:
+            self._progress_horizontal = self._get_animation_progress(
+                self._animation_horizontal,
+                self._elapsed_horizontal
+            )
+            self._animation_horizontal = None
+        Animation.cancel_all(self, "size_hint_x")
+        Animation.cancel_all(self, "width")
+        if self._pixel_animation_horizontal is not None:
+            Animation.cancel_all(self, "_pixel_progress_horizontal")
+            self._pixel_animation_horizontal = None
+        if self._batched_hint_horizontal:
+            _size_hint_batcher.discard(self, "x")
+            self._batched_hint_horizontal = False
+        if self._animation_horizontal is None and (
+            self._animation_vertical is None
+        ):
+            # cancelling doesn't dispatch on_complete, which would clear it
+            self._resize_animation = None
+
+    def _cancel_vertical_resize(self):
+        """Cancels every vertical resize animation: of height, of size_hint_y,
+        in pixel space, and any animation to a vertical size hint waiting to
+        be resolved in a batch. A vertical state change deferred by
+        toggle_policy, and a vertical animation paused by
+        cull_hidden_animations, are discarded as well. resizing becomes False
+        once neither axis animates."""
+        self._pending_states["y"] = None
+        self._paused_resizes.pop("y", None)
+        if self._animation_vertical is not None:
+            self._progress_vertical = self._get_animation_progress(
+                self._animation_vertical,
+                self._elapsed_vertical
+            )
+            self._animation_vertical = None
+        Animation.cancel_all(self, "size_hint_y")
+        Animation.cancel_all(self, "height")
+        if self._pixel_animation_vertical is not None:
+            Animation.cancel_all(self, "_pixel_progress_vertical")
+            self._pixel_animation_vertical = None
+        if self._batched_hint_vertical:
+            _size_hint_batcher.discard(self, "y")
+            self._batched_hint_vertical = False
+        if self._animation_horizontal is None and (
+            self._animation_vertical is None
+        ):
+            # cancelling doesn't dispatch on_complete, which would clear it
+            self._resize_animation = None
+
+    def _animate_width(self, new_width, *_args, transition=None,
+                       duration=None):
         """If we are allowed to resize horizontally and the given parameter is
-        one of the values min_x or max_x, then animate to that width."""
+        one of the values min_x or max_x (or a snap point in pixels), then
+        animate to that width. The transition and duration are determined from
+        the horizontal state unless they are given."""
         if not self.allow_resize_x:
             return
 
-        if new_width not in [self.min_x, self.max_x]:
+        valid_widths = [self.min_x, self.max_x] + [
+            size for size, is_hint in self._get_snap_points_x() if not is_hint
+        ]
+        if new_width not in valid_widths:
             raise ExpandableMixinError(
                 f"Attempted to set invalid width: {new_width}" +
-                f"; value must be {self.min_x} or {self.max_x}"
+                f"; value must be one of {valid_widths}"
             )
 
-        Animation.cancel_all(self, "size_hint_x")
-        Animation.cancel_all(self, "width")
+        self._cancel_horizontal_resize()
         self.size_hint_x = None
 
-        transition = self._get_horizontal_animation_transition()
-        duration = self._get_horizontal_animation_duration()
+        if transition is None:
+            transition = self._get_horizontal_animation_transition()
+        if duration is None:
+            duration = self._get_horizontal_animation_duration()
+        else:
+            # only calculated durations account for an interrupted animation
+            self._clear_anim_data_horizontal(self, True)
 
-        self.start_resize_animation(Animation(
+        self.start_resize_animation(self._create_resize_animation(
             width=new_width,
             t=transition,
             d=duration
         ), HORIZONTAL)
 
-    def _animate_height(self, new_height, *_args):
+    def _animate_height(self, new_height, *_args, transition=None,
+                        duration=None):
         """If we are allowed to resize vertically and the given parameter is one
-        of the values min_y or max_y, then animate to that height."""
+        of the values min_y or max_y (or a snap point in pixels), then animate
+        to that height. The transition and duration are determined from the
+        vertical state unless they are given."""
         if not self.allow_resize_y:
             return
 
-        if new_height not in [self.min_y, self.max_y]:
+        valid_heights = [self.min_y, self.max_y] + [
+            size for size, is_hint in self._get_snap_points_y() if not is_hint
+        ]
+        if new_height not in valid_heights:
             raise ExpandableMixinError(
                 f"Attempted to set invalid height: {new_height}" +
-                f"; value must be {self.min_y} or {self.max_y}"
+                f"; value must be one of {valid_heights}"
             )
 
-        Animation.cancel_all(self, "size_hint_y")
-        Animation.cancel_all(self, "height")
+        self._cancel_vertical_resize()
         self.size_hint_y = None
 
-        transition = self._get_vertical_animation_transition()
-        duration = self._get_vertical_animation_duration()
+        if transition is None:
+            transition = self._get_vertical_animation_transition()
+        if duration is None:
+            duration = self._get_vertical_animation_duration()
+        else:
+            # only calculated durations account for an interrupted animation
+            self._clear_anim_data_vertical(self, True)
 
-        self.start_resize_animation(Animation(
+        self.start_resize_animation(self._create_resize_animation(
             height=new_height,
             t=transition,
             d=duration
         ), VERTICAL)
+
+
+for _layout_class in (
+    "kivy.core.window.WindowBase",
+    "kivy.uix.floatlayout.FloatLayout",
+    "kivy.uix.relativelayout.RelativeLayout"
+):
+    ExpandableMixin.register_size_hint_resolver(
+        _layout_class,
+        ExpandableMixin._resolve_in_float_layout,
+        pixel_target=ExpandableMixin._get_pixel_target_in_float_layout
+    )
+ExpandableMixin.register_size_hint_resolver(
+    "kivy.uix.anchorlayout.AnchorLayout",
+    ExpandableMixin._resolve_in_anchor_layout,
+    pixel_target=ExpandableMixin._get_pixel_target_in_anchor_layout
+)
+ExpandableMixin.register_size_hint_resolver(
+    "kivy.uix.boxlayout.BoxLayout",
+    ExpandableMixin._resolve_in_box_layout,
+    ExpandableMixin._animate_in_box_layout,
+    ExpandableMixin._get_pixel_target_in_box_layout
+)
+ExpandableMixin.register_size_hint_resolver(
+    "kivy.uix.stacklayout.StackLayout",
+    ExpandableMixin._resolve_in_stack_layout,
+    pixel_target=ExpandableMixin._get_pixel_target_in_stack_layout
+)
+ExpandableMixin.register_size_hint_resolver(
+    "kivy.uix.gridlayout.GridLayout",
+    ExpandableMixin._resolve_in_grid_layout,
+    ExpandableMixin._animate_in_grid_layout,
+    ExpandableMixin._get_pixel_target_in_grid_layout
+)
@@ -0,0 +1,333 @@
+import mmap
+import os
+
+from expandable import ExpandableMixin
+from expandable import ExpandableMixinError
+
+SNAPSHOT_VERSION = 1
+"""The version of the blobs produced by snapshot_expand_states.
+restore_expand_states refuses blobs of any other version."""
+
+_EXPANDED_X = 1
+_EXPANDED_Y = 2
+
+
+def iter_expandables(root):
+    """Yields (stable_id, widget) for every ExpandableMixin in the widget tree
+    under root (root included), parents before children.
+
+    The stable id of a widget is its expandable_id if it has one. Otherwise,
+    it is the path of the widget from root: the positions, in the order they
+    were added, of the widget and each of its ancestors below root, joined by
+    dots (the empty string for root itself)."""
+    stack = [(root, "")]
+    while stack:
+        widget, path = stack.pop()
+        if isinstance(widget, ExpandableMixin):
+            yield widget.expandable_id or path, widget
+
+        children = widget.children
+        prefix = path + "." if path else ""
+        count = len(children)
+        # widget.children is in reverse order of addition; push so that the
+        # first added child is popped first
+        for position, child in enumerate(children):
+            stack.append((child, f"{prefix}{count - 1 - position}"))
+
+
+def snapshot_expand_states(root):
+    """Captures the state of every resizable ExpandableMixin under root into a
+    JSON-serializable dictionary.
+
+    Each widget is stored under its stable id (see iter_expandables) as an
+    integer whose bits are expand_state_x and expand_state_y. Widgets with
+    snap points are stored as a list [flags, snap_index_x, snap_index_y]
+    instead."""
+    states = {}
+    for key, widget in iter_expandables(root):
+        if not (widget.allow_resize_x or widget.allow_resize_y):
+            continue
+
+        flags = 0
+        if widget.allow_resize_x and widget.expand_state_x:
+            flags |= _EXPANDED_X
+        if widget.allow_resize_y and widget.expand_state_y:
+            flags |= _EXPANDED_Y
+
+        if widget.snap_points_x or widget.snap_points_y:
+            states[key] = [flags, widget.snap_index_x, widget.snap_index_y]
+        else:
+            states[key] = flags
+
+    return {"version": SNAPSHOT_VERSION, "states": states}
+
+
+def restore_expand_states(root, blob):
+    """Applies a blob produced by snapshot_expand_states to the widget tree
+    under root, without animating. Returns the number of widgets restored.
+
+    Widgets already in the stored state (and not animating) are skipped, and
+    the rest are resized inside a single ExpandableMixin.batch(), so every
+    affected layout runs once no matter how many widgets change. Widgets
+    missing from the blob, and ids in the blob matching no widget, are
+    ignored."""
+    if blob.get("version") != SNAPSHOT_VERSION:
+        raise ExpandableMixinError(
+            f"Cannot restore expand states from a blob of version "
+            f"{blob.get('version')}; expected version {SNAPSHOT_VERSION}"
+        )
+
+    states = blob["states"]
+    restored = 0
+    with ExpandableMixin.batch():
+        for key, widget in iter_expandables(root):
+            state = states.get(key)
+            if state is None:
+                continue
+
+            if isinstance(state, int):
+                flags, snap_index_x, snap_index_y = state, None, None
+            else:
+                flags, snap_index_x, snap_index_y = state
+
+            _restore_x(widget, bool(flags & _EXPANDED_X), snap_index_x)
+            _restore_y(widget, bool(flags & _EXPANDED_Y), snap_index_y)
+            restored += 1
+
+    return restored
+
+
+def _restore_x(widget, expanded, snap_index):
+    """Restores the horizontal state of widget."""
+    if not widget.allow_resize_x:
+        return
+
+    if widget.snap_points_x and snap_index is not None:
+        if widget.resizing or snap_index != widget.snap_index_x:
+            widget.instant_snap_x(snap_index)
+    elif widget.resizing or expanded != widget.expand_state_x:
+        if expanded:
+            widget.instant_expand_x()
+        else:
+            widget.instant_retract_x()
+
+
+def _restore_y(widget, expanded, snap_index):
+    """Restores the vertical state of widget."""
+    if not widget.allow_resize_y:
+        return
+
+    if widget.snap_points_y and snap_index is not None:
+        if widget.resizing or snap_index != widget.snap_index_y:
+            widget.instant_snap_y(snap_index)
+    elif widget.resizing or expanded != widget.expand_state_y:
+        if expanded:
+            widget.instant_expand_y()
+        else:
+            widget.instant_retract_y()
+
+
+class ExpandStateStore(object):
+    """Stores the expand states of a large number of rows, such as the items
+    of a RecycleView, outside of any widget.
+
+    The horizontal and vertical states take one bit per row each, packed into
+    a single buffer. If snap_indices is True, one byte per row and axis also
+    stores a snap index (so snap points lists must not exceed 256 entries).
+    A million rows take 250KB, or 2.25MB with snap indices. Reading or writing
+    the state of a row takes O(1) time, and expanding or collapsing every row
+    is a single fill of the buffer.
+
+    If path is given, the buffer is a memory-mapped file, created (filled with
+    zeros, i.e., every row retracted) if it doesn't exist, so the states
+    persist between sessions without ever being loaded into memory at once.
+
+    Recycled views read their state from the store when they are given a row,
+    and write it back before they are given another one:
+
+        class Row(RecycleDataViewBehavior, Button, ExpandableMixin):
+            def refresh_view_attrs(self, rv, index, data):
+                if self.index is not None:
+                    store.capture(self, self.index)
+                self.index = index
+                store.apply(self, index)
+                return super().refresh_view_attrs(rv, index, data)"""
+
+    def __init__(self, length, snap_indices=False, path=None):
+        self._length = length
+        self._snap_indices = snap_indices
+        self._bits_size = (length + 7) >> 3
+        self._snap_offset = 2 * self._bits_size
+        size = self._snap_offset + (2 * length if snap_indices else 0)
+
+        self._file = None
+        if path is None:
+            self._buffer = bytearray(size)
+            return
+
+        if not os.path.exists(path):
+            with open(path, "wb"):
+                pass
+        self._file = open(path, "r+b")
+        if os.path.getsize(path) != size:
+            self._file.truncate(size)
+        if size:
+            self._buffer = mmap.mmap(self._file.fileno(), size)
+        else:
+            # mmap can't map an empty file
+            self._buffer = bytearray()
+
+    def __len__(self):
+        return self._length
+
+    def get_x(self, row):
+        """Returns True if the row is horizontally expanded."""
+        self._check_row(row)
+        return bool(self._buffer[row >> 3] & (1 << (row & 7)))
+
+    def get_y(self, row):
+        """Returns True if the row is vertically expanded."""
+        self._check_row(row)
+        return bool(
+            self._buffer[self._bits_size + (row >> 3)] & (1 << (row & 7))
+        )
+
+    def set_x(self, row, expanded):
+        """Sets whether the row is horizontally expanded."""
+        self._check_row(row)
+        self._set_bit(row >> 3, 1 << (row & 7), expanded)
+
+    def set_y(self, row, expanded):
+        """Sets whether the row is vertically expanded."""
+        self._check_row(row)
+        self._set_bit(self._bits_size + (row >> 3), 1 << (row & 7), expanded)
+
+    def get_snap_x(self, row):
+        """Returns the horizontal snap index of the row."""
+        return self._buffer[self._get_snap_position(row, 0)]
+
+    def get_snap_y(self, row):
+        """Returns the vertical snap index of the row."""
+        return self._buffer[self._get_snap_position(row, self._length)]
+
+    def set_snap_x(self, row, index):
+        """Sets the horizontal snap index of the row. The row is horizontally
+        expanded if the index is not 0."""
+        self._buffer[self._get_snap_position(row, 0)] = index
+        self.set_x(row, index > 0)
+
+    def set_snap_y(self, row, index):
+        """Sets the vertical snap index of the row. The row is vertically
+        expanded if the index is not 0."""
+        self._buffer[self._get_snap_position(row, self._length)] = index
+        self.set_y(row, index > 0)
+
+    def expand_all_x(self):
+        """Horizontally expands every row. Snap indices are left untouched, so
+        rows with snap indices of 0 are expanded to their last snap point when
+        applied."""
+        self._fill(0, self._bits_size, 0xFF)
+
+    def expand_all_y(self):
+        """Vertically expands every row. Snap indices are left untouched, so
+        rows with snap indices of 0 are expanded to their last snap point when
+        applied."""
+        self._fill(self._bits_size, self._bits_size, 0xFF)
+
+    def collapse_all_x(self):
+        """Horizontally retracts every row."""
+        self._fill(0, self._bits_size, 0)
+        if self._snap_indices:
+            self._fill(self._snap_offset, self._length, 0)
+
+    def collapse_all_y(self):
+        """Vertically retracts every row."""
+        self._fill(self._bits_size, self._bits_size, 0)
+        if self._snap_indices:
+            self._fill(self._snap_offset + self._length, self._length, 0)
+
+    def collapse_all(self):
+        """Retracts every row, horizontally and vertically."""
+        self._fill(0, len(self._buffer), 0)
+
+    def apply(self, widget, row):
+        """Instantly gives widget the stored state of the row. Axes along which
+        the widget can't resize, or whose state already matches, are left
+        alone. Expanded rows with a snap index of 0 are snapped to their last
+        snap point."""
+        if widget.allow_resize_x:
+            if self._snap_indices and widget.snap_points_x:
+                index = self.get_snap_x(row)
+                if index == 0 and self.get_x(row):
+                    # expanded by expand_all_x
+                    index = len(widget.snap_points_x) - 1
+                if widget.resizing or index != widget.snap_index_x:
+                    widget.instant_snap_x(index)
+            else:
+                _restore_x(widget, self.get_x(row), None)
+
+        if widget.allow_resize_y:
+            if self._snap_indices and widget.snap_points_y:
+                index = self.get_snap_y(row)
+                if index == 0 and self.get_y(row):
+                    # expanded by expand_all_y
+                    index = len(widget.snap_points_y) - 1
+                if widget.resizing or index != widget.snap_index_y:
+                    widget.instant_snap_y(index)
+            else:
+                _restore_y(widget, self.get_y(row), None)
+
+    def capture(self, widget, row):
+        """Stores the state of widget as the state of the row."""
+        if widget.allow_resize_x:
+            if self._snap_indices and widget.snap_points_x:
+                self.set_snap_x(row, widget.snap_index_x)
+            else:
+                self.set_x(row, widget.expand_state_x)
+
+        if widget.allow_resize_y:
+            if self._snap_indices and widget.snap_points_y:
+                self.set_snap_y(row, widget.snap_index_y)
+            else:
+                self.set_y(row, widget.expand_state_y)
+
+    def flush(self):
+        """Writes the states to the backing file, if any."""
+        if self._file is not None and len(self._buffer):
+            self._buffer.flush()
+
+    def close(self):
+        """Flushes and releases the backing file, if any. The store can't be
+        used afterwards."""
+        if self._file is None:
+            return
+        self.flush()
+        if len(self._buffer):
+            self._buffer.close()
+        self._file.close()
+        self._file = None
+
+    def _check_row(self, row):
+        """Raises an IndexError if row is not in the store."""
+        if not 0 <= row < self._length:
+            raise IndexError(f"row {row} out of range")
+
+    def _get_snap_position(self, row, axis_offset):
+        """Returns the position in the buffer of a snap index."""
+        if not self._snap_indices:
+            raise ExpandableMixinError(
+                "This ExpandStateStore was created without snap_indices"
+            )
+        self._check_row(row)
+        return self._snap_offset + axis_offset + row
+
+    def _set_bit(self, position, mask, value):
+        """Sets or clears the bits of mask in the byte at position."""
+        if value:
+            self._buffer[position] |= mask
+        else:
+            self._buffer[position] &= ~mask & 0xFF
+
+    def _fill(self, start, count, value):
+        """Assigns value to count bytes starting at start."""
+        self._buffer[start:start + count] = bytes((value,)) * count
@@ -0,0 +1,502 @@
+from kivy.animation import Animation
+from kivy.animation import AnimationTransition
+from kivy.clock import Clock
+from kivy.properties import BooleanProperty
+from kivy.properties import NumericProperty
+from kivy.properties import ObjectProperty
+from kivy.properties import OptionProperty
+from kivy.uix.behaviors import ButtonBehavior
+from kivy.uix.label import Label
+from kivy.uix.scrollview import ScrollView
+from kivy.uix.widget import Widget
+
+from expandable import anim_transitions
+
+
+class _Fenwick(object):
+    """A Fenwick tree (binary indexed tree) over a list of non-negative
+    integers. Supports appending, point updates, prefix sums and finding the
+    position containing the n-th unit, all in O(log n)."""
+
+    __slots__ = ("_tree", "_values")
+
+    def __init__(self):
+        self._tree = [0]
+        self._values = []
+
+    def __len__(self):
+        return len(self._values)
+
+    def append(self, value):
+        """Adds value to the end of the list."""
+        self._values.append(value)
+        i = len(self._values)
+        self._tree.append(value + self.prefix(i - 1) - self.prefix(i - (i & -i)))
+
+    def add(self, position, delta):
+        """Adds delta to the value at position."""
+        self._values[position] += delta
+        i = position + 1
+        tree = self._tree
+        while i < len(tree):
+            tree[i] += delta
+            i += i & -i
+
+    def prefix(self, count):
+        """Returns the sum of the first count values."""
+        total = 0
+        tree = self._tree
+        while count > 0:
+            total += tree[count]
+            count -= count & -count
+        return total
+
+    def total(self):
+        """Returns the sum of every value."""
+        return self.prefix(len(self._values))
+
+    def search(self, n):
+        """Returns the position p such that prefix(p) <= n < prefix(p + 1).
+        That is, if every value counts some units, returns the position holding
+        the unit n (0-indexed)."""
+        tree = self._tree
+        position = 0
+        step = 1 << (len(self._values).bit_length())
+        while step:
+            nxt = position + step
+            if nxt < len(tree) and tree[nxt] <= n:
+                position = nxt
+                n -= tree[nxt]
+            step >>= 1
+        return position
+
+    def rebuild(self, values):
+        """Replaces the values of the tree in O(n)."""
+        self._values = list(values)
+        tree = [0] + self._values
+        for i in range(1, len(tree)):
+            parent = i + (i & -i)
+            if parent < len(tree):
+                tree[parent] += tree[i]
+        self._tree = tree
+
+
+class TreeNode(object):
+    """A node of an ExpandableTree. Any keyword argument is stored in the data
+    dictionary of the node.
+
+    Every node knows how many visible rows its subtree has (itself included),
+    and keeps the visible row counts of its children in a Fenwick tree.
+    Expanding or collapsing a node, finding the node at a row and finding the
+    row of a node all take O(depth * log(children)) time, no matter how many
+    descendants the node has."""
+
+    __slots__ = (
+        "text",
+        "data",
+        "parent",
+        "children",
+        "expanded",
+        "level",
+        "_position",
+        "_visible",
+        "_counts"
+    )
+
+    def __init__(self, text="", **data):
+        self.text = text
+        self.data = data
+        self.parent = None
+        self.children = []
+        self.expanded = False
+        self.level = 0
+        self._position = 0
+        self._visible = 1
+        self._counts = _Fenwick()
+
+    @property
+    def is_leaf(self):
+        """Is True if the node has no children."""
+        return not self.children
+
+    @property
+    def visible_count(self):
+        """The number of rows this node and its visible descendants take."""
+        return self._visible
+
+    def add_child(self, node):
+        """Appends node (and its subtree) to the children of this node and
+        returns it."""
+        if node.parent is not None:
+            raise ValueError("node already has a parent")
+        node.parent = self
+        node._position = len(self.children)
+        self.children.append(node)
+        self._counts.append(node._visible)
+        _set_level(node, self.level + 1)
+        if self.expanded:
+            self._visible += node._visible
+            _propagate(self, node._visible)
+        return node
+
+    def remove_child(self, node):
+        """Removes node (and its subtree) from the children of this node."""
+        if node.parent is not self:
+            raise ValueError("node is not a child of this node")
+        del self.children[node._position]
+        for position in range(node._position, len(self.children)):
+            self.children[position]._position = position
+        self._counts.rebuild(child._visible for child in self.children)
+        node.parent = None
+        if self.expanded:
+            self._visible -= node._visible
+            _propagate(self, -node._visible)
+
+    def set_expanded(self, expanded):
+        """Expands or collapses this node. Returns the change in the number of
+        visible rows of its subtree."""
+        if expanded == self.expanded:
+            return 0
+        delta = self._counts.total()
+        if not expanded:
+            delta = -delta
+        self.expanded = expanded
+        self._visible += delta
+        _propagate(self, delta)
+        return delta
+
+
+def _set_level(node, level):
+    """Sets the level of node and every one of its descendants."""
+    nodes = [(node, level)]
+    while nodes:
+        node, level = nodes.pop()
+        node.level = level
+        nodes.extend((child, level + 1) for child in node.children)
+
+
+def _propagate(node, delta):
+    """After the visible row count of node changed by delta, updates the
+    counts of its ancestors up to the first collapsed one."""
+    while node.parent is not None and delta:
+        parent = node.parent
+        parent._counts.add(node._position, delta)
+        if not parent.expanded:
+            return
+        parent._visible += delta
+        node = parent
+
+
+def _next_visible(node):
+    """Returns the node on the row after node, or None."""
+    if node.expanded and node.children:
+        return node.children[0]
+    while node.parent is not None:
+        siblings = node.parent.children
+        if node._position + 1 < len(siblings):
+            return siblings[node._position + 1]
+        node = node.parent
+    return None
+
+
+class TreeRow(ButtonBehavior, Label):
+    """The default widget used to display a row of an ExpandableTree. Pressing
+    it toggles its node."""
+
+    tree = ObjectProperty(None, allownone=True)
+    """The ExpandableTree displaying this row."""
+
+    node = ObjectProperty(None, allownone=True)
+    """The TreeNode displayed by this row."""
+
+    expanded = BooleanProperty(False)
+    """Is True if the node of this row is expanded."""
+
+    is_leaf = BooleanProperty(True)
+    """Is True if the node of this row has no children."""
+
+    def refresh_row(self, tree, node):
+        """Updates this row to display node. Called by the tree whenever a
+        recycled row is given a (possibly different) node."""
+        self.tree = tree
+        self.node = node
+        self.expanded = node.expanded
+        self.is_leaf = node.is_leaf
+        prefix = "  " if node.is_leaf else ("- " if node.expanded else "+ ")
+        self.text = prefix + str(node.text)
+        self.halign = "left"
+        self.valign = "middle"
+        self.text_size = self.size
+
+    def on_size(self, *_args):
+        self.text_size = self.size
+
+    def on_release(self):
+        if self.tree is not None and self.node is not None:
+            self.tree.toggle_node(self.node)
+
+
+class ExpandableTree(ScrollView):
+    """A scrollable tree whose nodes expand and retract vertically.
+
+    Only the rows on screen exist as widgets: they are recycled from a pool
+    as the tree scrolls, so a tree with a million nodes costs as much as a
+    tree with a screenful of nodes. Toggling a node updates the visible row
+    counts along the path to the root, which takes time proportional to the
+    depth of the node, not to the size of its subtree. The toggle is then
+    animated as a single height animation: the rows below the node slide while
+    the region holding its children grows or shrinks.
+
+    Build the tree with add_node, which returns the TreeNode it creates:
+
+        tree = ExpandableTree()
+        fruits = tree.add_node("fruits")
+        tree.add_node("apple", parent=fruits)"""
+
+    row_height = NumericProperty("32dp")
+    """The height of every row."""
+
+    indent = NumericProperty("16dp")
+    """The horizontal offset applied to a row for each level of nesting."""
+
+    viewclass = ObjectProperty(TreeRow)
+    """The widget class used for rows. It must have a refresh_row(tree, node)
+    method."""
+
+    duration_resize = NumericProperty(0.25)
+    """The duration of the animation depicting a node expanding or
+    retracting, in units of seconds."""
+
+    transition_resize = OptionProperty(
+        AnimationTransition.linear,
+        options=anim_transitions
+    )
+    """The transition of the animation depicting a node expanding or
+    retracting. It must be a string or one of the properties from the
+    AnimationTransition class in the kivy.animation module."""
+
+    root = ObjectProperty(None)
+    """The invisible TreeNode containing the top-level nodes. It is always
+    expanded."""
+
+    _anim_extra = NumericProperty(0)
+    """Used internally. The height, in pixels, currently shown of the region
+    holding the rows revealed or hidden by the animated toggle."""
+
+    _anim_state = ObjectProperty(None, allownone=True)
+    """Used internally. A tuple (anchor, rows, expanding) describing the
+    animated toggle: the row of the toggled node, the number of rows revealed
+    or hidden below it and whether they are being revealed. None if no toggle
+    is animating."""
+
+    def __init__(self, **kwargs):
+        self._rows = []
+        self._container = Widget(size_hint=(1, None), height=0)
+        self._trigger_refresh = Clock.create_trigger(self.refresh_rows, -1)
+        super(ExpandableTree, self).__init__(**kwargs)
+        if self.root is None:
+            self.root = TreeNode()
+        self.root.expanded = True
+        self.root.level = -1
+        self.add_widget(self._container)
+        self.fbind("scroll_y", self._trigger_refresh)
+        self.fbind("size", self._trigger_refresh)
+        self.fbind("row_height", self._trigger_refresh)
+        self.fbind("indent", self._trigger_refresh)
+        self.fbind("_anim_extra", self._trigger_refresh)
+        self._trigger_refresh()
+
+    @property
+    def row_count(self):
+        """The number of visible rows."""
+        return self.root.visible_count - 1
+
+    def add_node(self, text="", parent=None, **data):
+        """Creates a TreeNode with the given text and data, appends it to the
+        children of parent (or to the top level) and returns it."""
+        node = TreeNode(text, **data)
+        (parent or self.root).add_child(node)
+        self._trigger_refresh()
+        return node
+
+    def remove_node(self, node):
+        """Removes node and its subtree from the tree."""
+        self._finish_animation()
+        node.parent.remove_child(node)
+        self._trigger_refresh()
+
+    def toggle_node(self, node, animate=True):
+        """Expands node if it is collapsed, and collapses it otherwise."""
+        self.set_node_expanded(node, not node.expanded, animate)
+
+    def expand_node(self, node, animate=True):
+        """Ensures node is expanded."""
+        self.set_node_expanded(node, True, animate)
+
+    def collapse_node(self, node, animate=True):
+        """Ensures node is collapsed."""
+        self.set_node_expanded(node, False, animate)
+
+    def set_node_expanded(self, node, expanded, animate=True):
+        """Expands or collapses node. The visible row counts are updated
+        immediately; if animate is True and the node is visible, the change is
+        then depicted by a single height animation."""
+        self._finish_animation()
+        delta = node.set_expanded(expanded)
+        self._trigger_refresh()
+        if not delta or not animate or not self._is_shown(node):
+            return
+
+        rows = abs(delta)
+        full_height = rows * self.row_height
+        self._anim_state = (self.index_of(node), rows, expanded)
+        self._anim_extra = 0 if expanded else full_height
+        animation = Animation(
+            _anim_extra=full_height if expanded else 0,
+            t=self.transition_resize,
+            d=self.duration_resize
+        )
+        animation.bind(on_complete=self._finish_animation)
+        animation.start(self)
+
+    def node_at(self, index):
+        """Returns the node on the given row."""
+        if not 0 <= index < self.row_count:
+            raise IndexError(f"row {index} out of range")
+        node = self.root
+        while True:
+            position = node._counts.search(index)
+            index -= node._counts.prefix(position)
+            node = node.children[position]
+            if index == 0:
+                return node
+            index -= 1
+
+    def index_of(self, node):
+        """Returns the row of node. The node must be visible."""
+        index = 0
+        while node.parent is not None:
+            parent = node.parent
+            index += parent._counts.prefix(node._position)
+            if parent.parent is not None:
+                index += 1
+            node = parent
+        return index
+
+    def refresh_rows(self, *_args):
+        """Places a recycled row widget on every row inside the viewport."""
+        row_height = self.row_height
+        count = self.row_count
+        container = self._container
+        container.height = max(0, count * row_height + self._get_extra_offset())
+
+        scrollable = max(0, container.height - self.height)
+        view_top = (1 - self.scroll_y) * scrollable
+        view_bottom = view_top + self.height
+
+        used = 0
+        index = self._first_row_below(view_top, count)
+        node = self.node_at(index) if index < count else None
+        while node is not None:
+            offset = self._get_row_offset(index)
+            if offset >= view_bottom:
+                break
+            if self._is_row_hidden(index):
+                anchor, rows, _expanding = self._anim_state
+                index = anchor + rows + 1
+                node = self.node_at(index) if index < count else None
+                continue
+
+            row = self._get_row(used)
+            used += 1
+            row.x = container.x + node.level * self.indent
+            row.y = container.top - offset - row_height
+            row.size = (max(0, container.width - node.level * self.indent),
+                        row_height)
+            row.refresh_row(self, node)
+
+            index += 1
+            node = _next_visible(node)
+
+        for row in self._rows[used:]:
+            if row.parent is not None:
+                container.remove_widget(row)
+
+    def _get_row(self, number):
+        """Returns the row widget number from the pool, creating it if
+        needed."""
+        while len(self._rows) <= number:
+            self._rows.append(self.viewclass(size_hint=(None, None)))
+        row = self._rows[number]
+        if row.parent is None:
+            self._container.add_widget(row)
+        return row
+
+    def _is_shown(self, node):
+        """Returns True if every ancestor of node is expanded."""
+        node = node.parent
+        while node is not None:
+            if not node.expanded:
+                return False
+            node = node.parent
+        return True
+
+    def _get_extra_offset(self):
+        """Returns how much taller the content is than its final height while
+        a toggle animates (negative while rows are being revealed)."""
+        if self._anim_state is None:
+            return 0
+        _anchor, rows, expanding = self._anim_state
+        if expanding:
+            return self._anim_extra - rows * self.row_height
+        return self._anim_extra
+
+    def _get_row_offset(self, index):
+        """Returns the distance from the top of the content to the top of the
+        given row, accounting for an animating toggle. It never decreases as
+        index grows."""
+        row_height = self.row_height
+        if self._anim_state is None:
+            return index * row_height
+        anchor, rows, expanding = self._anim_state
+        if index <= anchor:
+            return index * row_height
+        if not expanding:
+            return index * row_height + self._anim_extra
+        if index <= anchor + rows:
+            revealed = (index - anchor - 1) * row_height
+            return (anchor + 1) * row_height + min(revealed, self._anim_extra)
+        return index * row_height - rows * row_height + self._anim_extra
+
+    def _is_row_hidden(self, index):
+        """Returns True if the row is being revealed but does not fit in the
+        revealed region yet."""
+        if self._anim_state is None:
+            return False
+        anchor, rows, expanding = self._anim_state
+        if not expanding or not anchor < index <= anchor + rows:
+            return False
+        return (index - anchor) * self.row_height > self._anim_extra
+
+    def _first_row_below(self, offset, count):
+        """Returns the first row whose bottom is below the given distance from
+        the top of the content, using a binary search over the row offsets."""
+        low, high = 0, count
+        row_height = self.row_height
+        while low < high:
+            middle = (low + high) // 2
+            if self._get_row_offset(middle) + row_height <= offset:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def _finish_animation(self, *_args):
+        """Stops the animated toggle, if any, and shows its final state."""
+        if self._anim_state is None:
+            return
+        Animation.cancel_all(self, "_anim_extra")
+        self._anim_state = None
+        self._anim_extra = 0
+        self._trigger_refresh()
+
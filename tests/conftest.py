@@ -0,0 +1,87 @@
+"""Setup and fixtures shared by the tests.
+
+Run from the repository root:
+
+    python -m pytest tests
+"""
+import os
+import sys
+
+os.environ.setdefault("KIVY_NO_ARGS", "1")
+os.environ.setdefault("KIVY_LOG_MODE", "PYTHON")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest  # noqa: E402
+from kivy.clock import Clock  # noqa: E402
+from kivy.uix.boxlayout import BoxLayout  # noqa: E402
+from kivy.uix.label import Label  # noqa: E402
+
+from expandable import ExpandableMixin  # noqa: E402
+
+
+class ExpandableLabel(Label, ExpandableMixin):
+    pass
+
+
+class ExpandableBoxLayout(BoxLayout, ExpandableMixin):
+    pass
+
+
+class CountingTrigger(object):
+    """Wraps the layout trigger of a layout, counting its calls in the
+    triggers attribute of the layout."""
+
+    def __init__(self, layout):
+        self.layout = layout
+        self.trigger = Clock.create_trigger(layout.do_layout, -1)
+
+    def __call__(self, *args):
+        self.layout.triggers += 1
+        self.trigger(*args)
+
+    @property
+    def is_triggered(self):
+        return self.trigger.is_triggered
+
+    def cancel(self):
+        self.trigger.cancel()
+
+
+class CountingBoxLayout(BoxLayout):
+    """Counts the calls to its layout trigger. The trigger is set before
+    Layout.__init__, which keeps it and binds it."""
+
+    def __init__(self, **kwargs):
+        self.triggers = 0
+        self._trigger_layout = CountingTrigger(self)
+        super(CountingBoxLayout, self).__init__(**kwargs)
+
+
+class FakeClock(object):
+    """Steps the Kivy Clock, which runs every animation, through frames of an
+    exact duration instead of waiting for them, so that animations replay
+    identically whatever the load of the machine."""
+
+    def __init__(self, now):
+        self.now = now
+
+    def time(self):
+        return self.now
+
+    def advance(self, seconds, fps=60):
+        """Runs the frames of the given number of seconds."""
+        for _frame in range(int(round(seconds * fps))):
+            self.now += 1. / fps
+            Clock.tick()
+            Clock.tick_draw()
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Replaces the time of the Kivy Clock with a FakeClock for the test."""
+    fake = FakeClock(Clock.time())
+    monkeypatch.setattr(Clock, "time", fake.time)
+    # don't wait for the next frame in real time
+    monkeypatch.setattr(Clock, "_max_fps", 0)
+    monkeypatch.setattr(Clock, "_last_tick", fake.now)
+    return fake
@@ -0,0 +1,41 @@
+"""Tests the sums kept for the children of a BoxLayout."""
+import gc
+import weakref
+
+from kivy.uix.boxlayout import BoxLayout
+from kivy.uix.widget import Widget
+
+from expandable import _get_box_aggregate
+
+
+def make_parent():
+    parent = BoxLayout()
+    parent.add_widget(Widget(size_hint_x=.5))
+    parent.add_widget(Widget(size_hint_x=None, width=30))
+    return parent
+
+
+def test_aggregate_sums():
+    parent = make_parent()
+    aggregate = _get_box_aggregate(parent)
+    assert aggregate.hint_x == .5
+    assert aggregate.fixed_width == 30
+
+    parent.children[0].size_hint_x = .25
+    parent.add_widget(Widget(size_hint_x=None, width=10))
+    assert aggregate.hint_x == .75
+    assert aggregate.fixed_width == 10
+    assert _get_box_aggregate(parent) is aggregate
+
+
+def test_aggregate_does_not_keep_parent_alive():
+    # the first widget created opens the window, which keeps the frames
+    # creating it alive
+    Widget()
+
+    parent = make_parent()
+    _get_box_aggregate(parent)
+    reference = weakref.ref(parent)
+    del parent
+    gc.collect()
+    assert reference() is None
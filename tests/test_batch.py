@@ -0,0 +1,38 @@
+"""Tests ExpandableMixin.batch()."""
+from conftest import CountingBoxLayout, ExpandableLabel
+from expandable import ExpandableMixin
+
+CHILDREN = 100
+
+
+def test_batch_triggers_each_layout_once(clock):
+    parents = [CountingBoxLayout(orientation="vertical") for _parent in "ab"]
+    widgets = []
+    for parent in parents:
+        for _number in range(CHILDREN):
+            widget = ExpandableLabel(min_y=10, max_y=50)
+            parent.add_widget(widget)
+            widgets.append(widget)
+    clock.advance(.05)
+    for parent in parents:
+        parent.triggers = 0
+
+    with ExpandableMixin.batch():
+        for widget in widgets:
+            widget.instant_expand_y()
+        assert all(parent.triggers == 0 for parent in parents)
+        assert all(widget.height == 10 for widget in widgets)
+
+    assert [parent.triggers for parent in parents] == [1, 1]
+    assert all(widget.height == 50 for widget in widgets)
+
+
+def test_nested_batches_apply_on_outermost_exit(clock):
+    widget = ExpandableLabel(min_y=10, max_y=50)
+    clock.advance(.05)
+    with ExpandableMixin.batch():
+        with ExpandableMixin.batch():
+            widget.instant_expand_y()
+        assert widget.height == 10
+        assert widget.expand_state_y
+    assert widget.height == 50
@@ -0,0 +1,76 @@
+"""Tests the batched custom size hint resolver and animation hooks."""
+from kivy.animation import Animation
+from kivy.uix.floatlayout import FloatLayout
+
+from conftest import ExpandableLabel
+from expandable import HORIZONTAL
+
+
+def make_children(parent, count, resolver, animation=None):
+    widgets = [
+        ExpandableLabel(
+            min_x=100,
+            max_x_hint=.5,
+            custom_size_hint_batch_resolver=resolver,
+            custom_size_hint_batch_animation=animation
+        )
+        for _number in range(count)
+    ]
+    for widget in widgets:
+        parent.add_widget(widget)
+    return widgets
+
+
+def test_resolver_called_once_per_frame(clock):
+    calls = []
+
+    def resolver(parent, axis, widgets):
+        calls.append((parent, axis, list(widgets)))
+        for widget in widgets:
+            widget.size_hint_x = widget.width / parent.width
+        return [False] * len(widgets)
+
+    parent = FloatLayout(size=(400, 400))
+    widgets = make_children(parent, 5, resolver)
+    clock.advance(.05)
+
+    for widget in widgets:
+        widget.expand_x()
+    clock.advance(.5)
+    assert len(calls) == 1
+    assert calls[0][0] is parent
+    assert calls[0][1] == "x"
+    assert set(calls[0][2]) == set(widgets)
+    assert all(widget.width == 200 for widget in widgets)
+
+
+def test_animation_receives_special_cases(clock):
+    requests = []
+
+    def resolver(parent, axis, widgets):
+        for widget in widgets[1:]:
+            widget.size_hint_x = widget.width / parent.width
+        return [widget is widgets[0] for widget in widgets]
+
+    def animation(parent, axis, batch):
+        requests.extend(batch)
+        for widget, hint, transition, duration in batch:
+            widget.start_resize_animation(
+                Animation(width=parent.width * hint, t=transition, d=duration),
+                HORIZONTAL
+            )
+        return True
+
+    parent = FloatLayout(size=(400, 400))
+    widgets = make_children(parent, 3, resolver, animation)
+    clock.advance(.05)
+
+    for widget in widgets:
+        widget.expand_x()
+    clock.advance(.5)
+    assert len(requests) == 1
+    widget, hint = requests[0][:2]
+    assert widget in widgets
+    assert hint == .5
+    assert widget.width == 200
+    assert all(widget.width == 200 for widget in widgets)
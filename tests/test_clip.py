@@ -0,0 +1,78 @@
+"""Tests clip_on_resize."""
+from kivy.graphics import ScissorPop, ScissorPush
+from kivy.uix.boxlayout import BoxLayout
+from kivy.uix.relativelayout import RelativeLayout
+
+from conftest import ExpandableLabel
+
+
+def get_clip(widget):
+    """Returns the ScissorPush and ScissorPop in the canvas of widget."""
+    pushes = [
+        instruction for instruction in widget.canvas.before.children
+        if isinstance(instruction, ScissorPush)
+    ]
+    pops = [
+        instruction for instruction in widget.canvas.after.children
+        if isinstance(instruction, ScissorPop)
+    ]
+    assert len(pushes) == len(pops) <= 1
+    return pushes[0] if pushes else None
+
+
+def make_widget(clock, **kwargs):
+    root = RelativeLayout(pos=(30, 40), size=(400, 400))
+    box = BoxLayout(size=(400, 400))
+    root.add_widget(box)
+    widget = ExpandableLabel(
+        min_y=40, max_y=300, min_x=50, max_x=200, duration_resize=.2,
+        **kwargs
+    )
+    box.add_widget(widget)
+    clock.advance(.1)
+    return widget
+
+
+def test_clip_follows_the_animation_in_window_coordinates(clock):
+    widget = make_widget(clock, clip_on_resize=True)
+    assert get_clip(widget) is None
+
+    widget.toggle_y()
+    clock.advance(.05)
+    push = get_clip(widget)
+    window_x, window_y = widget.to_window(widget.x, widget.y)
+    assert (push.x, push.y) == (int(window_x), int(window_y))
+    assert abs(push.height - widget.height) <= 1
+
+    clock.advance(.4)
+    assert get_clip(widget) is None
+
+
+def test_clip_is_kept_until_both_axes_end(clock):
+    widget = make_widget(clock, clip_on_resize=True, duration_resize_x=.5)
+    widget.toggle_y()
+    widget.toggle_x()
+    clock.advance(.3)
+    assert widget.expand_state_y
+    assert get_clip(widget) is not None
+
+    clock.advance(.5)
+    assert get_clip(widget) is None
+
+
+def test_no_clip_by_default(clock):
+    widget = make_widget(clock)
+    widget.toggle_y()
+    clock.advance(.05)
+    assert get_clip(widget) is None
+
+
+def test_disabling_clip_during_animation_removes_it(clock):
+    widget = make_widget(clock, clip_on_resize=True)
+    widget.toggle_y()
+    clock.advance(.05)
+    widget.clip_on_resize = False
+    assert get_clip(widget) is None
+
+    widget.clip_on_resize = True
+    assert get_clip(widget) is not None
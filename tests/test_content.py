@@ -0,0 +1,79 @@
+"""Tests max_x/max_y = "content"."""
+from kivy.uix.label import Label
+from kivy.uix.widget import Widget
+
+import expandable
+from conftest import ExpandableBoxLayout
+from conftest import ExpandableLabel
+from expandable import _measure_content_height
+from expandable import _measure_content_width
+from expandable import _measure_label
+
+
+def test_measure_horizontal_box():
+    box = ExpandableBoxLayout(padding=(5, 0, 5, 0), spacing=10)
+    first, second = Label(text="first"), Label(text="second label")
+    box.add_widget(first)
+    box.add_widget(second)
+    box.add_widget(Widget(size_hint_x=None, width=30))
+    expected = (
+        _measure_label(first, (None, None))[0] +
+        _measure_label(second, (None, None))[0] +
+        30 + 2 * 10 + 5 + 5
+    )
+    assert _measure_content_width(box) == expected
+
+
+def test_measure_vertical_box():
+    box = ExpandableBoxLayout(orientation="vertical", spacing=4)
+    box.add_widget(Widget(size_hint_y=None, height=20))
+    box.add_widget(Widget(size_hint_y=None, height=30))
+    assert _measure_content_height(box, 100) == 20 + 30 + 4
+
+
+def test_measure_childless_widget_is_its_padding():
+    box = ExpandableBoxLayout(padding=(1, 2, 3, 4), size=(500, 500))
+    assert _measure_content_width(box) == 1 + 3
+    assert _measure_content_height(box, 500) == 2 + 4
+
+
+def test_content_is_measured_once(clock, monkeypatch):
+    calls = []
+
+    def measure(widget):
+        calls.append(widget)
+        return 42
+
+    monkeypatch.setattr(expandable, "_measure_content_width", measure)
+    widget = ExpandableLabel(text="text", min_x=10, max_x="content")
+    clock.advance(.05)
+    del calls[:]
+    for _toggle in range(4):
+        widget.toggle_x()
+        clock.advance(.5)
+    widget.height += 10
+    assert widget.max_x == 42
+    assert not calls
+
+
+def test_text_change_invalidates_measurement(clock):
+    widget = ExpandableLabel(text="short", min_x=10, max_x="content")
+    clock.advance(.05)
+    short = widget.max_x
+    widget.text = "a much longer text than before"
+    assert widget.max_x > short
+
+    widget.expand_x()
+    clock.advance(.5)
+    assert widget.width == widget.max_x
+
+
+def test_descendant_size_hint_invalidates_measurement(clock):
+    box = ExpandableBoxLayout(min_x=10, max_x="content")
+    child = Widget(size_hint_x=None, width=30)
+    box.add_widget(child)
+    clock.advance(.05)
+    assert box.max_x == 30
+
+    child.size_hint_x = 1
+    assert box.max_x == 0
@@ -0,0 +1,122 @@
+"""Tests cull_hidden_animations."""
+import pytest
+from kivy.core.window import Window
+from kivy.uix.boxlayout import BoxLayout
+from kivy.uix.button import Button
+from kivy.uix.screenmanager import NoTransition, Screen, ScreenManager
+from kivy.uix.scrollview import ScrollView
+
+from conftest import ExpandableLabel
+
+
+@pytest.fixture
+def screens():
+    manager = ScreenManager(transition=NoTransition())
+    for name in "ab":
+        manager.add_widget(Screen(name=name))
+    Window.add_widget(manager)
+    yield manager
+    Window.remove_widget(manager)
+
+
+def make_widget(clock, screens, **kwargs):
+    box = BoxLayout(orientation="vertical")
+    screens.get_screen("a").add_widget(box)
+    widget = ExpandableLabel(
+        min_y=40, max_y=300, size_hint_y=None, duration_resize=1., **kwargs
+    )
+    box.add_widget(widget)
+    clock.advance(.1)
+    return widget
+
+
+def test_hidden_animation_runs_without_culling(clock, screens):
+    widget = make_widget(clock, screens)
+    widget.toggle_y()
+    clock.advance(.2)
+    screens.current = "b"
+    clock.advance(.2)
+    assert widget.resizing
+    assert 40 < widget.height < 300
+
+
+def test_complete_jumps_to_the_final_size(clock, screens):
+    widget = make_widget(clock, screens, cull_hidden_animations="complete")
+    widget.toggle_y()
+    clock.advance(.2)
+    assert 40 < widget.height < 300
+
+    screens.current = "b"
+    clock.advance(.1)
+    assert widget.height == 300
+    assert not widget.resizing
+
+
+def test_complete_when_an_ancestor_is_transparent(clock, screens):
+    widget = make_widget(clock, screens, cull_hidden_animations="complete")
+    widget.toggle_y()
+    clock.advance(.2)
+    widget.parent.opacity = 0
+    clock.advance(.1)
+    assert widget.height == 300
+    assert not widget.resizing
+
+
+def test_pause_resumes_where_it_stopped(clock, screens):
+    widget = make_widget(clock, screens, cull_hidden_animations="pause")
+    widget.toggle_y()
+    clock.advance(.3)
+    screens.current = "b"
+    clock.advance(.1)
+    paused = widget.height
+    assert 40 < paused < 300
+    assert not widget.resizing
+
+    clock.advance(1.)
+    assert widget.height == paused
+
+    screens.current = "a"
+    clock.advance(.2)
+    assert widget.resizing
+    assert paused < widget.height < 300
+    clock.advance(1.)
+    assert widget.height == 300
+    assert not widget.resizing
+
+
+def test_instant_call_drops_paused_animation(clock, screens):
+    widget = make_widget(clock, screens, cull_hidden_animations="pause")
+    widget.toggle_y()
+    clock.advance(.2)
+    screens.current = "b"
+    clock.advance(.2)
+
+    widget.instant_retract_y()
+    assert widget.height == 40
+    screens.current = "a"
+    clock.advance(.5)
+    assert widget.height == 40
+    assert not widget.resizing
+
+
+def test_complete_when_scrolled_out_of_view(clock, screens):
+    scroll_view = ScrollView(
+        size_hint=(None, None), size=(200, 200), pos=(0, 0)
+    )
+    content = BoxLayout(orientation="vertical", size_hint_y=None, height=2000)
+    widget = ExpandableLabel(
+        min_y=40, max_y=300, size_hint_y=None, duration_resize=1.,
+        cull_hidden_animations="complete"
+    )
+    content.add_widget(widget)
+    for _number in range(10):
+        content.add_widget(Button())
+    scroll_view.add_widget(content)
+    screens.get_screen("a").add_widget(scroll_view)
+    scroll_view.scroll_y = 0
+    clock.advance(.2)
+
+    widget.toggle_y()
+    clock.advance(.1)
+    assert widget.height == 300
+    assert not widget.resizing
@@ -0,0 +1,79 @@
+"""Tests dragging the edge of a widget and flinging it."""
+from kivy.input.motionevent import MotionEvent
+
+from conftest import ExpandableLabel
+
+
+class Touch(MotionEvent):
+    def __init__(self, x, y, time):
+        super(Touch, self).__init__("test", 1, (0, 0))
+        self.x, self.y = x, y
+        self.time_update = time
+
+
+def press(widget, touch):
+    widget.dispatch("on_touch_down", touch)
+    # the window sets grab_current while it dispatches grabbed touches
+    touch.grab_current = widget
+
+
+def move(widget, touch, y, time):
+    touch.y = y
+    touch.time_update = time
+    widget.dispatch("on_touch_move", touch)
+
+
+def make_widget(clock):
+    widget = ExpandableLabel(
+        size_hint=(None, None),
+        width=100,
+        min_y=50,
+        max_y=300,
+        drag_resize_y=True
+    )
+    clock.advance(.05)
+    return widget
+
+
+def test_moves_are_applied_once_per_frame(clock):
+    widget = make_widget(clock)
+    touch = Touch(10, 50, 0.)
+    press(widget, touch)
+    assert touch.grab_list
+
+    for number in range(1, 6):
+        move(widget, touch, 50 + 10 * number, number / 100.)
+    assert widget.height == 50
+
+    clock.advance(1 / 60.)
+    assert widget.height == 100
+
+
+def test_slow_release_returns_to_nearest_state(clock):
+    widget = make_widget(clock)
+    touch = Touch(10, 50, 0.)
+    press(widget, touch)
+    for number in range(1, 11):
+        move(widget, touch, 50 + 10 * number, number / 10.)
+        clock.advance(1 / 60.)
+    widget.dispatch("on_touch_up", touch)
+
+    clock.advance(1.)
+    assert widget.height == 50
+    assert not widget.expand_state_y
+
+
+def test_fast_release_flings_open(clock):
+    widget = make_widget(clock)
+    touch = Touch(10, 50, 0.)
+    press(widget, touch)
+    for number in range(1, 6):
+        move(widget, touch, 50 + 10 * number, number / 100.)
+        clock.advance(1 / 60.)
+    widget.dispatch("on_touch_up", touch)
+    # the animation continues from where the finger left the edge
+    assert widget.height == 100
+
+    clock.advance(1.)
+    assert widget.height == 300
+    assert widget.expand_state_y
@@ -0,0 +1,82 @@
+"""Tests freeze_text_on_resize."""
+from kivy.graphics import ScissorPush
+from kivy.uix.boxlayout import BoxLayout
+from kivy.uix.label import Label
+
+from conftest import ExpandableBoxLayout
+
+TEXT = "some long text that wraps " * 5
+
+
+def make_panel(clock, freeze):
+    root = BoxLayout(size=(400, 400))
+    panel = ExpandableBoxLayout(
+        orientation="vertical", min_x=100, max_x=300, duration_resize=.3,
+        freeze_text_on_resize=freeze
+    )
+    label = Label(text=TEXT, text_size=(100, None))
+    label.bind(width=lambda label, width: setattr(
+        label, "text_size", (width, None)
+    ))
+    panel.add_widget(label)
+    root.add_widget(panel)
+    clock.advance(.1)
+    label.sizes = []
+    label.bind(texture_size=lambda label, size: label.sizes.append(
+        tuple(size)
+    ))
+    return panel, label
+
+
+def has_scissor(widget):
+    return any(
+        isinstance(instruction, ScissorPush)
+        for instruction in widget.canvas.before.children
+    )
+
+
+def test_text_renders_every_frame_without_freeze(clock):
+    panel, label = make_panel(clock, "none")
+    panel.toggle_x()
+    clock.advance(.15)
+    assert len(label.sizes) > 3
+
+
+def test_clip_freezes_text_until_the_animation_ends(clock):
+    panel, label = make_panel(clock, "clip")
+    before = tuple(label.texture_size)
+    panel.toggle_x()
+    clock.advance(.15)
+    assert label.sizes == []
+    assert tuple(label.texture_size) == before
+    assert has_scissor(panel)
+
+    clock.advance(.4)
+    assert len(label.sizes) == 1
+    assert label.texture_size[0] > before[0]
+    assert not has_scissor(panel)
+
+
+def test_scale_stretches_the_frozen_texture(clock):
+    panel, label = make_panel(clock, "scale")
+    before = tuple(label.texture_size)
+    panel.toggle_x()
+    clock.advance(.15)
+    width = label.texture_size[0]
+    assert before[0] < width <= label.width
+    # stretched, not re-rendered: the height doesn't follow the wrapping
+    assert label.texture_size[1] == before[1]
+
+    clock.advance(.4)
+    assert label.texture_size[1] < before[1]
+
+
+def test_disabling_freeze_during_animation_thaws(clock):
+    panel, label = make_panel(clock, "clip")
+    panel.toggle_x()
+    clock.advance(.05)
+    panel.freeze_text_on_resize = "none"
+    clock.advance(.1)
+    assert len(label.sizes) > 1
+    clock.advance(.3)
+    assert label.texture_size[0] > 200
@@ -0,0 +1,110 @@
+"""Tests AnimationGovernor."""
+import pytest
+
+import expandable
+from conftest import ExpandableLabel
+from expandable import AnimationGovernor
+
+SLOW = 1 / 20.
+CALM = 1 / 48.
+FAST = 1 / 60.
+
+
+@pytest.fixture
+def governor(monkeypatch):
+    governor = AnimationGovernor()
+    monkeypatch.setattr(expandable, "animation_governor", governor)
+    return governor
+
+
+def record(governor, frame_time, windows=1):
+    for _frame in range(governor.window * windows):
+        governor.record_frame(frame_time)
+
+
+def test_levels_degrade_one_window_at_a_time(governor):
+    for level in (1, 2, 3):
+        record(governor, SLOW)
+        assert governor.level == level
+    record(governor, SLOW, windows=10)
+    assert governor.level == governor.MAX_LEVEL
+    assert governor.instant
+    assert [decision[1:3] for decision in governor.history] == [
+        (0, 1), (1, 2), (2, 3)
+    ]
+
+
+def test_frames_between_ratios_neither_degrade_nor_recover(governor):
+    record(governor, SLOW, windows=2)
+    record(governor, CALM, windows=10)
+    assert governor.level == 2
+
+
+def test_levels_recover_after_calm_windows(governor):
+    record(governor, SLOW, windows=3)
+    record(governor, FAST, windows=governor.recover_windows - 1)
+    assert governor.level == 3
+    record(governor, FAST)
+    assert governor.level == 2
+    record(governor, FAST, windows=governor.recover_windows * 2)
+    assert governor.level == 0
+
+
+def test_a_slow_window_resets_the_calm_windows(governor):
+    record(governor, SLOW)
+    record(governor, FAST, windows=governor.recover_windows - 1)
+    record(governor, CALM)
+    record(governor, FAST, windows=governor.recover_windows - 1)
+    assert governor.level == 1
+
+
+def test_level_scales_durations_and_steps(governor):
+    assert (governor.duration_scale, governor.step) == (1., 0.)
+    governor.level = 1
+    assert (governor.duration_scale, governor.step) == (0.5, 0.)
+    governor.level = 2
+    assert (governor.duration_scale, governor.step) == (0.5, 1 / 20.)
+    governor.level = 3
+    assert governor.duration_scale == 0.
+
+
+def test_instant_level_skips_the_animation(clock, governor):
+    widget = ExpandableLabel(min_x=100, max_x=500, duration_resize=1.)
+    clock.advance(.05)
+    record(governor, SLOW, windows=3)
+    widget.toggle_x()
+    assert widget.width == 500
+    assert not widget.resizing
+
+
+def test_degraded_level_shortens_the_animation(clock, governor):
+    widget = ExpandableLabel(min_x=100, max_x=500, duration_resize=1.)
+    clock.advance(.05)
+    record(governor, SLOW)
+    widget.toggle_x()
+    clock.advance(.6)
+    assert widget.width == 500
+    assert not widget.resizing
+
+
+def test_stepped_level_updates_less_often(clock, governor):
+    widget = ExpandableLabel(min_x=100, max_x=500, duration_resize=1.)
+    clock.advance(.05)
+    record(governor, SLOW, windows=2)
+    widths = []
+    widget.bind(width=lambda _widget, width: widths.append(width))
+    widget.toggle_x()
+    clock.advance(.6)
+    assert widget.width == 500
+    # 20 updates per second instead of 60 frames per second, for 0.5 s
+    assert len(widths) <= 12
+
+
+def test_stop_returns_to_level_zero(clock, governor):
+    governor.start()
+    assert governor.running
+    record(governor, SLOW, windows=2)
+    clock.advance(.1)
+    governor.stop()
+    assert not governor.running
+    assert governor.level == 0
@@ -0,0 +1,58 @@
+"""Tests that the NumPy and pure Python GridLayout track solvers agree."""
+import random
+
+import pytest
+
+import expandable
+from expandable import _solve_grid_tracks
+from expandable import _solve_grid_tracks_numpy
+
+
+def make_case(seed):
+    """Returns random arguments for _solve_grid_tracks."""
+    generator = random.Random(seed)
+    num_tracks = generator.randint(1, 60)
+    children = generator.randint(0, 400)
+    tracks = [generator.randrange(num_tracks) for _child in range(children)]
+    sizes = [generator.uniform(0, 200) for _child in range(children)]
+    # a negative size hint stands for None
+    hints = [
+        -1. if generator.random() < .3 else generator.uniform(0, 2)
+        for _child in range(children)
+    ]
+    minimums = {
+        generator.randint(-2, num_tracks + 2): generator.uniform(0, 300)
+        for _minimum in range(generator.randint(0, 10))
+    }
+    return (
+        num_tracks,
+        tracks,
+        sizes,
+        hints,
+        generator.uniform(0, 50),
+        minimums,
+        generator.uniform(0, 20000),
+        generator.randrange(num_tracks),
+        generator.choice([0., .5, 1., 3.])
+    )
+
+
+@pytest.mark.parametrize("seed", range(50))
+def test_numpy_solver_matches_fallback(seed, monkeypatch):
+    pytest.importorskip("numpy")
+    case = make_case(seed)
+    expected = _solve_grid_tracks_numpy(*case)
+    monkeypatch.setattr(expandable, "np", None)
+    before, after = _solve_grid_tracks(*case)
+    assert before == pytest.approx(expected[0])
+    assert after == pytest.approx(expected[1])
+
+
+def test_fallback_solver():
+    # two columns: one holds a 40px child, the other a child hinted 1
+    before, after = _solve_grid_tracks(
+        2, [0, 1], [40., 10.], [-1., 1.], 10., {}, 240., 0, 1.
+    )
+    assert before == [40., 200.]
+    # the 190px left over are now shared equally
+    assert after == [135., 105.]
@@ -0,0 +1,77 @@
+"""Tests interrupting resize animations."""
+from conftest import ExpandableLabel
+
+
+def make_widget(clock, **kwargs):
+    widget = ExpandableLabel(duration_resize=1., **kwargs)
+    clock.advance(.05)
+    return widget
+
+
+def test_instant_snap_during_animation(clock):
+    widget = make_widget(clock, snap_points_y=[20, 50, 100, 200])
+    widget.snap_y(3)
+    clock.advance(.1)
+    assert widget.resizing
+
+    widget.instant_snap_y(1)
+    assert widget.height == 50
+    assert not widget.resizing
+
+    clock.advance(.2)
+    assert widget.height == 50
+    assert widget.snap_index_y == 1
+
+
+def test_instant_retract_during_animation(clock):
+    widget = make_widget(clock, snap_points_y=[20, 50, 100, 200])
+    widget.snap_y(3)
+    clock.advance(.1)
+
+    widget.instant_retract_y()
+    assert widget.height == 20
+    assert not widget.resizing
+
+
+def test_interrupted_animation_returns_in_time_run(clock):
+    widget = make_widget(clock, min_y=0, max_y=100)
+    widget.expand_y()
+    clock.advance(.25)
+    assert 0 < widget.height < 100
+
+    widget.toggle_y()
+    clock.advance(.2)
+    assert widget.resizing
+    assert widget.height > 0
+
+    clock.advance(.1)
+    assert not widget.resizing
+    assert widget.height == 0
+
+
+def test_replayed_interruption_is_identical(clock):
+    heights = []
+    for _run in range(2):
+        widget = make_widget(clock, min_y=0, max_y=100)
+        widget.expand_y()
+        clock.advance(.4)
+        widget.toggle_y()
+        clock.advance(.1)
+        heights.append(widget.height)
+    assert heights[0] == heights[1]
+
+
+def test_settled_interruption_does_not_shorten_next_animation(clock):
+    widget = make_widget(clock, snap_points_y=[20, 50, 100, 200])
+    widget.snap_y(3)
+    clock.advance(.3)
+    widget.snap_y(1)
+    clock.advance(1.3)
+    assert not widget.resizing
+
+    widget.toggle_y()
+    clock.advance(.9)
+    assert widget.resizing
+
+    clock.advance(.2)
+    assert not widget.resizing
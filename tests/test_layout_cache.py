@@ -0,0 +1,153 @@
+"""Tests layout_cache."""
+from kivy.uix.floatlayout import FloatLayout
+from kivy.uix.gridlayout import GridLayout
+from kivy.uix.label import Label
+
+from conftest import ExpandableBoxLayout
+from expandable import _LayoutCache
+
+TEXT = "lorem ipsum dolor sit amet " * 3
+
+
+class CountingGridLayout(GridLayout):
+    layouts = 0
+
+    def do_layout(self, *args):
+        self.layouts += 1
+        super(CountingGridLayout, self).do_layout(*args)
+
+
+def test_cache_evicts_least_recently_used():
+    cache = _LayoutCache(30)
+    for key in "abc":
+        cache.put(key, key.upper(), 10)
+    assert cache.get("a") == "A"
+
+    cache.put("d", "D", 10)
+    assert "b" not in cache
+    assert [cache.get(key) for key in "acd"] == ["A", "C", "D"]
+    assert cache.size == 30
+
+    cache.put("c", "C", 20)
+    assert "a" not in cache
+    assert len(cache) == 2
+    assert cache.size == 30
+
+
+def test_cache_ignores_entries_over_its_limit():
+    cache = _LayoutCache(30)
+    cache.put("a", "A", 10)
+    cache.put("b", "B", 40)
+    assert "b" not in cache
+    assert cache.get("a") == "A"
+    assert cache.size == 10
+
+
+def test_cache_discards_entry_of_refilled_texture():
+    cache = _LayoutCache(100)
+    texture = object()
+    cache.put("a", (texture, (10, 10)), 10, texture)
+    cache.put("b", (texture, (10, 10)), 10, texture)
+    assert "a" not in cache
+    assert cache.get("b") == (texture, (10, 10))
+
+    cache.discard("b")
+    cache.put("c", (texture, (10, 10)), 10, texture)
+    assert len(cache) == 1
+    assert cache.size == 10
+
+
+def make_panel(clock, **kwargs):
+    root = FloatLayout(size=(800, 600))
+    panel = ExpandableBoxLayout(
+        orientation="vertical", size_hint=(None, None), height=400,
+        min_x=100, max_x=500, duration_resize=.3, **kwargs
+    )
+    for _number in range(3):
+        label = Label(text=TEXT, text_size=(100, None))
+        label.bind(width=lambda label, width: setattr(
+            label, "text_size", (width, None)
+        ))
+        panel.add_widget(label)
+    grid = CountingGridLayout(cols=3)
+    for number in range(6):
+        grid.add_widget(Label(text=str(number)))
+    panel.add_widget(grid)
+    root.add_widget(panel)
+    clock.advance(.1)
+    return panel, grid
+
+
+def get_geometry(panel):
+    geometry = []
+    stack = [panel]
+    while stack:
+        widget = stack.pop()
+        stack.extend(widget.children)
+        geometry.append((
+            widget.x - panel.x, widget.y - panel.y, widget.width,
+            widget.height
+        ))
+    return geometry
+
+
+def run_passes(clock, panel, passes):
+    """Toggles panel passes times and returns its geometry at every frame."""
+    frames = []
+    for _pass in range(passes):
+        panel.toggle_x()
+        for _frame in range(24):
+            clock.advance(1 / 60.)
+            frames.append(get_geometry(panel))
+    return frames
+
+
+def test_replayed_layouts_equal_fresh_layouts(clock):
+    cached, cached_grid = make_panel(clock, layout_cache=True)
+    fresh, fresh_grid = make_panel(clock)
+    cached_frames = run_passes(clock, cached, 4)
+    fresh_frames = run_passes(clock, fresh, 4)
+    assert cached_frames == fresh_frames
+    assert cached.width == fresh.width == 100
+    clock.advance(.1)
+    assert [label.texture_size for label in cached.children[1:]] == [
+        label.texture_size for label in fresh.children[1:]
+    ]
+    # the third pass replays the first one
+    assert cached_grid.layouts < fresh_grid.layouts
+
+
+def test_quantized_passes_replay_layouts(clock):
+    cached, cached_grid = make_panel(
+        clock, layout_cache=True, layout_cache_quantize=True,
+        layout_cache_bucket=20
+    )
+    fresh, fresh_grid = make_panel(clock)
+    run_passes(clock, cached, 4)
+    run_passes(clock, fresh, 4)
+    assert cached.width == fresh.width == 100
+    assert get_geometry(cached) == get_geometry(fresh)
+    assert cached_grid.layouts < fresh_grid.layouts / 2
+
+
+def test_content_changes_clear_the_cache(clock):
+    panel, grid = make_panel(clock, layout_cache=True)
+    run_passes(clock, panel, 1)
+    cache = panel._layout_cache  # noqa
+    assert len(cache)
+
+    panel.children[-1].text = "changed"
+    assert not len(cache)
+    run_passes(clock, panel, 1)
+    assert len(cache)
+
+    grid.add_widget(Label(text="new"))
+    assert not len(cache)
+
+
+def test_disabling_the_cache_stops_watching_content(clock):
+    panel, _grid = make_panel(clock, layout_cache=True)
+    run_passes(clock, panel, 1)
+    panel.layout_cache = False
+    assert panel._layout_cache is None  # noqa
+    assert panel._content_bindings is None  # noqa
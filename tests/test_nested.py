@@ -0,0 +1,79 @@
+"""Tests the batched layout of nested expandable widgets."""
+from kivy.uix.boxlayout import BoxLayout
+from kivy.uix.widget import Widget
+
+from conftest import ExpandableLabel
+from expandable import ExpandableMixin
+
+DEPTH = 5
+
+
+class CountingBoxLayout(BoxLayout):
+    def __init__(self, **kwargs):
+        super(CountingBoxLayout, self).__init__(**kwargs)
+        self.layouts = 0
+
+    def do_layout(self, *args):
+        self.layouts += 1
+        super(CountingBoxLayout, self).do_layout(*args)
+
+
+class ExpandableCountingBoxLayout(CountingBoxLayout, ExpandableMixin):
+    pass
+
+
+def build(batch):
+    """Returns the root of DEPTH nested boxes, each sized by its children,
+    the boxes and the expandable leaf."""
+    root = CountingBoxLayout(
+        orientation="vertical",
+        size_hint=(None, None),
+        size=(400, 2000)
+    )
+    boxes = [root]
+    parent = root
+    for _level in range(DEPTH):
+        box = ExpandableCountingBoxLayout(
+            orientation="vertical",
+            size_hint_y=None,
+            batch_nested_layout=batch
+        )
+        box.bind(minimum_height=box.setter("height"))
+        box.add_widget(Widget(size_hint_y=None, height=20))
+        parent.add_widget(box)
+        boxes.append(box)
+        parent = box
+    leaf = ExpandableLabel(
+        min_y=10,
+        max_y=300,
+        duration_resize=.2,
+        batch_nested_layout=batch
+    )
+    parent.add_widget(leaf)
+    return root, boxes, leaf
+
+
+def test_ancestors_follow_the_leaf(clock):
+    root, boxes, leaf = build(True)
+    clock.advance(.1)
+    leaf.toggle_y()
+    clock.advance(.4)
+    assert leaf.height == 300
+    # every box holds a 20px widget and the next box (or the leaf)
+    assert boxes[1].height == 300 + 20 * DEPTH
+
+
+def test_layouts_run_at_most_twice_per_frame(clock):
+    root, boxes, leaf = build(True)
+    clock.advance(.1)
+    for box in boxes:
+        box.layouts = 0
+
+    leaf.toggle_y()
+    frames = 12
+    for _frame in range(frames):
+        clock.advance(1 / 60.)
+        # no level of nesting lags a frame behind
+        assert boxes[1].height == leaf.height + 20 * DEPTH
+    for box in boxes:
+        assert box.layouts <= 2 * frames
@@ -0,0 +1,111 @@
+"""Tests overlay_expansion."""
+import pytest
+from kivy.core.window import Window
+from kivy.uix.boxlayout import BoxLayout
+from kivy.uix.button import Button
+
+from conftest import ExpandableLabel
+from expandable import ExpandableMixinError
+
+
+class CountingBoxLayout(BoxLayout):
+    layouts = 0
+
+    def do_layout(self, *args):
+        self.layouts += 1
+        super(CountingBoxLayout, self).do_layout(*args)
+
+
+@pytest.fixture
+def root():
+    root = CountingBoxLayout(
+        orientation="vertical", size_hint=(None, None), size=(800, 600)
+    )
+    Window.add_widget(root)
+    yield root
+    Window.remove_widget(root)
+
+
+def make_widget(clock, root, **kwargs):
+    siblings = [Button() for _number in range(4)]
+    widget = ExpandableLabel(
+        min_y=40, max_y=300, duration_resize=.3, overlay_expansion=True,
+        **kwargs
+    )
+    for child in siblings[:2] + [widget] + siblings[2:]:
+        root.add_widget(child)
+    clock.advance(.1)
+    return widget, siblings
+
+
+def test_widget_expands_over_its_siblings(clock, root):
+    widget, siblings = make_widget(clock, root)
+    index = root.children.index(widget)
+    top = widget.top
+    positions = [tuple(sibling.pos) for sibling in siblings]
+    root.layouts = 0
+
+    widget.toggle_y()
+    assert widget.parent is not root
+    assert root.children[index] is widget._overlay_placeholder  # noqa
+    clock.advance(.5)
+    assert root.layouts <= 1
+    assert widget.height == 300
+    assert widget.top == top
+    assert widget.width == 800
+    assert [tuple(sibling.pos) for sibling in siblings] == positions
+
+
+def test_widget_takes_its_place_back_once_retracted(clock, root):
+    widget, _siblings = make_widget(clock, root)
+    index = root.children.index(widget)
+    widget.toggle_y()
+    clock.advance(.5)
+
+    widget.toggle_y()
+    clock.advance(.1)
+    assert widget.parent is not root
+    clock.advance(.4)
+    assert widget.parent is root
+    assert root.children.index(widget) == index
+    assert widget.height == 40
+    assert len(root.children) == 5
+    assert widget.get_parent_window() is not None
+
+
+def test_widget_follows_the_width_of_its_place(clock, root):
+    widget, _siblings = make_widget(clock, root)
+    widget.toggle_y()
+    clock.advance(.5)
+    root.width = 600
+    clock.advance(.1)
+    assert widget.width == 600
+
+
+def test_anchor_keeps_the_chosen_corner(clock, root):
+    widget, _siblings = make_widget(
+        clock, root, overlay_anchor="bottom-right"
+    )
+    bottom = widget.y
+    widget.instant_expand_y()
+    clock.advance(.1)
+    assert widget.y == bottom
+    assert widget.height == 300
+
+
+def test_disabling_overlay_puts_expanded_widget_back(clock, root):
+    widget, _siblings = make_widget(clock, root)
+    widget.instant_expand_y()
+    clock.advance(.1)
+    widget.overlay_expansion = False
+    assert widget.parent is root
+    clock.advance(.1)
+    assert widget.height == 300
+
+
+def test_size_hint_bounds_are_rejected(clock, root):
+    widget, _siblings = make_widget(clock, root)
+    widget.min_y_hint = .1
+    widget.max_y_hint = .5
+    with pytest.raises(ExpandableMixinError):
+        widget.toggle_y()
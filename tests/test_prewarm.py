@@ -0,0 +1,65 @@
+"""Tests prewarming the first frame of resizes."""
+import pytest
+from kivy.core.window import Window
+from kivy.uix.boxlayout import BoxLayout
+from kivy.uix.relativelayout import RelativeLayout
+from kivy.uix.widget import Widget
+
+import expandable
+from conftest import ExpandableLabel
+from expandable import ExpandableMixin
+
+
+class ExpandableRelativeLayout(RelativeLayout, ExpandableMixin):
+    pass
+
+
+@pytest.fixture
+def window_parent():
+    parent = Widget()
+    Window.add_widget(parent)
+    yield parent
+    Window.remove_widget(parent)
+
+
+def test_hover_prewarms_widget_with_local_coordinates(clock, window_parent):
+    widget = ExpandableRelativeLayout(
+        min_y=40, max_y=200, prewarm_on_hover=True,
+        size_hint=(None, None), size=(100, 40), pos=(300, 300)
+    )
+    window_parent.add_widget(widget)
+    clock.advance(.05)
+    prewarms = []
+    widget.prewarm = lambda *_args: prewarms.append(widget)
+
+    Window.mouse_pos = (10, 10)
+    assert prewarms == []
+    Window.mouse_pos = (350, 320)
+    assert prewarms == [widget]
+    Window.mouse_pos = (360, 320)
+    assert prewarms == [widget]
+    Window.mouse_pos = (10, 10)
+    Window.mouse_pos = (350, 320)
+    assert prewarms == [widget, widget]
+
+
+def test_toggle_after_prewarm_measures_nothing(clock, monkeypatch):
+    measure = expandable._measure_content_width  # noqa
+    calls = []
+
+    def counting_measure(widget):
+        calls.append(widget)
+        return measure(widget)
+    monkeypatch.setattr(expandable, "_measure_content_width", counting_measure)
+
+    parent = BoxLayout()
+    widget = ExpandableLabel(text="panel", min_x=10, max_x="content")
+    parent.add_widget(widget)
+    widget.text = "a longer panel"
+
+    widget.prewarm()
+    measured = len(calls)
+    widget.toggle_x()
+    clock.advance(.6)
+    assert len(calls) == measured
+    assert widget.width == widget.texture_size[0]
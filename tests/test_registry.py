@@ -0,0 +1,74 @@
+"""Tests the registry of size hint resolvers."""
+import pytest
+from kivy.uix.boxlayout import BoxLayout
+from kivy.uix.floatlayout import FloatLayout
+
+import expandable
+from conftest import ExpandableLabel
+from expandable import ExpandableMixin
+from expandable import _get_size_hint_handlers
+
+
+class CustomBoxLayout(BoxLayout):
+    pass
+
+
+class CustomLayout(FloatLayout):
+    pass
+
+
+@pytest.fixture
+def registry(monkeypatch):
+    """Lets the test register resolvers without affecting other tests."""
+    monkeypatch.setattr(
+        expandable,
+        "_size_hint_handlers",
+        dict(expandable._size_hint_handlers)  # noqa
+    )
+    monkeypatch.setattr(expandable, "_size_hint_handler_cache", {})
+
+
+def test_subclasses_use_handlers_of_base(registry):
+    assert _get_size_hint_handlers(CustomBoxLayout) is (
+        _get_size_hint_handlers(BoxLayout)
+    )
+    assert _get_size_hint_handlers(object) is None
+
+
+def test_registered_resolver_is_dispatched(registry, clock):
+    calls = []
+
+    def resolver(widget, axis):
+        calls.append(axis)
+        widget.size_hint_x = widget.width / widget.parent.width
+        return False
+
+    ExpandableMixin.register_size_hint_resolver(CustomLayout, resolver)
+    assert _get_size_hint_handlers(CustomLayout)[0] is resolver
+
+    parent = CustomLayout(size=(400, 400))
+    widget = ExpandableLabel(min_x=100, max_x_hint=.5)
+    parent.add_widget(widget)
+    clock.advance(.05)
+    assert widget.width == 100
+
+    widget.expand_x()
+    clock.advance(.5)
+    assert calls == ["x"]
+    assert widget.size_hint_x == .5
+    assert widget.width == 200
+
+
+def test_registration_by_class_beats_name(registry):
+    def by_name(widget, axis):
+        return False
+
+    def by_class(widget, axis):
+        return False
+
+    name = f"{CustomLayout.__module__}.{CustomLayout.__qualname__}"
+    ExpandableMixin.register_size_hint_resolver(name, by_name)
+    assert _get_size_hint_handlers(CustomLayout)[0] is by_name
+
+    ExpandableMixin.register_size_hint_resolver(CustomLayout, by_class)
+    assert _get_size_hint_handlers(CustomLayout)[0] is by_class
@@ -0,0 +1,50 @@
+"""Tests capping the update rate of resize animations."""
+import pytest
+
+from conftest import ExpandableLabel
+from expandable import ExpandableMixin, ExpandableMixinError
+
+
+@pytest.fixture
+def default_rate(monkeypatch):
+    monkeypatch.setattr(ExpandableMixin, "_default_max_resize_rate", 0)
+
+
+def count_updates(clock, widget):
+    widths = []
+    widget.bind(width=lambda _widget, width: widths.append(width))
+    widget.toggle_x()
+    clock.advance(.8)
+    assert widget.width == 500
+    return len(widths)
+
+
+def make_widget(clock, **kwargs):
+    widget = ExpandableLabel(
+        min_x=100, max_x=500, duration_resize=.5, **kwargs
+    )
+    clock.advance(.05)
+    return widget
+
+
+def test_uncapped_animation_updates_every_frame(clock, default_rate):
+    assert count_updates(clock, make_widget(clock)) >= 29
+
+
+def test_max_resize_rate_caps_updates(clock, default_rate):
+    widget = make_widget(clock, max_resize_rate=10)
+    assert count_updates(clock, widget) <= 6
+
+
+def test_default_rate_applies_to_widgets_without_their_own(
+        clock, default_rate):
+    ExpandableMixin.set_default_max_resize_rate(10)
+    assert count_updates(clock, make_widget(clock)) <= 6
+    widget = make_widget(clock, max_resize_rate=0)
+    assert count_updates(clock, widget) >= 29
+
+
+def test_negative_default_rate_raises(default_rate):
+    with pytest.raises(ExpandableMixinError):
+        ExpandableMixin.set_default_max_resize_rate(-1)
+    assert ExpandableMixin._default_max_resize_rate == 0  # noqa
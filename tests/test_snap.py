@@ -0,0 +1,54 @@
+"""Tests snap points."""
+import pytest
+from kivy.uix.floatlayout import FloatLayout
+
+from conftest import ExpandableLabel
+from expandable import ExpandableMixinError
+from expandable import _parse_snap_point
+
+
+def test_parse_snap_point():
+    assert _parse_snap_point(40) == (40., False)
+    assert _parse_snap_point("40px") == (40., False)
+    assert _parse_snap_point("50%") == (.5, True)
+    with pytest.raises(ExpandableMixinError):
+        _parse_snap_point("half")
+
+
+def test_snap_points_set_bounds(clock):
+    widget = ExpandableLabel(snap_points_y=[20, 50, "100%"])
+    clock.advance(.05)
+    assert widget.min_y == 20
+    assert widget.max_y_hint == 1
+    assert widget.snap_index_y == 0
+    assert widget.height == 20
+
+
+def test_snap_to_intermediate_point(clock):
+    widget = ExpandableLabel(snap_points_y=[20, 50, 100, 200])
+    clock.advance(.05)
+    widget.snap_y(2)
+    assert widget.resizing
+    clock.advance(.5)
+    assert not widget.resizing
+    assert widget.height == 100
+    assert widget.snap_index_y == 2
+    assert widget.expand_state_y
+
+    with pytest.raises(ExpandableMixinError):
+        widget.snap_y(4)
+
+
+def test_nearest_snap_index(clock):
+    parent = FloatLayout(size=(400, 400))
+    widget = ExpandableLabel(snap_points_x=[20, "25%", 200])
+    parent.add_widget(widget)
+    clock.advance(.05)
+    # "25%" of the 400px parent is 100px
+    assert widget.nearest_snap_index_x(0) == 0
+    assert widget.nearest_snap_index_x(90) == 1
+    assert widget.nearest_snap_index_x(160) == 2
+    assert widget.nearest_snap_index_x(1000) == 2
+
+    widget.allow_resize_x = False
+    assert widget.nearest_snap_index_x(90) is None
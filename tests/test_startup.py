@@ -0,0 +1,41 @@
+"""Tests the layout triggers caused by the initial size of the widgets."""
+from kivy.factory import Factory
+from kivy.lang import Builder
+
+from conftest import CountingBoxLayout, ExpandableLabel
+
+CHILDREN = 20
+
+Factory.register("CountingBoxLayout", cls=CountingBoxLayout)
+Factory.register("ExpandableLabel", cls=ExpandableLabel)
+
+KV_CHILD = """
+    ExpandableLabel:
+        min_y: 40
+        max_y: 200
+        start_expanded_y: True
+        min_x: 100
+        max_x_hint: 1
+"""
+
+
+def test_kvlang_triggers_parent_once_per_widget(clock):
+    root = Builder.load_string(
+        "CountingBoxLayout:\n    orientation: 'vertical'\n" +
+        KV_CHILD * CHILDREN
+    )
+    # plus the trigger of the properties of the root set by the rule
+    assert root.triggers <= CHILDREN + 1
+    assert all(child.height == 200 for child in root.children)
+
+
+def test_python_triggers_parent_once_per_widget(clock):
+    root = CountingBoxLayout(orientation="vertical")
+    for _number in range(CHILDREN):
+        root.add_widget(ExpandableLabel(
+            min_y=40, max_y=200, start_expanded_y=True, min_x=100,
+            max_x_hint=1
+        ))
+    assert root.triggers <= CHILDREN
+    assert all(child.height == 200 for child in root.children)
+
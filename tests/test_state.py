@@ -0,0 +1,30 @@
+"""Tests ExpandStateStore."""
+from kivy.clock import Clock
+
+from conftest import ExpandableLabel
+from expandable_state import ExpandStateStore
+
+
+def test_expand_all_applies_last_snap_point():
+    widget = ExpandableLabel(snap_points_y=[20, 50, 100, 200])
+    Clock.tick()
+    store = ExpandStateStore(4, snap_indices=True)
+    store.expand_all_y()
+
+    store.apply(widget, 2)
+    assert widget.snap_index_y == 3
+    assert widget.height == 200
+    assert widget.expand_state_y
+
+
+def test_collapse_all_applies_first_snap_point():
+    widget = ExpandableLabel(snap_points_y=[20, 50, 100, 200])
+    Clock.tick()
+    widget.instant_snap_y(2)
+    store = ExpandStateStore(4, snap_indices=True)
+    store.set_snap_y(1, 2)
+    store.collapse_all_y()
+
+    store.apply(widget, 1)
+    assert widget.snap_index_y == 0
+    assert widget.height == 20
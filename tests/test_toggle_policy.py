@@ -0,0 +1,102 @@
+"""Tests toggle_policy."""
+from conftest import ExpandableLabel
+
+
+def make_widget(clock, **kwargs):
+    widget = ExpandableLabel(
+        min_x=100, max_x=500, duration_resize=.1, **kwargs
+    )
+    clock.advance(.05)
+    widget.starts = 0
+
+    def on_resizing(widget, resizing):
+        if resizing:
+            widget.starts += 1
+    widget.bind(resizing=on_resizing)
+    return widget
+
+
+def test_immediate_animates_every_toggle(clock):
+    widget = make_widget(clock)
+    widget.toggle_x()
+    widget.toggle_x()
+    assert widget.starts == 2
+    assert widget.coalesced_toggles == 0
+
+
+def test_latest_applies_the_last_state_of_the_frame(clock):
+    widget = make_widget(clock, toggle_policy="latest")
+    for _number in range(5):
+        widget.toggle_x()
+    assert widget.retract_state_x
+    assert widget.starts == 0
+
+    clock.advance(.2)
+    assert widget.expand_state_x
+    assert widget.width == 500
+    assert widget.starts == 1
+    assert widget.coalesced_toggles == 4
+
+
+def test_latest_cancelling_toggles_do_nothing(clock):
+    widget = make_widget(clock, toggle_policy="latest")
+    widget.toggle_x()
+    widget.toggle_x()
+    clock.advance(.2)
+    assert widget.retract_state_x
+    assert widget.starts == 0
+    assert widget.coalesced_toggles == 2
+
+
+def test_latest_expand_of_expanded_widget_is_not_coalesced(clock):
+    widget = make_widget(clock, toggle_policy="latest")
+    widget.instant_expand_x()
+    widget.expand_x()
+    clock.advance(.2)
+    assert widget.starts == 0
+    assert widget.coalesced_toggles == 0
+
+
+def test_debounce_waits_for_calls_to_stop(clock):
+    widget = make_widget(
+        clock, toggle_policy="debounce", toggle_interval=.2
+    )
+    for _number in range(3):
+        widget.toggle_x()
+        clock.advance(.05)
+    assert widget.starts == 0
+
+    clock.advance(.4)
+    assert widget.expand_state_x
+    assert widget.starts == 1
+    assert widget.coalesced_toggles == 2
+
+
+def test_throttle_applies_first_and_latest_calls(clock):
+    widget = make_widget(
+        clock, toggle_policy="throttle", toggle_interval=.2
+    )
+    widget.toggle_x()
+    assert widget.expand_state_x
+    assert widget.starts == 1
+
+    widget.toggle_x()
+    widget.toggle_x()
+    widget.retract_x()
+    assert widget.expand_state_x
+
+    clock.advance(.4)
+    assert widget.retract_state_x
+    assert widget.width == 100
+    assert widget.starts == 2
+    assert widget.coalesced_toggles == 2
+
+
+def test_instant_call_discards_pending_toggle(clock):
+    widget = make_widget(clock, toggle_policy="latest")
+    widget.toggle_x()
+    widget.instant_retract_x()
+    clock.advance(.2)
+    assert widget.retract_state_x
+    assert widget.width == 100
+    assert widget.starts == 0
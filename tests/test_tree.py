@@ -0,0 +1,104 @@
+"""Tests the visible row bookkeeping of ExpandableTree against a brute-force
+walk of the tree."""
+import random
+
+import pytest
+
+from expandable_tree import ExpandableTree
+from expandable_tree import _Fenwick
+
+
+def visible_nodes(tree):
+    """Returns the visible nodes in row order by walking the whole tree."""
+    rows = []
+    stack = list(reversed(tree.root.children))
+    while stack:
+        node = stack.pop()
+        rows.append(node)
+        if node.expanded:
+            stack.extend(reversed(node.children))
+    return rows
+
+
+def check(tree):
+    rows = visible_nodes(tree)
+    assert tree.row_count == len(rows)
+    for index, node in enumerate(rows):
+        assert tree.node_at(index) is node
+        assert tree.index_of(node) == index
+    with pytest.raises(IndexError):
+        tree.node_at(len(rows))
+
+
+def all_nodes(tree):
+    nodes = []
+    stack = list(tree.root.children)
+    while stack:
+        node = stack.pop()
+        nodes.append(node)
+        stack.extend(node.children)
+    return nodes
+
+
+def test_fenwick_matches_list():
+    generator = random.Random(1)
+    values = []
+    fenwick = _Fenwick()
+    for _step in range(300):
+        if values and generator.random() < .5:
+            position = generator.randrange(len(values))
+            delta = generator.randint(-values[position], 5)
+            values[position] += delta
+            fenwick.add(position, delta)
+        else:
+            value = generator.randint(0, 5)
+            values.append(value)
+            fenwick.append(value)
+        if generator.random() < .05:
+            fenwick.rebuild(values)
+
+        for count in range(len(values) + 1):
+            assert fenwick.prefix(count) == sum(values[:count])
+        for n in range(sum(values)):
+            position = fenwick.search(n)
+            assert sum(values[:position]) <= n < sum(values[:position + 1])
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_rows_match_brute_force(seed):
+    generator = random.Random(seed)
+    tree = ExpandableTree(size=(200, 300))
+    for _step in range(400):
+        nodes = all_nodes(tree)
+        choice = generator.random()
+        if not nodes or choice < .45:
+            parent = generator.choice(nodes) if nodes else None
+            if generator.random() < .2:
+                parent = None
+            tree.add_node("node", parent=parent)
+        elif choice < .9:
+            node = generator.choice(nodes)
+            tree.set_node_expanded(
+                node,
+                generator.random() < .6,
+                animate=False
+            )
+        else:
+            tree.remove_node(generator.choice(nodes))
+        check(tree)
+
+
+def test_only_rows_on_screen_are_widgets(clock):
+    tree = ExpandableTree(size=(200, 320), row_height=32)
+    parent = tree.add_node("parent")
+    for number in range(10000):
+        tree.add_node(str(number), parent=parent)
+    tree.expand_node(parent, animate=False)
+    clock.advance(1 / 60.)
+    assert tree.row_count == 10001
+    assert len(tree._container.children) <= 11  # noqa
+
+    tree.collapse_node(parent, animate=False)
+    clock.advance(1 / 60.)
+    assert tree.row_count == 1
+    check(tree)